@@ -31,6 +31,85 @@ class Settings(BaseModel):
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     BASE_URL: str = os.getenv("BASE_URL", "http://localhost:8000")
     
+    # Generation job checkpoints (resumable episodes)
+    JOBS_DIR: str = os.getenv("JOBS_DIR", "jobs")
+    
+    # Podcast library (SQLite)
+    PODCAST_DB_PATH: str = os.getenv("PODCAST_DB_PATH", "data/podcasts.db")
+    
+    # Episode post-processing (loudness, silence trimming, pauses)
+    AUDIO_POSTPROCESS: bool = os.getenv("AUDIO_POSTPROCESS", "True").lower() == "true"
+    AUDIO_TARGET_RMS_DBFS: float = float(os.getenv("AUDIO_TARGET_RMS_DBFS", "-20"))
+    AUDIO_PEAK_CEILING_DBFS: float = float(os.getenv("AUDIO_PEAK_CEILING_DBFS", "-1"))
+    AUDIO_SILENCE_THRESHOLD_DBFS: float = float(os.getenv("AUDIO_SILENCE_THRESHOLD_DBFS", "-45"))
+    AUDIO_TURN_PAUSE_MS: int = int(os.getenv("AUDIO_TURN_PAUSE_MS", "400"))
+    AUDIO_SAME_SPEAKER_PAUSE_MS: int = int(os.getenv("AUDIO_SAME_SPEAKER_PAUSE_MS", "200"))
+    AUDIO_CROSSFADE_MS: int = int(os.getenv("AUDIO_CROSSFADE_MS", "10"))
+    
+    # Compressed delivery renditions of final episodes
+    RENDITION_FORMATS: str = os.getenv("RENDITION_FORMATS", "opus,aac,mp3")
+    OPUS_BITRATE_KBPS: int = int(os.getenv("OPUS_BITRATE_KBPS", "32"))
+    AAC_BITRATE_KBPS: int = int(os.getenv("AAC_BITRATE_KBPS", "64"))
+    MP3_BITRATE_KBPS: int = int(os.getenv("MP3_BITRATE_KBPS", "64"))
+    
+    # Media tools (ffmpeg/ffprobe)
+    MEDIA_MAX_CONCURRENCY: int = int(os.getenv("MEDIA_MAX_CONCURRENCY", "4"))
+    MEDIA_TOOL_TIMEOUT: float = float(os.getenv("MEDIA_TOOL_TIMEOUT", "300"))
+    
+    # Dialogue generation: "turns" (one LLM call per host turn) or "block" (one structured call per article)
+    DIALOGUE_MODE: str = os.getenv("DIALOGUE_MODE", "turns")
+    
+    # tiktoken encoding used to budget dialogue context (falls back to an estimate when unavailable)
+    CONTEXT_TOKENIZER: str = os.getenv("CONTEXT_TOKENIZER", "o200k_base")
+    
+    # LLM model routing: hedge calls slower than this latency percentile of the chosen model,
+    # and rest a model for LLM_ERROR_COOLDOWN_S (doubling per consecutive error) after a failure
+    LLM_HEDGING: bool = os.getenv("LLM_HEDGING", "True").lower() == "true"
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    LLM_HEDGE_MIN_DELAY_S: float = float(os.getenv("LLM_HEDGE_MIN_DELAY_S", "2"))
+    LLM_ERROR_COOLDOWN_S: float = float(os.getenv("LLM_ERROR_COOLDOWN_S", "30"))
+    
+    # LLM response cache (SQLite); identical prompts to the same model are answered from disk
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "data/llm_cache.db")
+    LLM_CACHE_TTL_HOURS: float = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+    LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+    
+    # English -> Chinese term glossary shared across episodes (SQLite)
+    GLOSSARY_DB_PATH: str = os.getenv("GLOSSARY_DB_PATH", "data/glossary.db")
+    
+    # Episode length model: seconds of audio per script character, learned per voice and dialect
+    # from rendered segments; the prior (and fallback) is SPEECH_RATE_PRIOR_CPM characters per minute
+    SPEECH_RATE_DB_PATH: str = os.getenv("SPEECH_RATE_DB_PATH", "data/speech_rates.db")
+    SPEECH_RATE_PRIOR_CPM: float = float(os.getenv("SPEECH_RATE_PRIOR_CPM", "120"))
+    SPEECH_RATE_PRIOR_UNITS: float = float(os.getenv("SPEECH_RATE_PRIOR_UNITS", "300"))
+    SPEECH_RATE_WINDOW_UNITS: float = float(os.getenv("SPEECH_RATE_WINDOW_UNITS", "20000"))
+
+    # Voice backends: concurrent requests and requests per minute (0 = unlimited)
+    HAKKA_TTS_CONCURRENCY: int = int(os.getenv("HAKKA_TTS_CONCURRENCY", "2"))
+    HAKKA_TTS_RPM: int = int(os.getenv("HAKKA_TTS_RPM", "0"))
+    GEMINI_TTS_CONCURRENCY: int = int(os.getenv("GEMINI_TTS_CONCURRENCY", "2"))
+    GEMINI_TTS_RPM: int = int(os.getenv("GEMINI_TTS_RPM", "0"))
+
+    # Hakka API session: bearer tokens and the TTS voice catalog are shared by all service instances
+    HAKKA_TOKEN_TTL_S: float = float(os.getenv("HAKKA_TOKEN_TTL_S", "3600"))
+    VOICE_CATALOG_TTL_S: float = float(os.getenv("VOICE_CATALOG_TTL_S", "3600"))
+
+    # Pooled upstream HTTP connections (one httpx client per upstream, shared process-wide)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+
+    # Startup warm-up (Hakka logins, voice catalog, LLM/Gemini clients, crawler browser);
+    # runs in the background after startup, GET /ready answers 503 until it has finished
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "False").lower() == "true"
+    WARMUP_CRAWLER: bool = os.getenv("WARMUP_CRAWLER", "True").lower() == "true"
+    WARMUP_TIMEOUT_S: float = float(os.getenv("WARMUP_TIMEOUT_S", "60"))
+
+    # Crawler HTTP fetches (listing pages, article pages, arXiv / AlphaXiv metadata): requests in flight per host
+    CRAWL_PER_HOST_CONCURRENCY: int = int(os.getenv("CRAWL_PER_HOST_CONCURRENCY", "4"))
+    # arXiv asks for at most one request every 3 seconds (API and abstract pages alike), one at a time
+    ARXIV_REQUESTS_PER_MINUTE: int = int(os.getenv("ARXIV_REQUESTS_PER_MINUTE", "20"))
+
     # Email Configuration (SMTP)
     SMTP_HOST: str = os.getenv("SMTP_HOST", "smtp.gmail.com")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
@@ -0,0 +1,43 @@
+import logging
+from typing import Dict
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClients:
+    """Process-wide pooled httpx clients, one per upstream
+
+    Services used to build an AsyncClient per instance (and the routes an instance per
+    request), so every request paid for new TCP/TLS connections. Clients here keep their
+    connections alive across requests and are closed once, at app shutdown.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str, **kwargs) -> httpx.AsyncClient:
+        """Shared client for an upstream; kwargs (timeout, verify...) apply when it is first created"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(max_connections=settings.HTTP_MAX_CONNECTIONS, max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE)
+            client = httpx.AsyncClient(limits=limits, **kwargs)
+            self._clients[name] = client
+        return client
+
+    def is_shared(self, client: httpx.AsyncClient) -> bool:
+        return any(client is shared for shared in self._clients.values())
+
+    async def aclose(self):
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Closing HTTP client {name} failed: {e}")
+
+
+http_clients = HTTPClients()
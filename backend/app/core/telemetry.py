@@ -0,0 +1,235 @@
+import asyncio
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from opentelemetry import metrics as otel_metrics
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+
+# Spans and OTel instruments are no-ops until the deployment installs an SDK/exporter;
+# the in-process registry below always backs /metrics and /api/ai/stats.
+tracer = trace.get_tracer("hakkast")
+meter = otel_metrics.get_meter("hakkast")
+
+# Seconds; stages range from sub-second MT calls to multi-minute crawls and merges
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+LabelValues = Tuple[str, ...]
+INF_LABEL = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+        self._otel = meter.create_counter(name, description=description)
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self._otel.add(amount, dict(zip(self.labels, key)))
+
+    def value(self, **labels: str) -> float:
+        """Sum over all series matching the given labels"""
+        with self._lock:
+            return sum(
+                v for key, v in self._values.items()
+                if all(key[self.labels.index(n)] == str(labels[n]) for n in labels)
+            )
+
+    def series(self) -> Dict[LabelValues, float]:
+        """Snapshot of {label values: count}"""
+        with self._lock:
+            return dict(self._values)
+
+    def collect(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {value:g}" for key, value in sorted(self.series().items())]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels (Prometheus semantics)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}  # bucket counts..., sum, count
+        self._lock = threading.Lock()
+        self._otel = meter.create_histogram(name, unit="s", description=description)
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            if position < len(self.buckets):
+                series[position] += 1
+            series[-2] += value
+            series[-1] += 1
+        self._otel.record(value, dict(zip(self.labels, key)))
+
+    def series(self) -> Dict[LabelValues, Tuple[float, float]]:
+        """Snapshot of {label values: (sum, count)}"""
+        with self._lock:
+            return {key: (series[-2], series[-1]) for key, series in self._series.items()}
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative:g}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, INF_LABEL)} {series[-1]:g}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {series[-1]:g}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, description, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, description, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_LATENCY = registry.histogram("hakkast_stage_duration_seconds", "Duration of pipeline stages", ["stage"])
+STAGE_TOTAL = registry.counter("hakkast_stage_total", "Pipeline stage executions by outcome", ["stage", "outcome"])
+UPSTREAM_LATENCY = registry.histogram("hakkast_upstream_duration_seconds", "Latency of upstream API calls", ["service", "operation"])
+UPSTREAM_TOTAL = registry.counter("hakkast_upstream_requests_total", "Upstream API calls by outcome", ["service", "operation", "outcome"])
+CACHE_TOTAL = registry.counter("hakkast_cache_requests_total", "Cache lookups by result", ["cache", "result"])
+ITEMS_TOTAL = registry.counter("hakkast_items_total", "Items produced by the pipeline", ["kind"])
+
+STARTED_AT = time.time()
+
+
+class Outcome:
+    """Handle yielded by stage()/upstream(); call fail() for errors that are not exceptions"""
+
+    def __init__(self, span):
+        self.span = span
+        self.error: Optional[str] = None
+        self.cancelled = False
+
+    def fail(self, reason: str):
+        self.error = reason
+
+    def set(self, key: str, value):
+        self.span.set_attribute(key, value)
+
+
+@contextmanager
+def _timed(span_name: str, histogram: Histogram, counter: Counter, labels: Dict[str, str], attributes: Dict) -> Iterator[Outcome]:
+    with tracer.start_as_current_span(span_name, attributes={**labels, **attributes}) as span:
+        outcome = Outcome(span)
+        start = time.perf_counter()
+        try:
+            yield outcome
+        except asyncio.CancelledError:
+            # e.g. the losing side of a hedged request: not an error of the upstream
+            outcome.cancelled = True
+            raise
+        except BaseException as e:
+            outcome.error = outcome.error or type(e).__name__
+            span.record_exception(e)
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - start, **labels)
+            counter.inc(outcome=("error" if outcome.error else "cancelled" if outcome.cancelled else "ok"), **labels)
+            if outcome.error:
+                span.set_status(Status(StatusCode.ERROR, outcome.error))
+
+
+def stage(name: str, **attributes) -> Iterator[Outcome]:
+    """Span + latency histogram for a pipeline stage (crawl, dialogue, translation, tts, merge, ...)"""
+    return _timed(f"stage.{name}", STAGE_LATENCY, STAGE_TOTAL, {"stage": name}, attributes)
+
+
+def upstream(service: str, operation: str, **attributes) -> Iterator[Outcome]:
+    """Span + latency histogram + error counter for one call to an external API"""
+    return _timed(f"{service}.{operation}", UPSTREAM_LATENCY, UPSTREAM_TOTAL, {"service": service, "operation": operation}, attributes)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_TOTAL.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_items(kind: str, amount: int = 1):
+    ITEMS_TOTAL.inc(amount, kind=kind)
+
+
+def stats_snapshot() -> Dict:
+    """Aggregated counters for /api/ai/stats"""
+    caches = {}
+    for (cache, result), value in CACHE_TOTAL.series().items():
+        caches.setdefault(cache, {"hit": 0, "miss": 0})[result] += value
+    for counts in caches.values():
+        lookups = counts["hit"] + counts["miss"]
+        counts["hit_ratio"] = round(counts["hit"] / lookups, 4) if lookups else None
+
+    upstreams = {}
+    for (service, operation, outcome), value in UPSTREAM_TOTAL.series().items():
+        entry = upstreams.setdefault(service, {"requests": 0, "errors": 0})
+        entry["requests"] += value
+        if outcome == "error":
+            entry["errors"] += value
+    for entry in upstreams.values():
+        entry["error_rate"] = round(entry["errors"] / entry["requests"], 4) if entry["requests"] else None
+
+    return {
+        "items": {kind: value for (kind,), value in ITEMS_TOTAL.series().items()},
+        "stages": {
+            stage_name: {"ok": STAGE_TOTAL.value(stage=stage_name, outcome="ok"), "error": STAGE_TOTAL.value(stage=stage_name, outcome="error")}
+            for stage_name in sorted({key[0] for key in STAGE_TOTAL.series()})
+        },
+        "upstreams": upstreams,
+        "caches": caches,
+        "uptime_seconds": round(time.time() - STARTED_AT),
+    }
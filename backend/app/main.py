@@ -1,11 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 import sys
 import asyncio
 from app.core.config import settings
-from app.routers import podcasts, tts, audio, ai
+from app.core.telemetry import registry as metrics_registry
+from app.core.http import http_clients
+from app.routers import podcasts, tts, audio, ai, glossary
+from app.services.media_tools import media_runner
+from app.services.crawl4ai_service import close_crawler
+from app.services.warmup import warmup
 
 # **Event loop strategy must be set before importing any module**
 if sys.platform == "win32":
@@ -14,10 +21,22 @@ if sys.platform == "win32":
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Detect ffmpeg/ffprobe once instead of probing on every request
+    await media_runner.detect()
+    # Optional warm-up (WARMUP_ENABLED) runs in the background; /ready reports when it is done
+    warmup.start()
+    yield
+    await warmup.stop()
+    await close_crawler()
+    await http_clients.aclose()
+
 app = FastAPI(
     title="Hakkast",
     description="AI-powered personalized Hakka podcast generator with 3-step pipeline: Chinese generation → Hakka translation → TTS",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -38,6 +57,7 @@ app.include_router(podcasts.router, prefix="/api", tags=["podcasts"])
 app.include_router(tts.router, prefix="/api", tags=["tts"])
 app.include_router(audio.router, prefix="/api", tags=["audio"])
 app.include_router(ai.router, prefix="/api", tags=["ai"])
+app.include_router(glossary.router, prefix="/api", tags=["glossary"])
 
 @app.get("/")
 async def root():
@@ -54,6 +74,16 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 while the startup warm-up is still running"""
+    return JSONResponse(warmup.snapshot(), status_code=200 if warmup.ready else 503)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
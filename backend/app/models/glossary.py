@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+
+class GlossaryEntry(BaseModel):
+    """English term and the Chinese used for it in scripts"""
+    term: str
+    translation: str
+    source: Literal["llm", "manual"] = "llm"
+    hits: int = 0
+    updatedAt: str
+
+class GlossaryEntryUpdate(BaseModel):
+    translation: str = Field(..., min_length=1, description="Chinese translation to use for the term")
+
+class GlossaryListResponse(BaseModel):
+    items: List[GlossaryEntry]
+    total: int
+    limit: int
+    offset: int
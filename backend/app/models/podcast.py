@@ -12,6 +12,7 @@ class HostConfig(BaseModel):
         default="理性、專業、分析", 
         description="Host personality traits for AI script generation (e.g., '理性、專業、分析', '幽默、活潑、互動')"
     )
+    voice: Optional[str] = Field(None, description="Explicit voice ID (e.g. 'gemini_puck', 'hak-hoi-TW-vs2-F01'); overrides the language-mode default")
 
 class Topic(Enum):
     research_deep_learning = "research_deep_learning"
@@ -35,6 +36,14 @@ class PodcastGenerationRequest(BaseModel):
     )
     interests: Optional[str] = Field(None, description="Personal interests for personalization")
 
+class AudioRendition(BaseModel):
+    """One delivery encoding of a final episode"""
+    format: Literal["opus", "aac", "mp3", "wav"]
+    url: str
+    mimeType: str
+    bitrateKbps: Optional[int] = None
+    sizeBytes: int
+
 class Podcast(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
@@ -52,6 +61,7 @@ class Podcast(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     audio_url: Optional[str] = None
     audio_duration: Optional[int] = None
+    renditions: List[AudioRendition] = []
 
 class PodcastResponse(BaseModel):
     id: str
@@ -70,6 +80,37 @@ class PodcastResponse(BaseModel):
     createdAt: str
     audioUrl: Optional[str] = None
     audioDuration: Optional[int] = None
+    renditions: List[AudioRendition] = []
+
+class PodcastSummary(BaseModel):
+    """Podcast metadata for library listings (no transcript bodies)"""
+    id: str
+    title: str
+    topic: str
+    duration: int
+    language: str
+    hosts: List[HostConfig] = []
+    interests: Optional[str] = None
+    createdAt: str
+    audioUrl: Optional[str] = None
+    audioDuration: Optional[int] = None
+    renditions: List[AudioRendition] = []
+
+class PodcastListResponse(BaseModel):
+    items: List[PodcastSummary]
+    total: int
+    limit: int
+    offset: int
+
+
+class ScriptLineEdit(BaseModel):
+    index: int = Field(..., ge=0, description="Index of the line in the script")
+    text: Optional[str] = Field(None, description="New Chinese text; re-translated unless hakka_text is also given")
+    hakka_text: Optional[str] = Field(None, description="New Hakka text (overrides translation)")
+    romanization: Optional[str] = Field(None, description="New romanization for the Hakka text")
+
+class ScriptEditRequest(BaseModel):
+    edits: List[ScriptLineEdit] = Field(..., min_items=1, description="Changed script lines")
 
 
 class PodcastScriptContent(BaseModel):
@@ -98,3 +139,24 @@ class EnglishTranslationResult(BaseModel):
     original_texts: List[str]  # 翻譯前的英文文本列表
     translated_texts: List[str]  # 翻譯後的中文文本列表
     processed_content: str  # 替換英文後的完整文本
+
+class EnglishTermTranslation(BaseModel):
+    original: str  # 英文原文
+    translated: str  # 繁體中文翻譯
+
+class EnglishTermBatch(BaseModel):
+    """Translations for a batch of English terms extracted from a script"""
+    translations: List[EnglishTermTranslation]
+
+class DialogueTurn(BaseModel):
+    """One host turn in a generated dialogue block"""
+    speaker: str  # 主持人名稱
+    text: str  # 發言內容（不含名稱前綴）
+
+class DialogueBlock(BaseModel):
+    """A whole multi-turn exchange about one article"""
+    turns: List[DialogueTurn]
+
+class DialogueTransitions(BaseModel):
+    """Transition lines between consecutive article blocks, in order"""
+    transitions: List[str]
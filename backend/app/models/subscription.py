@@ -3,6 +3,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from .podcast import AudioRendition
+
 class SubscriptionFrequency(str, Enum):
     DAILY = "daily"
     WEEKLY = "weekly"
@@ -65,6 +67,7 @@ class PodcastEpisode(BaseModel):
     hakka_content: str
     chinese_content: str
     romanization: Optional[str] = None
+    renditions: List[AudioRendition] = []
 
 class PodcastFeed(BaseModel):
     title: str
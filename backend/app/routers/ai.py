@@ -2,9 +2,12 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 import logging
+from datetime import datetime, timezone
 
 from app.services.ai_service import AIService, AgentService
 from app.models.crawler import CrawledContent
+from app.core.telemetry import stats_snapshot
+from app.services.model_router import model_router
 
 logger = logging.getLogger(__name__)
 
@@ -276,13 +279,20 @@ async def get_ai_capabilities():
 
 @router.get("/stats")
 async def get_ai_service_stats():
-    """Get AI service usage statistics"""
-    # This would typically connect to a database or metrics system
-    # For now, return mock data
+    """Get AI service usage statistics (counted since process start)"""
+    snapshot = stats_snapshot()
+    items = snapshot["items"]
     return {
-        "total_scripts_generated": 0,
-        "total_translations": 0,
-        "total_dialogue_responses": 0,
-        "active_models": ["gemini-2.5-flash", "gemini-2.5-pro"],
-        "last_updated": "2024-01-01T00:00:00Z"
+        "total_scripts_generated": int(items.get("scripts", 0)),
+        "total_translations": int(items.get("translations", 0)),
+        "total_dialogue_responses": int(items.get("dialogue_responses", 0)),
+        "total_podcasts_generated": int(items.get("podcasts", 0)),
+        "total_tts_segments": int(items.get("tts_segments", 0)),
+        "stages": snapshot["stages"],
+        "upstreams": snapshot["upstreams"],
+        "caches": snapshot["caches"],
+        "active_models": list(model_router.snapshot()) or ["gemini-2.5-flash", "gemini-2.0-pro"],
+        "models": model_router.snapshot(),
+        "uptime_seconds": snapshot["uptime_seconds"],
+        "last_updated": datetime.now(timezone.utc).isoformat()
     }
\ No newline at end of file
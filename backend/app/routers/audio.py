@@ -1,15 +1,23 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 import logging
-import subprocess
+import json
 import os
 from pathlib import Path
-import re
+
+from app.services.job_store import JobStore
+from app.services.media_tools import media_runner, MediaToolError
+from app.services.podcast_service import PodcastAudioManager
+from app.services.timing_index import TEXT_FIELDS, load_timing_index, render_timing
+from app.services.wav_concat import WavFormatError
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/audio", tags=["audio"])
+audio_manager = PodcastAudioManager()
+job_store = JobStore()
 
 # Request/Response Models
 class AudioFile(BaseModel):
@@ -47,40 +55,32 @@ class AudioFormatResponse(BaseModel):
 @router.get("/files/{script_name}")
 async def list_audio_files(
     script_name: str,
-    speaker_code: Optional[str] = Query(None, description="Filter by speaker code (SXF, SXM, HLF, HLM)")
+    speaker_code: Optional[str] = Query(None, description="Filter by speaker code (e.g. SXF, HLM, GMF, SXM2)")
 ):
-    """List audio files for a specific script"""
+    """List the segment audio files of a script's latest generation job"""
     try:
-        audio_dir = Path("static/audio")
-        if not audio_dir.exists():
-            audio_dir.mkdir(parents=True, exist_ok=True)
-            return {"files": [], "total_files": 0}
-        
-        # Pattern to match audio files for the script
+        job = job_store.latest_for_script(script_name)
+        segments = job.segment_files() if job else []
         if speaker_code:
-            pattern = f"{script_name}_{speaker_code}_*.wav"
-        else:
-            pattern = f"{script_name}_*.wav"
+            segments = [segment for segment in segments if segment["code"] == speaker_code]
         
         files = []
-        for file_path in audio_dir.glob(pattern):
-            if file_path.is_file():
-                try:
-                    size = file_path.stat().st_size
-                    files.append(AudioFile(
-                        filename=file_path.name,
-                        path=str(file_path),
-                        size=size,
-                        duration=None  # Could add audio duration calculation here
-                    ))
-                except Exception as e:
-                    logger.warning(f"Could not get info for file {file_path}: {e}")
-        
-        # Sort files by filename
-        files.sort(key=lambda x: x.filename)
+        for segment in segments:
+            file_path = segment["path"]
+            try:
+                size = file_path.stat().st_size
+                files.append(AudioFile(
+                    filename=file_path.name,
+                    path=str(file_path),
+                    size=size,
+                    duration=None  # Could add audio duration calculation here
+                ))
+            except Exception as e:
+                logger.warning(f"Could not get info for file {file_path}: {e}")
         
         return {
             "script_name": script_name,
+            "job_id": job.job_id if job else None,
             "speaker_code": speaker_code,
             "files": files,
             "total_files": len(files),
@@ -118,75 +118,40 @@ async def merge_audio_files(request: AudioMergeRequest):
         audio_dir.mkdir(parents=True, exist_ok=True)
         output_path = audio_dir / request.output_filename
         
-        # Create file list for FFmpeg
-        filelist_path = audio_dir / f"temp_filelist_{request.output_filename}.txt"
+        # Stream-concatenate in process; only segments in a different format go through FFmpeg
         try:
-            with open(filelist_path, "w", encoding="utf-8") as f:
-                for file_path in valid_files:
-                    f.write(f"file '{file_path}'\n")
-            
-            # Check if FFmpeg is available
-            try:
-                subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                raise HTTPException(
-                    status_code=500,
-                    detail="FFmpeg is not installed or not available"
-                )
-            
-            # FFmpeg command to merge files
-            cmd = [
-                'ffmpeg',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', str(filelist_path),
-                '-ar', str(request.sample_rate),
-                '-ac', '1',
-                '-sample_fmt', 's16',
-                '-y',  # Overwrite output file
-                str(output_path)
-            ]
-            
-            # Run FFmpeg
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"FFmpeg merge failed: {result.stderr}"
-                )
-            
-            # Check if output file was created
-            if not output_path.exists() or output_path.stat().st_size == 0:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Merged audio file was not created or is empty"
-                )
-            
-            file_size = output_path.stat().st_size
-            
-            # Cleanup source files if requested
-            if request.cleanup_source_files:
-                for file_path in valid_files:
-                    try:
-                        Path(file_path).unlink()
-                        logger.info(f"Deleted source file: {file_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to delete source file {file_path}: {e}")
-            
-            return AudioMergeResponse(
-                success=True,
-                output_path=str(output_path),
-                output_url=f"/static/audio/{output_path.name}",
-                file_size=file_size,
-                merged_files_count=len(valid_files),
-                message=f"Successfully merged {len(valid_files)} audio files"
+            await audio_manager.merge_wav_segments(
+                [Path(p) for p in valid_files], output_path, sample_rate=request.sample_rate
+            )
+        except (WavFormatError, MediaToolError) as e:
+            raise HTTPException(status_code=500, detail=f"Audio merge failed: {str(e)}")
+        
+        # Check if output file was created
+        if not output_path.exists() or output_path.stat().st_size == 0:
+            raise HTTPException(
+                status_code=500,
+                detail="Merged audio file was not created or is empty"
             )
-            
-        finally:
-            # Clean up temporary filelist
-            if filelist_path.exists():
-                filelist_path.unlink()
+        
+        file_size = output_path.stat().st_size
+        
+        # Cleanup source files if requested
+        if request.cleanup_source_files:
+            for file_path in valid_files:
+                try:
+                    Path(file_path).unlink()
+                    logger.info(f"Deleted source file: {file_path}")
+                except Exception as e:
+                    logger.warning(f"Failed to delete source file {file_path}: {e}")
+        
+        return AudioMergeResponse(
+            success=True,
+            output_path=str(output_path),
+            output_url=f"/static/audio/{output_path.name}",
+            file_size=file_size,
+            merged_files_count=len(valid_files),
+            message=f"Successfully merged {len(valid_files)} audio files"
+        )
         
     except HTTPException:
         raise
@@ -214,18 +179,15 @@ async def fix_audio_format(request: AudioFormatRequest):
         # Create output directory if needed
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Check if FFmpeg is available
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        # Check if FFmpeg is available (detected once at startup)
+        if not await media_runner.has("ffmpeg"):
             raise HTTPException(
                 status_code=500,
                 detail="FFmpeg is not installed or not available"
             )
         
         # FFmpeg command to fix format
-        cmd = [
-            'ffmpeg',
+        args = [
             '-y',  # Overwrite output file
             '-i', str(input_path),
             '-ar', str(request.sample_rate),
@@ -235,7 +197,10 @@ async def fix_audio_format(request: AudioFormatRequest):
         ]
         
         # Run FFmpeg
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        try:
+            result = await media_runner.ffmpeg(args)
+        except MediaToolError as e:
+            raise HTTPException(status_code=500, detail=f"FFmpeg format fix failed: {str(e)}")
         
         if result.returncode != 0:
             raise HTTPException(
@@ -349,16 +314,14 @@ async def get_audio_info(filename: str):
         
         # Try to get audio duration using FFprobe if available
         try:
-            cmd = [
-                'ffprobe',
+            args = [
                 '-v', 'quiet',
                 '-print_format', 'json',
                 '-show_entries', 'format=duration',
                 str(file_path)
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = await media_runner.ffprobe(args, timeout=30)
             if result.returncode == 0:
-                import json
                 probe_data = json.loads(result.stdout)
                 duration = float(probe_data.get('format', {}).get('duration', 0))
                 info['duration'] = duration
@@ -377,32 +340,41 @@ async def get_audio_info(filename: str):
             detail=f"Failed to get audio info: {str(e)}"
         )
 
+@router.get("/timing/{script_name}")
+async def get_audio_timing(
+    script_name: str,
+    format: str = Query(default="json", pattern="^(json|vtt|srt)$", description="json sidecar, WebVTT or SRT"),
+    text: str = Query(default="hakka_text", description=f"Cue text field for vtt/srt: {', '.join(TEXT_FIELDS)}"),
+):
+    """Get the segment timing index of a merged episode (for seeking and synchronized transcripts)"""
+    if text not in TEXT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"text must be one of {', '.join(TEXT_FIELDS)}")
+    index = load_timing_index(audio_manager.audio_dir, script_name)
+    if not index:
+        raise HTTPException(status_code=404, detail=f"No timing index for script: {script_name}")
+    content, media_type = render_timing(index, format, text)
+    return Response(content=content, media_type=media_type)
+
 @router.get("/scripts")
 async def list_audio_scripts():
-    """List all script names that have audio files"""
+    """List all script names that have rendered segment audio (in their latest generation job)"""
     try:
-        audio_dir = Path("static/audio")
-        if not audio_dir.exists():
-            return {"scripts": []}
-        
-        # Find all audio files and extract script names
-        scripts = set()
-        for file_path in audio_dir.glob("*.wav"):
-            if file_path.is_file():
-                # Extract script name from filename pattern: script_name_speaker_index.wav
-                match = re.match(r'^([^_]+(?:_[^_]+)*)_[A-Z]{2,3}_\d+.*\.wav$', file_path.name)
-                if match:
-                    script_name = match.group(1)
-                    scripts.add(script_name)
-        
         script_list = []
-        for script_name in sorted(scripts):
-            # Count files for each script
-            file_count = len(list(audio_dir.glob(f"{script_name}_*.wav")))
-            script_list.append({
-                "name": script_name,
-                "file_count": file_count
-            })
+        seen = set()
+        # jobs() 依更新時間由新到舊，每個腳本只看最新一次產生的段落
+        for job in job_store.jobs():
+            script_name = job.load_state().get("script_name")
+            if not script_name or script_name in seen:
+                continue
+            seen.add(script_name)
+            file_count = len(job.segment_files())
+            if file_count:
+                script_list.append({
+                    "name": script_name,
+                    "job_id": job.job_id,
+                    "file_count": file_count
+                })
+        script_list.sort(key=lambda script: script["name"])
         
         return {
             "scripts": script_list,
@@ -414,4 +386,4 @@ async def list_audio_scripts():
         raise HTTPException(
             status_code=500,
             detail=f"Failed to list audio scripts: {str(e)}"
-        )
\ No newline at end of file
+        )
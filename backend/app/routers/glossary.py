@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import logging
+
+from app.models.glossary import GlossaryEntry, GlossaryEntryUpdate, GlossaryListResponse
+from app.services.glossary import glossary
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/glossary", tags=["glossary"])
+
+@router.get("/", response_model=GlossaryListResponse)
+async def list_glossary(
+    q: Optional[str] = Query(default=None, description="Filter on term or translation"),
+    source: Optional[str] = Query(default=None, description="Filter by source (llm or manual)"),
+    limit: int = Query(default=50, ge=1, le=500, description="Page size"),
+    offset: int = Query(default=0, ge=0, description="Number of entries to skip"),
+):
+    """List glossary entries used by the English pass of script generation"""
+    try:
+        items, total = await glossary.list(q=q, source=source, limit=limit, offset=offset)
+        return GlossaryListResponse(items=items, total=total, limit=limit, offset=offset)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list glossary: {str(e)}")
+
+@router.put("/{term}", response_model=GlossaryEntry)
+async def set_glossary_entry(term: str, request: GlossaryEntryUpdate):
+    """Add or override a term; manual entries are never replaced by LLM translations"""
+    try:
+        return await glossary.set(term, request.translation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update glossary: {str(e)}")
+
+@router.delete("/{term}")
+async def delete_glossary_entry(term: str):
+    """Remove a term (it is translated again by the LLM the next time it appears)"""
+    try:
+        deleted = await glossary.delete(term)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete glossary entry: {str(e)}")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Glossary entry not found")
+    return {"message": "Glossary entry deleted successfully"}
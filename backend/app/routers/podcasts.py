@@ -1,16 +1,25 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Depends
+from fastapi.responses import RedirectResponse, Response
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 import logging
+import uuid
+from functools import lru_cache
 
-from app.models.podcast import PodcastGenerationRequest, PodcastResponse, HostConfig
+from app.models.podcast import PodcastGenerationRequest, PodcastResponse, PodcastListResponse, HostConfig, ScriptEditRequest
 from app.services.podcast_service import PodcastService
+from app.services.renditions import select_rendition
+from app.services.timing_index import TEXT_FIELDS, load_timing_index, render_timing
 
 logger = logging.getLogger(__name__)
 
-service = PodcastService()
 router = APIRouter(prefix="/podcasts", tags=["podcasts"])
 
+@lru_cache(maxsize=None)
+def get_podcast_service() -> PodcastService:
+    """Shared PodcastService, built on the first podcasts request instead of at import"""
+    return PodcastService()
+
 # Request/Response Models
 class ScriptFileRequest(BaseModel):
     script_file_path: str = Field(..., description="Path to the script JSON file")
@@ -43,17 +52,45 @@ class ConfigResponse(BaseModel):
 @router.post("/generate", response_model=PodcastResponse)
 async def generate_podcast(
     request: PodcastGenerationRequest,
+    service: PodcastService = Depends(get_podcast_service)
 ):
     """Generate a new Hakka podcast"""
+    job_id = uuid.uuid4().hex
     try:
-        result = await service.generate_podcast(request)
+        result = await service.generate_podcast(request, job_id=job_id)
         return result["podcast"]
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate podcast: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate podcast (job {job_id}): {str(e)}")
+
+@router.get("/jobs/{job_id}")
+async def get_generation_job(
+    job_id: str,
+    service: PodcastService = Depends(get_podcast_service)
+):
+    """Get checkpoint status of a generation job"""
+    job = service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/jobs/{job_id}/resume", response_model=PodcastResponse)
+async def resume_generation_job(
+    job_id: str,
+    service: PodcastService = Depends(get_podcast_service)
+):
+    """Resume a failed generation job, re-running only missing stages and segments"""
+    if not service.get_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    try:
+        result = await service.resume_podcast(job_id)
+        return result["podcast"]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to resume job {job_id}: {str(e)}")
 
 @router.post("/generate-audio-from-script-file", response_model=AudioGenerationResponse)
 async def generate_audio_from_script_file(
     request: ScriptFileRequest,
+    service: PodcastService = Depends(get_podcast_service)
 ):
     """Generate audio from existing script file"""
     try:
@@ -88,19 +125,24 @@ async def generate_audio_from_script_file(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate audio from script file: {str(e)}")
 
-@router.get("/", response_model=List[PodcastResponse])
+@router.get("/", response_model=PodcastListResponse)
 async def get_podcasts(
+    limit: int = Query(default=20, ge=1, le=100, description="Page size"),
+    offset: int = Query(default=0, ge=0, description="Number of podcasts to skip"),
+    topic: Optional[str] = Query(default=None, description="Filter by topic"),
+    language: Optional[str] = Query(default=None, description="Filter by language (hakka or bilingual)"),
+    service: PodcastService = Depends(get_podcast_service)
 ):
-    """Get all generated podcasts"""
+    """List generated podcasts (newest first) as summaries; full transcripts come from GET /{podcast_id}"""
     try:
-        podcasts = await service.get_all_podcasts()
-        return podcasts
+        return await service.list_podcasts(limit=limit, offset=offset, topic=topic, language=language)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch podcasts: {str(e)}")
 
 @router.get("/{podcast_id}", response_model=PodcastResponse)
 async def get_podcast(
     podcast_id: str,
+    service: PodcastService = Depends(get_podcast_service)
 ):
     """Get a specific podcast by ID"""
     try:
@@ -113,9 +155,73 @@ async def get_podcast(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch podcast: {str(e)}")
 
+@router.patch("/{podcast_id}/script")
+async def edit_podcast_script(
+    podcast_id: str,
+    request: ScriptEditRequest,
+    service: PodcastService = Depends(get_podcast_service)
+):
+    """Edit script lines and re-render only the changed lines of the episode"""
+    if not service.get_job(podcast_id):
+        raise HTTPException(status_code=404, detail="Podcast job not found")
+    try:
+        return await service.edit_podcast(podcast_id, request.edits)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to edit podcast {podcast_id}: {str(e)}")
+
+@router.get("/{podcast_id}/audio")
+async def get_podcast_audio(
+    podcast_id: str,
+    request: Request,
+    format: Optional[str] = Query(default=None, description="Force a rendition format (opus, aac, mp3 or wav)"),
+    service: PodcastService = Depends(get_podcast_service)
+):
+    """Redirect to the best audio rendition for the client (by Accept header and User-Agent)"""
+    podcast = await service.get_podcast(podcast_id)
+    if not podcast:
+        raise HTTPException(status_code=404, detail="Podcast not found")
+    
+    if format:
+        rendition = next((r for r in podcast.renditions if r.format == format), None)
+        if not rendition:
+            raise HTTPException(status_code=404, detail=f"No {format} rendition for this podcast")
+        url = rendition.url
+    else:
+        rendition = select_rendition(
+            podcast.renditions,
+            accept=request.headers.get("accept"),
+            user_agent=request.headers.get("user-agent")
+        )
+        url = rendition.url if rendition else podcast.audioUrl
+    
+    if not url:
+        raise HTTPException(status_code=404, detail="Podcast has no audio")
+    return RedirectResponse(url, status_code=307, headers={"Vary": "Accept, User-Agent"})
+
+@router.get("/{podcast_id}/timing")
+async def get_podcast_timing(
+    podcast_id: str,
+    format: str = Query(default="json", pattern="^(json|vtt|srt)$", description="json sidecar, WebVTT or SRT"),
+    text: str = Query(default="hakka_text", description=f"Cue text field for vtt/srt: {', '.join(TEXT_FIELDS)}"),
+    service: PodcastService = Depends(get_podcast_service)
+):
+    """Get the segment timing index of a podcast's audio"""
+    if text not in TEXT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"text must be one of {', '.join(TEXT_FIELDS)}")
+    # The podcast id is its generation job id, whose state records the script name
+    job = service.get_job(podcast_id)
+    index = load_timing_index(service.audio_manager.audio_dir, job["script_name"]) if job and job.get("script_name") else None
+    if not index:
+        raise HTTPException(status_code=404, detail="No timing index for this podcast")
+    content, media_type = render_timing(index, format, text)
+    return Response(content=content, media_type=media_type)
+
 @router.delete("/{podcast_id}")
 async def delete_podcast(
     podcast_id: str,
+    service: PodcastService = Depends(get_podcast_service)
 ):
     """Delete a podcast by ID"""
     try:
@@ -132,6 +238,7 @@ async def delete_podcast(
 async def merge_audio_files(
     script_name: str = Query(..., description="Script name to merge audio files for"),
     auto_merge: bool = Query(default=False, description="Whether to automatically merge without confirmation"),
+    service: PodcastService = Depends(get_podcast_service)
 ):
     """Merge audio files into complete podcast"""
     try:
@@ -143,17 +250,14 @@ async def merge_audio_files(
 @router.get("/audio-files/{script_name}")
 async def get_audio_files(
     script_name: str,
+    service: PodcastService = Depends(get_podcast_service)
 ):
-    """Get audio files for a specific script"""
+    """Get audio files for a specific script (segments of its latest generation job)"""
     try:
-        # Check for available audio files
-        speaker_codes = ["SXF", "SXM", "HLF", "HLM"]
-        audio_files = {}
-        
-        for code in speaker_codes:
-            files = service.audio_manager.get_organized_files(script_name, code)
-            if files:
-                audio_files[code] = [f.name for f in files]
+        audio_files = {
+            code: [f.name for f in files]
+            for code, files in service.get_segment_files(script_name).items()
+        }
         
         return {
             "script_name": script_name,
@@ -166,21 +270,19 @@ async def get_audio_files(
 
 @router.get("/audio-info/{script_name}")
 async def get_audio_info(
-    script_name: str,       
+    script_name: str,
+    service: PodcastService = Depends(get_podcast_service)
 ):
-    """Get detailed audio information for a script"""
+    """Get detailed audio information for a script (segments of its latest generation job)"""
     try:
-        speaker_codes = ["SXF", "SXM", "HLF", "HLM"]
         audio_info = {}
         
-        for code in speaker_codes:
-            files = service.audio_manager.get_organized_files(script_name, code)
-            if files:
-                audio_info[code] = {
-                    "file_count": len(files),
-                    "files": [f.name for f in files],
-                    "total_size_mb": sum(f.stat().st_size for f in files) / (1024 * 1024)
-                }
+        for code, files in service.get_segment_files(script_name).items():
+            audio_info[code] = {
+                "file_count": len(files),
+                "files": [f.name for f in files],
+                "total_size_mb": sum(f.stat().st_size for f in files) / (1024 * 1024)
+            }
         
         return {
             "script_name": script_name,
@@ -193,5 +295,3 @@ async def get_audio_info(
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get audio info: {str(e)}")
-
-
@@ -1,13 +1,22 @@
+import asyncio
 import os
-from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
-from pydantic_ai.models.openai import OpenAIModel
+import re
+from typing import TYPE_CHECKING
 from app.core.config import settings
-from app.models.podcast import PodcastScript, PodcastScriptContent, EnglishTranslationResult, HostConfig
+from app.models.podcast import PodcastScript, PodcastScriptContent, EnglishTranslationResult, HostConfig, DialogueBlock, DialogueTransitions, EnglishTermBatch
 from app.services.translation_service import TranslationService
 from app.services.tts_service import TTSService
+from app.core.telemetry import tracer, record_items
+from app.services.llm_cache import llm_cache, model_name, MISS
+from app.services.model_router import model_router
+from app.services.context_window import ContextWindow, count_tokens
+from app.services.glossary import glossary
+from app.services.speech_rate import EpisodeBudget, speech_rates
 import logging
 
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -15,6 +24,10 @@ class AgentService:
     """使用 Pydantic AI (TWCC AFS 和 Gemini)"""
  
     def __init__(self):
+        # pydantic-ai (與 openai / google SDK) 匯入很慢，延後到第一次建立 AgentService 才載入
+        from pydantic_ai import Agent
+        from pydantic_ai.models.gemini import GeminiModel
+        from pydantic_ai.models.openai import OpenAIModel
         
         self.twcc_model = None
         self.gemini_flash_model = None
@@ -34,6 +47,14 @@ class AgentService:
             self.gemini_flash_model = GeminiModel('gemini-2.5-flash')    
             self.gemini_pro_model = GeminiModel('gemini-2.0-pro') 
         
+        # 每種任務可用的模型（依偏好排序），實際呼叫由 model_router 依延遲與錯誤率挑選
+        # TWCC (OpenAI 相容) 只用於純文字對話，結構化輸出交給 Gemini
+        self.model_routes = {
+            "dialogue": self._candidates(self.gemini_flash_model, self.twcc_model, self.gemini_pro_model),
+            "structured_dialogue": self._candidates(self.gemini_flash_model, self.gemini_pro_model),
+            "translation": self._candidates(self.gemini_pro_model, self.gemini_flash_model),
+        }
+        
         # 對話 Agent
         self.dialogue_agent = Agent(
             model=self.gemini_flash_model,
@@ -61,7 +82,61 @@ class AgentService:
             - 不需要英文註解
             """
         )
-    async def translate_english_to_chinese(self, text: str) -> EnglishTranslationResult:
+        # 英文詞彙批次翻譯 agent（整份腳本一次翻譯）
+        self.term_translator = Agent(
+            model=self.gemini_pro_model,
+            output_type=EnglishTermBatch,
+            system_prompt="""
+            你是一個專業的英文翻譯agent。你會收到一份從Podcast腳本中擷取出的英文詞彙清單，
+            請將每一項翻譯成自然流暢的繁體中文，並逐項回傳原文與翻譯。
+            
+            翻譯原則：
+            - 保持原意不變
+            - 專業術語要準確翻譯
+            - 品牌名稱使用常見中文譯名
+            - 不需要英文註解
+            """
+        )
+        # 整段對話 agent（block 模式：一次產生一則新聞的多輪對話）
+        self.block_agent = Agent(
+            model=self.gemini_flash_model,
+            output_type=DialogueBlock,
+            system_prompt="""
+            你是Podcast腳本作家，請為兩位主持人寫出一段針對單一新聞的多輪對話。
+            請用繁體中文，以口語化方式撰寫，每個發言都標明主持人名稱。
+            """
+        )
+        # 段落轉場 agent
+        self.transition_agent = Agent(
+            model=self.gemini_flash_model,
+            output_type=DialogueTransitions,
+            system_prompt="""
+            你是Podcast腳本編輯，負責在相鄰兩段新聞討論之間寫出自然的轉場句。
+            請用繁體中文，以口語化方式撰寫。
+            """
+        )
+
+    @staticmethod
+    def _candidates(*models):
+        return [(model_name(model), model) for model in models if model is not None]
+
+    async def _run(self, agent: "Agent", operation: str, prompt: str, use_cache: bool = True, task: str = "dialogue"):
+        """Run an agent through the model router, answering identical (model, system prompt, prompt, output schema) calls from the cache
+
+        The cache key uses the agent's preferred model; answers from failover models are stored under it too.
+        """
+        use_cache = use_cache and llm_cache.enabled
+        if use_cache:
+            key = llm_cache.key(agent.model, agent._system_prompts, prompt, agent.output_type)
+            cached = await llm_cache.get(key, agent.output_type)
+            if cached is not MISS:
+                return cached
+        output = await model_router.run(agent, prompt, self.model_routes[task], operation)
+        if use_cache:
+            await llm_cache.put(key, agent.model, output, agent.output_type)
+        return output
+
+    async def translate_english_to_chinese(self, text: str, use_cache: bool = True) -> EnglishTranslationResult:
         """
         處理英文翻譯
         1. 將英文從文本提取
@@ -96,8 +171,7 @@ class AgentService:
             - 確保翻譯自然流暢
             """
             
-            result = await self.english_translator.run(prompt)
-            translation_data = result.output
+            translation_data = await self._run(self.english_translator, "english_translation", prompt, use_cache, task="translation")
             
             # 進行英文替換，生成處理後的文本
             processed_content = text
@@ -128,10 +202,39 @@ class AgentService:
                 processed_content=text
             )
             
-    async def generate_reply(self, prompt: str) -> str:
+    async def translate_english_terms(self, terms: list, use_cache: bool = True) -> dict:
+        """批次翻譯英文詞彙，回傳 {原文: 中文}（漏翻的詞彙不會出現在結果中）"""
+        if not terms:
+            return {}
+        prompt = (
+            f"請翻譯以下{len(terms)}個英文詞彙，每一項都要回傳，original 必須與清單中的原文完全相同：\n"
+            + "\n".join(f"- {term}" for term in terms)
+        )
+        batch = await self._run(self.term_translator, "english_terms", prompt, use_cache, task="translation")
+        wanted = set(terms)
+        return {
+            item.original: item.translated.strip()
+            for item in batch.translations
+            if item.original in wanted and item.translated.strip()
+        }
+
+    async def generate_reply(self, prompt: str, use_cache: bool = True) -> str:
         """生成對話回應"""
-        result = await self.dialogue_agent.run(prompt)
-        return result.output
+        output = await self._run(self.dialogue_agent, "dialogue_reply", prompt, use_cache)
+        record_items("dialogue_responses")
+        return output
+
+    async def generate_dialogue_block(self, prompt: str, use_cache: bool = True) -> DialogueBlock:
+        """生成一則新聞的整段多輪對話"""
+        output = await self._run(self.block_agent, "dialogue_block", prompt, use_cache, task="structured_dialogue")
+        record_items("dialogue_responses")
+        return output
+
+    async def generate_transitions(self, prompt: str, use_cache: bool = True) -> list:
+        """生成段落之間的轉場句"""
+        output = await self._run(self.transition_agent, "dialogue_transitions", prompt, use_cache, task="structured_dialogue")
+        record_items("dialogue_responses")
+        return output.transitions
 
     # async def convert_english_to_romanization(self, text: str) -> str:
     #     """將文本中的英文單字轉換成帶數字標調的羅馬拼音格式"""
@@ -201,24 +304,43 @@ class AgentService:
 
 # Constants and utility functions from agents.py
 CONTEXT_WINDOW_TOKENS = 32000
-
-#估算token數量
-def count_tokens(text):
-    return int(len(text) / 1.5)
-
-def trim_context(context_list, max_tokens=CONTEXT_WINDOW_TOKENS):
-    trimmed = []
-    total_tokens = 0
-    for line in reversed(context_list):
-        tokens = count_tokens(line)
-        if total_tokens + tokens > max_tokens:
+CONTEXT_TURNS = 6  # 只保留最近6輪
+
+# 連續的英文單字（可含數字、連字號、縮寫點與單字間的空白）視為一個詞彙
+ENGLISH_SPAN = re.compile(r"[A-Za-z][A-Za-z0-9'’&+.\-]*(?:[ \t]+[A-Za-z0-9][A-Za-z0-9'’&+.\-]*)*")
+ENGLISH_BATCH_SIZE = 80  # 每次 LLM 呼叫最多翻譯的詞彙數
+
+def extract_english_spans(text):
+    """Distinct English spans in text, in order of appearance"""
+    spans = []
+    for match in ENGLISH_SPAN.finditer(text):
+        span = match.group(0).rstrip(".-'’ ")
+        if span and span not in spans:
+            spans.append(span)
+    return spans
+
+def fit_dialogue_block(block, names, seconds, budget: EpisodeBudget):
+    """Normalize a DialogueBlock to 'name: text' lines: known speakers only, 4 sentences per turn, within seconds of predicted audio"""
+    lines = []
+    used = 0.0
+    for i, turn in enumerate(block.turns):
+        speaker = turn.speaker.strip()
+        if speaker not in names:
+            speaker = names[i % 2]
+        text = turn.text.strip()
+        for prefix in (f"{speaker}:", f"{speaker}："):
+            if text.startswith(prefix):
+                text = text[len(prefix):].strip()
+        limited = "。".join(text.split("。")[:4]).strip()
+        if not limited:
+            continue
+        limited += "。" if not limited.endswith("。") else ""
+        line_seconds = budget.seconds(speaker, limited)
+        if lines and used + line_seconds > seconds:
             break
-        trimmed.insert(0, line)
-        total_tokens += tokens
-    return trimmed
-
-def max_chars_for_duration(minutes):
-    return int(minutes * 120)
+        lines.append(f"{speaker}: {limited}")
+        used += line_seconds
+    return lines
 
 #定義兩個主持人佳昀/敏權
 class HostAgent:
@@ -227,28 +349,31 @@ class HostAgent:
         self.personality = personality
         self.ai_service = ai_service
 
-    async def reply(self, context_list, all_articles, current_article_idx, turn, is_last_turn):
-        trimmed_context = trim_context(context_list[-6:])  # 只保留最近6輪
-        context_text = "\n".join(trimmed_context)
-        # article = all_articles[current_article_idx]
+    async def reply(self, context: ContextWindow, current_article_idx, turn, is_last_turn, next_topic=None):
         transition = ""
-        if is_last_turn and current_article_idx < len(all_articles) - 1:
+        if is_last_turn and next_topic:
             transition = (
                 f"\n請在本輪發言結尾，自然地將話題帶到下一則新聞，不要用『接下來』等制式語，"
                 f"而是用評論、延伸、或舉例的方式，讓對話順暢銜接到下一篇主題。"
-                f"下一篇主題的重點是：{all_articles[current_article_idx+1].summary or all_articles[current_article_idx+1].content[:60]}"
+                f"下一篇主題的重點是：{next_topic}"
             )
 
-        prompt = (
+        instructions = (
             f"你是{self.name}，個性是{self.personality}。\n"
             f"請用{self.personality}的語氣，根據對話紀錄進行討論。\n"
             f"請一定要避免重複前面已經討論過的內容，盡量提出新的觀點、舉例或延伸討論，並與另一位主持人有互動。\n"
             f"每次發言**最多4句話**，請用像朋友之間輕鬆自然聊天方式，時不時加些有趣的回覆，內容要有深度與互動。"
             f"每句話之間請用句號分隔，回應前加上**「{self.name}: 」**"
-            f"目前對話紀錄：\n{context_text}\n"
+        )
+        # 對話紀錄只用掉指令與轉場提示以外的 token 預算
+        budget = CONTEXT_WINDOW_TOKENS - count_tokens(instructions) - count_tokens(transition)
+        prompt = (
+            f"{instructions}"
+            f"目前對話紀錄：\n{context.text(budget)}\n"
             f"{transition}"
         )
-        response = await self.ai_service.generate_reply(prompt)
+        with tracer.start_as_current_span("host_agent.reply", attributes={"host": self.name, "article": current_article_idx, "turn": turn}):
+            response = await self.ai_service.generate_reply(prompt)
         sentences = response.split("。")
         limited = "。".join(sentences[:4]).strip()
         if not limited.startswith(f"{self.name}:"):
@@ -260,10 +385,140 @@ class AIService:
     def __init__(self):
         self.translation_service = TranslationService()
         self.tts_service = TTSService()
-        self.agent_service = AgentService()
+        self._agent_service = None
+
+    @property
+    def agent_service(self) -> AgentService:
+        """Built on first use, so constructing AIService does not load the LLM stack"""
+        if self._agent_service is None:
+            self._agent_service = AgentService()
+        return self._agent_service
+
+    async def _article_brief(self, article) -> str:
+        """Conversational lead-in for one article; AlphaXiv papers reuse their paper_summary"""
+        if article.source == "arxiv" and article.summary:
+            return article.summary
+        # 用 LLM 產生精簡摘要
+        summary_prompt = (
+            "請你用自然的語氣，像朋友聊天一樣，順勢帶出下面這則新聞的重點摘要，"
+            "不要用『這則新聞的重點是』、『接下來』等制式開頭，"
+            "而是用評論、感想、或延伸話題的方式自然銜接，50字以內：\n"
+            f"{article.content or article.summary}"
+        )
+        return await self.agent_service.generate_reply(summary_prompt)
+
+    async def _closing_lines(self, name_a: str, name_b: str, news_list: str) -> list:
+        """Closing summary, follow-up and sign-off (none of them depend on the dialogue)"""
+        summary_prompt_a = (
+            f"請你以{name_a}的身分，針對今天討論的三則新聞做一個重點總結。\n"
+            f"本集三則新聞分別是：\n{news_list}\n"
+            "請直接用自然語言總結今天的討論內容，務必不可出現任何[新聞一主題]、[省略]或任何佔位符，"
+            f"內容要完整、精簡且貼合本集主題，約3~4句話，每句話用句號分隔，開頭加「{name_a}: 」"
+        )
+        summary_prompt_b = (
+            f"請你以{name_b}的身分，針對{name_a}的總結內容做補充或分享個人觀點，"
+            f"語氣輕鬆，約2~3句話，每句話用句號分隔，開頭加「{name_b}: 」"
+        )
+        ending_prompt_a = (
+            f"請你以{name_a}的身分，用一段話做本集播客的溫馨結語，"
+            f"內容要呼應今天討論的三則新聞，開頭加「{name_a}: 」，不要有任何佔位符。"
+        )
+        return await asyncio.gather(*(
+            self.agent_service.generate_reply(prompt) for prompt in (summary_prompt_a, summary_prompt_b, ending_prompt_a)
+        ))
+
+    async def _turn_dialogue(self, dialogue, host_a, host_b, articles, budget: EpisodeBudget, per_article_seconds, body_end):
+        """Turn mode: briefs up front, then one LLM call per host turn until the predicted audio fills the article's share"""
+        # 摘要與轉場提示只依賴文章本身，在對話開始前一次並行產生
+        next_topics = [
+            (articles[i + 1].summary or articles[i + 1].content[:60]) if i < len(articles) - 1 else None
+            for i in range(len(articles))
+        ]
+        briefs = await asyncio.gather(*(self._article_brief(article) for article in articles))
+        context = ContextWindow(CONTEXT_WINDOW_TOKENS, max_lines=CONTEXT_TURNS)
+        context.extend(dialogue)
+        turn = 0
 
-    async def generate_podcast_script_with_agents(self, articles, max_minutes=25, hosts=None):
-        """Generate podcast script using agent-based conversation (merged from agents.py)"""
+        for idx in range(len(articles)):
+            # 限制摘要最多四句
+            sentences = briefs[idx].strip().split("。")
+            intro = f"{host_a.name}: {'。'.join(sentences[:5]).strip()}"
+            dialogue.append(intro)
+            context.append(intro)
+            article_seconds = budget.add(intro)
+
+            for round in range(30):
+                # 再一輪發言若會超出份額一半以上就停，使預估長度落在目標附近而非一律超過
+                turn_seconds = budget.turn_seconds()
+                if article_seconds + turn_seconds / 2 > per_article_seconds or budget.elapsed + turn_seconds / 2 > body_end:
+                    break
+                is_last_turn = (article_seconds + turn_seconds * 1.5 > per_article_seconds)
+                if turn % 2 == 0:
+                    reply = await host_a.reply(context, idx, turn, is_last_turn, next_topics[idx])
+                else:
+                    reply = await host_b.reply(context, idx, turn, is_last_turn, next_topics[idx])
+                dialogue.append(reply)
+                context.append(reply)
+                article_seconds += budget.add(reply)
+                turn += 1
+
+    async def _block_dialogue(self, dialogue, host_a, host_b, articles, budget: EpisodeBudget, per_article_seconds):
+        """Block mode: one structured call per article (all concurrent), then one stitching call"""
+        blocks = await asyncio.gather(*(
+            self._article_block(article, host_a, host_b, budget, per_article_seconds) for article in articles
+        ))
+        transitions = await self._block_transitions(blocks) if len(blocks) > 1 else []
+        for idx, block in enumerate(blocks):
+            lines = block + ([transitions[idx]] if idx < len(transitions) and transitions[idx] else [])
+            dialogue.extend(lines)
+            for line in lines:
+                budget.add(line)
+
+    async def _article_block(self, article, host_a, host_b, budget: EpisodeBudget, seconds: float) -> list:
+        """Whole exchange about one article as 'name: text' lines, fitted to seconds of predicted audio"""
+        prompt = (
+            f"請為Podcast主持人{host_a.name}（個性：{host_a.personality}）和{host_b.name}（個性：{host_b.personality}）"
+            f"寫出一段針對下面這則新聞的多輪對話。\n"
+            f"由{host_a.name}先用自然的語氣帶出新聞重點，不要用『這則新聞的重點是』、『接下來』等制式開頭；"
+            f"之後兩人輪流發言，互相回應，提出新的觀點、舉例或延伸討論，避免重複。\n"
+            f"每次發言**最多4句話**，像朋友之間輕鬆自然聊天，不要開場問候，也不要做整集的結語。\n"
+            f"全部對話總長約{budget.units_for(seconds)}字，speaker 只能是「{host_a.name}」或「{host_b.name}」。\n"
+            f"新聞內容：\n{(article.content or article.summary)[:2000]}"
+        )
+        block = await self.agent_service.generate_dialogue_block(prompt)
+        return fit_dialogue_block(block, (host_a.name, host_b.name), seconds, budget)
+
+    async def _block_transitions(self, blocks) -> list:
+        """One call writing the transition line at every block boundary, spoken by the block's last speaker"""
+        boundaries = []
+        speakers = []
+        for idx in range(len(blocks) - 1):
+            ending = blocks[idx][-1] if blocks[idx] else ""
+            opening = blocks[idx + 1][0] if blocks[idx + 1] else ""
+            speakers.append(ending.split(":", 1)[0] if ending else None)
+            boundaries.append(f"{idx + 1}. 前段結尾：{ending}\n   下一段開頭：{opening}")
+        prompt = (
+            f"以下是Podcast中相鄰兩段新聞討論的{len(boundaries)}個交界。"
+            "請為每個交界寫一句轉場的話（30字以內），由前段最後發言的主持人說出，"
+            "不要用『接下來』等制式語，而是用評論、延伸或舉例的方式，自然銜接到下一段的主題。"
+            f"請依序回傳，剛好{len(boundaries)}句，不要加主持人名稱：\n" + "\n".join(boundaries)
+        )
+        try:
+            transitions = await self.agent_service.generate_transitions(prompt)
+        except Exception as e:
+            logger.warning(f"轉場句產生失敗，直接銜接段落: {e}")
+            return []
+        return [
+            f"{speaker}: {text.strip()}" if speaker else ""
+            for speaker, text in zip(speakers, transitions)
+        ]
+
+    async def generate_podcast_script_with_agents(self, articles, max_minutes=25, hosts=None, voices=None):
+        """Generate podcast script using agent-based conversation (merged from agents.py)
+
+        voices maps host names to TTS voice IDs; with it the episode length is predicted
+        from each voice's measured speech rate (see speech_rate.SpeechRateModel).
+        """
         if hosts is None:
             hosts = [
                 HostConfig(name="佳昀", gender="female", dialect="sihxian", personality="理性、專業、分析"),
@@ -278,70 +533,37 @@ class AIService:
         host_a = HostAgent(hosts[0].name, hosts[0].personality, self.agent_service)
         host_b = HostAgent(hosts[1].name, hosts[1].personality, self.agent_service)
         dialogue = []
-        total_chars = 0
-        max_chars = max_chars_for_duration(max_minutes)
-        per_article_chars = max_chars // len(articles)
-        turn = 0
+        # 依各主持人聲音與腔調實測的語速預估音檔長度，對話寫到目標長度就停
+        voices = voices or {}
+        budget = await speech_rates.budget(
+            max_minutes * 60,
+            [host_a.name, host_b.name],
+            {host.name: (voices[host.name], host.dialect or "") for host in hosts if host.name in voices}
+        )
 
         # 開場
         dialogue.append(f"{host_a.name}: 大家好，我是{host_a.name}。")
         dialogue.append(f"{host_b.name}: 我是{host_b.name}，歡迎收聽哈客播。")
         dialogue.append(f"{host_a.name}: 今天我們為大家帶來三則重要新聞，讓我們一起看看！")
+        for line in dialogue:
+            budget.add(line)
+        # 收尾三段發言與對話並行產生，先預留平均發言長度
+        body_end = budget.target_seconds - 3 * budget.turn_seconds()
+        per_article_seconds = max(body_end - budget.elapsed, 0) / len(articles)
 
-        for idx, article in enumerate(articles):
-            article_chars = 0
-
-            # 用 LLM 產生精簡摘要
-            summary_prompt = (
-                "請你用自然的語氣，像朋友聊天一樣，順勢帶出下面這則新聞的重點摘要，"
-                "不要用『這則新聞的重點是』、『接下來』等制式開頭，"
-                "而是用評論、感想、或延伸話題的方式自然銜接，50字以內：\n"
-                f"{article.content or article.summary}"
-            )
-            brief = await self.agent_service.generate_reply(summary_prompt)
-            # 限制摘要最多四句
-            sentences = brief.strip().split("。")
-            intro = f"{host_a.name}: {'。'.join(sentences[:5]).strip()}"
-            dialogue.append(intro)
-
-            for round in range(30):
-                is_last_turn = (article_chars + 100 > per_article_chars * 0.95)
-                if article_chars > per_article_chars * 0.95 or total_chars > max_chars * 0.95:
-                    break  
-                if turn % 2 == 0:
-                    reply = await host_a.reply(dialogue, articles, idx, turn, is_last_turn)
-                else:
-                    reply = await host_b.reply(dialogue, articles, idx, turn, is_last_turn)
-                dialogue.append(reply)
-                total_chars += len(reply)
-                article_chars += len(reply)
-                turn += 1
-
-        # 三篇新聞討論完，進入收尾
+        # 收尾只依賴文章本身，與對話主體並行產生
         news_list = "\n".join([f"{i+1}. {(a.summary or a.content)[:60]}" for i, a in enumerate(articles)])
+        if settings.DIALOGUE_MODE == "block":
+            body = self._block_dialogue(dialogue, host_a, host_b, articles, budget, per_article_seconds)
+        else:
+            body = self._turn_dialogue(dialogue, host_a, host_b, articles, budget, per_article_seconds, body_end)
+        _, closing = await asyncio.gather(body, self._closing_lines(host_a.name, host_b.name, news_list))
 
-        summary_prompt_a = (
-            f"請你以{host_a.name}的身分，針對今天討論的三則新聞做一個重點總結。\n"
-            f"本集三則新聞分別是：\n{news_list}\n"
-            "請直接用自然語言總結今天的討論內容，務必不可出現任何[新聞一主題]、[省略]或任何佔位符，"
-            f"內容要完整、精簡且貼合本集主題，約3~4句話，每句話用句號分隔，開頭加「{host_a.name}: 」"
-        )
-        summary_a = await self.agent_service.generate_reply(summary_prompt_a)
-        dialogue.append(summary_a.strip())
-
-        summary_prompt_b = (
-            f"請你以{host_b.name}的身分，針對{host_a.name}的總結內容做補充或分享個人觀點，"
-            f"語氣輕鬆，約2~3句話，每句話用句號分隔，開頭加「{host_b.name}: 」"
-        )
-        summary_b = await self.agent_service.generate_reply(summary_prompt_b)
-        dialogue.append(summary_b.strip())
-
-        ending_prompt_a = (
-            f"請你以{host_a.name}的身分，用一段話做本集播客的溫馨結語，"
-            f"內容要呼應今天討論的三則新聞，開頭加「{host_a.name}: 」，不要有任何佔位符。"
-        )
-        ending_a = await self.agent_service.generate_reply(ending_prompt_a)
-        dialogue.append(ending_a.strip())
+        # 三篇新聞討論完，進入收尾
+        for line in closing:
+            dialogue.append(line.strip())
+            budget.add(line.strip())
+        logger.info(f"預估音檔長度 {budget.elapsed / 60:.1f} 分鐘（目標 {max_minutes} 分鐘）")
 
         def merge_same_speaker_lines(dialogue_lines):
             merged = []
@@ -372,61 +594,46 @@ class AIService:
         # 合併同主持人發言，並在不同主持人時換行
         merged_lines = merge_same_speaker_lines(dialogue)
         
-        # 處理英文轉換
+        # 處理英文轉換：整份腳本的英文詞彙一次擷取、批次翻譯，再以術語表逐行一次替換
         logger.info("正在處理腳本中的英文內容...")
-        processed_lines = []
-        session_translations = {}  # 本次會話的翻譯對照表
-        
-        def contains_english_chars(text: str) -> bool:
-            """檢查文本是否包含英文字元"""
-            import re
-            return bool(re.search(r'[a-zA-Z]', text))
-        
-        def apply_translations(text: str) -> tuple[str, list]:
-            """應用緩存的翻譯，返回處理後的文本和新增的翻譯"""
-            processed_text = text
-            
-            # 檢查緩存中是否有匹配的翻譯
-            for orig, trans in session_translations.items():
-                if orig in processed_text:
-                    processed_text = processed_text.replace(orig, trans)
-            
-            return processed_text
-        
+        prefixes = (f"{host_a.name}:", f"{host_b.name}:")
+
+        def split_speaker(line: str):
+            for prefix in prefixes:
+                if line.startswith(prefix):
+                    return prefix, line[len(prefix):]
+            return "", line
+
+        terms = []
         for line in merged_lines:
-            try:
-                # 檢查是否包含英文字元，如果沒有則直接跳過
-                if not contains_english_chars(line):
-                    processed_lines.append(line)
+            for span in extract_english_spans(split_speaker(line)[1]):
+                if span not in terms:
+                    terms.append(span)
+
+        # 術語表（跨集數共用）已有的詞彙不再詢問 LLM
+        known = await glossary.lookup(terms) if terms else {}
+        missing = [term for term in terms if term not in known]
+        if missing:
+            batches = [missing[i:i + ENGLISH_BATCH_SIZE] for i in range(0, len(missing), ENGLISH_BATCH_SIZE)]
+            results = await asyncio.gather(
+                *(self.agent_service.translate_english_terms(batch) for batch in batches),
+                return_exceptions=True
+            )
+            learned = {}
+            for batch, result in zip(batches, results):
+                if isinstance(result, Exception):
+                    # 翻譯失敗的詞彙保留原文
+                    logger.error(f"英文詞彙批次翻譯失敗（{len(batch)} 項）: {result}")
                     continue
-                
-                # 先應用緩存的翻譯
-                cached_result = apply_translations(line)
-                
-                # 如果緩存翻譯後還有英文字元，才發送新的翻譯請求
-                if contains_english_chars(cached_result):
-                    # 使用新的英文翻譯 agent 處理
-                    translation_result = await self.agent_service.translate_english_to_chinese(cached_result)
-                    
-                    # 處理新的翻譯結果
-                    if translation_result.original_texts:
-                        # 儲存到會話翻譯表和全局緩存
-                        logger.info(f"英文翻譯處理:")
-                        for orig, trans in zip(translation_result.original_texts, translation_result.translated_texts):
-                            session_translations[orig] = trans
-                            logger.info(f"  {orig} -> {trans}")
-                    
-                    final_result = translation_result.processed_content
-                else:
-                    # 只使用了緩存翻譯
-                    final_result = cached_result
-                
-                processed_lines.append(final_result)
-                    
-            except Exception as e:
-                logger.error(f"處理行 '{line[:50]}...' 時發生錯誤: {e}")
-                # 如果處理失敗，使用原始內容
-                processed_lines.append(line)
+                learned.update(result)
+            await glossary.learn(learned)
+            for orig, trans in learned.items():
+                logger.info(f"  {orig} -> {trans}")
+        if terms:
+            logger.info(f"英文翻譯處理: {len(terms)} 個詞彙，術語表命中 {len(known)} 個")
+
+        bodies = await glossary.replace([split_speaker(line)[1] for line in merged_lines])
+        processed_lines = [split_speaker(line)[0] + body for line, body in zip(merged_lines, bodies)]
         
         # 轉成結構化陣列
         content = []
@@ -457,6 +664,7 @@ class AIService:
         )
         
         print(f"腳本字數：{sum(len(c.text) for c in content)}")
+        record_items("scripts")
         
         # 返回包含TTS版本的結果
         return {
@@ -0,0 +1,308 @@
+import math
+import mmap
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.wav_concat import (
+    ConcatResult, PathLike, WavConcatWriter, WavFormat, WavFormatError, read_wav_info
+)
+
+# Full scale of 16-bit PCM
+PCM16_SCALE = 32768.0
+
+
+class PostProcessOptions(NamedTuple):
+    silence_threshold_dbfs: float = -45.0
+    edge_padding_ms: int = 30
+    target_rms_dbfs: float = -20.0
+    peak_ceiling_dbfs: float = -1.0
+    max_gain_db: float = 12.0
+    turn_pause_ms: int = 400
+    same_speaker_pause_ms: int = 200
+    crossfade_ms: int = 10
+
+    @classmethod
+    def from_settings(cls) -> "PostProcessOptions":
+        return cls(
+            silence_threshold_dbfs=settings.AUDIO_SILENCE_THRESHOLD_DBFS,
+            target_rms_dbfs=settings.AUDIO_TARGET_RMS_DBFS,
+            peak_ceiling_dbfs=settings.AUDIO_PEAK_CEILING_DBFS,
+            turn_pause_ms=settings.AUDIO_TURN_PAUSE_MS,
+            same_speaker_pause_ms=settings.AUDIO_SAME_SPEAKER_PAUSE_MS,
+            crossfade_ms=settings.AUDIO_CROSSFADE_MS,
+        )
+
+
+class SegmentStats(NamedTuple):
+    path: Path
+    data_offset: int
+    start: int  # first kept frame after trimming
+    end: int    # one past the last kept frame
+    rms: float  # linear, relative to full scale
+    peak: float
+    energy: float  # sum of squared (full-scale relative) samples
+
+    @property
+    def frames(self) -> int:
+        return self.end - self.start
+
+
+def db_to_amplitude(db: float) -> float:
+    return 10.0 ** (db / 20.0)
+
+
+def ms_to_frames(ms: float, sample_rate: int) -> int:
+    return int(round(ms * sample_rate / 1000.0))
+
+
+@lru_cache(maxsize=32)
+def silence_buffer(frames: int, frame_size: int) -> bytes:
+    """Zeroed PCM for a pause; cached so each pause length is allocated once"""
+    return bytes(frames * frame_size)
+
+
+@lru_cache(maxsize=32)
+def fade_curves(frames: int):
+    """Equal-power (fade_out, fade_in) curves shaped for broadcasting over channels"""
+    t = (np.arange(frames, dtype=np.float32) + 0.5) / frames
+    fade_in = np.sin(t * (math.pi / 2)).astype(np.float32)[:, None]
+    fade_out = np.cos(t * (math.pi / 2)).astype(np.float32)[:, None]
+    fade_in.flags.writeable = False
+    fade_out.flags.writeable = False
+    return fade_out, fade_in
+
+
+def _map_samples(path: Path, data_offset: int, frames: int, channels: int) -> np.ndarray:
+    if frames == 0:
+        return np.zeros((0, channels), dtype="<i2")
+    return np.memmap(path, dtype="<i2", mode="r", offset=data_offset, shape=(frames, channels))
+
+
+def analyse_segment(path: PathLike, wav_format: WavFormat, threshold: float, padding_frames: int) -> SegmentStats:
+    """Find the non-silent span of a segment and its level statistics"""
+    path = Path(path)
+    info = read_wav_info(path)
+    if info.format != wav_format:
+        raise WavFormatError(f"{path} is {info.format}, expected {wav_format}")
+
+    samples = _map_samples(path, info.data_offset, info.frames, wav_format.channels)
+    if not len(samples):
+        return SegmentStats(path, info.data_offset, 0, 0, 0.0, 0.0, 0.0)
+
+    magnitude = np.abs(samples.astype(np.int32)).max(axis=1)
+    loud = np.flatnonzero(magnitude > threshold)
+    if not len(loud):
+        # Entirely below the silence threshold
+        return SegmentStats(path, info.data_offset, 0, 0, 0.0, 0.0, 0.0)
+
+    start = max(0, int(loud[0]) - padding_frames)
+    end = min(len(samples), int(loud[-1]) + 1 + padding_frames)
+    kept = samples[start:end]
+    energy = float(np.square(kept, dtype=np.float64).sum()) / (PCM16_SCALE * PCM16_SCALE)
+    rms = math.sqrt(energy / kept.size)
+    peak = float(magnitude[start:end].max()) / PCM16_SCALE
+    return SegmentStats(path, info.data_offset, start, end, rms, peak, energy)
+
+
+def compute_gains(segments: Sequence[SegmentStats], options: PostProcessOptions, channels: int = 1) -> List[float]:
+    """Per-segment gains: each segment to the target RMS, then one episode-level correction
+
+    Segment gains are capped by max_gain_db (so near-silent takes are not blown up) and
+    by the peak ceiling; the episode gain brings the overall RMS back to target without
+    pushing any segment's peak over the ceiling.
+    """
+    target = db_to_amplitude(options.target_rms_dbfs)
+    ceiling = db_to_amplitude(options.peak_ceiling_dbfs)
+    max_gain = db_to_amplitude(options.max_gain_db)
+
+    gains = []
+    for seg in segments:
+        if seg.rms <= 0 or seg.peak <= 0:
+            gains.append(1.0)
+            continue
+        gains.append(min(target / seg.rms, max_gain, ceiling / seg.peak))
+
+    total_samples = sum(seg.frames for seg in segments) * channels
+    energy = sum(seg.energy * gain * gain for seg, gain in zip(segments, gains))
+    if total_samples == 0 or energy <= 0:
+        return gains
+
+    episode_rms = math.sqrt(energy / total_samples)
+    loudest_peak = max(seg.peak * gain for seg, gain in zip(segments, gains))
+    episode_gain = min(target / episode_rms, ceiling / loudest_peak if loudest_peak > 0 else 1.0, max_gain)
+    return [gain * episode_gain for gain in gains]
+
+
+def _load_segment(seg: SegmentStats, gain: float, channels: int) -> np.ndarray:
+    """Trimmed segment as float32 (full scale = 1.0) with its gain applied"""
+    samples = _map_samples(seg.path, seg.data_offset, seg.end, channels)[seg.start:seg.end]
+    return samples.astype(np.float32) * np.float32(gain / PCM16_SCALE)
+
+
+def _to_pcm16(samples: np.ndarray) -> bytes:
+    return np.clip(np.rint(samples * PCM16_SCALE), -PCM16_SCALE, PCM16_SCALE - 1).astype("<i2").tobytes()
+
+
+def postprocess_concat(
+    paths: Sequence[PathLike],
+    output_path: PathLike,
+    wav_format: WavFormat,
+    speakers: Optional[Sequence[str]] = None,
+    options: Optional[PostProcessOptions] = None,
+) -> ConcatResult:
+    """Trim, level, space and crossfade segments while concatenating them into one WAV
+
+    Segments are memory-mapped twice: a first pass finds the trim points and level
+    statistics, the second applies gains and fades in float32 and streams 16-bit PCM
+    to the output. Pauses come from cached silence buffers; a pause of 0 ms overlaps
+    neighbouring segments with an equal-power crossfade instead. No FFmpeg involved.
+
+    Returns frame-accurate offsets/lengths of each (trimmed) segment in the output.
+    """
+    if not paths:
+        raise ValueError("No audio files to concatenate")
+    if wav_format.sample_width != 2:
+        raise WavFormatError(f"Post-processing expects 16-bit PCM, got {wav_format}")
+
+    options = options or PostProcessOptions.from_settings()
+    sample_rate = wav_format.sample_rate
+    channels = wav_format.channels
+    frame_size = wav_format.frame_size
+    threshold = db_to_amplitude(options.silence_threshold_dbfs) * PCM16_SCALE
+    padding_frames = ms_to_frames(options.edge_padding_ms, sample_rate)
+    fade_frames = ms_to_frames(options.crossfade_ms, sample_rate)
+    turn_pause = ms_to_frames(options.turn_pause_ms, sample_rate)
+    same_pause = ms_to_frames(options.same_speaker_pause_ms, sample_rate)
+
+    # Pass 1: trim points and levels
+    segments = [analyse_segment(path, wav_format, threshold, padding_frames) for path in paths]
+    gains = compute_gains(segments, options, channels)
+
+    # Pass 2: apply and stream
+    segment_offsets: List[int] = []
+    segment_frames: List[int] = []
+    tail: Optional[np.ndarray] = None  # end of the previous segment, held back for its fade-out
+    previous_speaker = None
+
+    with WavConcatWriter(output_path, wav_format) as writer:
+        def position() -> int:
+            return writer.data_bytes // frame_size
+
+        for i, (seg, gain) in enumerate(zip(segments, gains)):
+            speaker = speakers[i] if speakers else None
+            if seg.frames == 0:
+                segment_offsets.append(position() + (len(tail) if tail is not None else 0))
+                segment_frames.append(0)
+                continue
+
+            x = _load_segment(seg, gain, channels)
+            n_fade = min(fade_frames, len(x) // 2)
+
+            pause = 0
+            if tail is not None:
+                pause = turn_pause if speaker != previous_speaker else same_pause
+
+            if tail is not None and pause == 0 and n_fade and len(tail):
+                # Overlap the previous segment's end with this segment's start
+                n = min(n_fade, len(tail))
+                fade_out, fade_in = fade_curves(n)
+                writer.write_frames(_to_pcm16(tail[:len(tail) - n]))
+                segment_offsets.append(position())
+                writer.write_frames(_to_pcm16(tail[len(tail) - n:] * fade_out + x[:n] * fade_in))
+                x = x[n:]
+            else:
+                if tail is not None:
+                    if len(tail):
+                        fade_out, _ = fade_curves(len(tail))
+                        writer.write_frames(_to_pcm16(tail * fade_out))
+                    writer.write_frames(silence_buffer(pause, frame_size))
+                segment_offsets.append(position())
+                if n_fade:
+                    _, fade_in = fade_curves(n_fade)
+                    x[:n_fade] *= fade_in
+            segment_frames.append(seg.frames)
+
+            # Hold back the last frames until we know how the next join looks
+            split = max(0, len(x) - n_fade)
+            writer.write_frames(_to_pcm16(x[:split]))
+            tail = x[split:]
+            previous_speaker = speaker
+
+        if tail is not None and len(tail):
+            fade_out, _ = fade_curves(len(tail))
+            writer.write_frames(_to_pcm16(tail * fade_out))
+
+        total_frames = position()
+
+    return ConcatResult(wav_format, total_frames, segment_frames, segment_offsets)
+
+
+def splice_segments(
+    source_path: PathLike,
+    timing_index: Dict[str, Any],
+    replacements: Dict[int, PathLike],
+    output_path: PathLike,
+    wav_format: WavFormat,
+    postprocess: bool = True,
+    options: Optional[PostProcessOptions] = None,
+) -> ConcatResult:
+    """Rebuild an episode from a previous render, re-processing only replaced segments
+
+    Unchanged segments and the silence between them are copied byte-for-byte from the
+    previous render using its timing index; each replacement is trimmed, levelled to the
+    target and faded on its own. Requires a render without crossfade overlaps (every
+    gap_frames >= 0), since overlapping segments cannot be separated again.
+    """
+    source_info = read_wav_info(source_path)
+    if source_info.format != wav_format:
+        raise WavFormatError(f"{source_path} is {source_info.format}, expected {wav_format}")
+    options = options or PostProcessOptions.from_settings()
+    channels = wav_format.channels
+    frame_size = wav_format.frame_size
+    sample_rate = wav_format.sample_rate
+    threshold = db_to_amplitude(options.silence_threshold_dbfs) * PCM16_SCALE
+    padding_frames = ms_to_frames(options.edge_padding_ms, sample_rate)
+    fade_frames = ms_to_frames(options.crossfade_ms, sample_rate)
+
+    segment_offsets: List[int] = []
+    segment_frames: List[int] = []
+    with open(source_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            WavConcatWriter(output_path, wav_format) as writer:
+        view = memoryview(mm)
+        try:
+            for entry in timing_index["segments"]:
+                if entry["gap_frames"] < 0:
+                    raise WavFormatError("Cannot splice a render with crossfaded (overlapping) segments")
+                writer.write_frames(silence_buffer(entry["gap_frames"], frame_size))
+                segment_offsets.append(writer.data_bytes // frame_size)
+
+                replacement = replacements.get(entry["index"])
+                if replacement is None:
+                    start = source_info.data_offset + entry["start_frame"] * frame_size
+                    end = start + entry["frames"] * frame_size
+                    if end > source_info.data_offset + source_info.data_size:
+                        raise WavFormatError(f"Timing index does not match {source_path}")
+                    segment_frames.append(writer.write_frames(view[start:end]))
+                elif not postprocess:
+                    segment_frames.append(writer.append_file(replacement))
+                else:
+                    seg = analyse_segment(replacement, wav_format, threshold, padding_frames)
+                    if seg.frames == 0:
+                        segment_frames.append(0)
+                        continue
+                    x = _load_segment(seg, compute_gains([seg], options, channels)[0], channels)
+                    n_fade = min(fade_frames, len(x) // 2)
+                    if n_fade:
+                        fade_out, fade_in = fade_curves(n_fade)
+                        x[:n_fade] *= fade_in
+                        x[len(x) - n_fade:] *= fade_out
+                    segment_frames.append(writer.write_frames(_to_pcm16(x)))
+        finally:
+            view.release()
+        total_frames = writer.data_bytes // frame_size
+
+    return ConcatResult(wav_format, total_frames, segment_frames, segment_offsets)
@@ -0,0 +1,91 @@
+import re
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import Deque, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# CJK ideographs / punctuation are about one token each; everything else about 4 chars per token
+_CJK = re.compile(r"[　-〿一-鿿＀-￯\U00020000-\U0002ffff]")
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    """tiktoken encoding, loaded once; None when tiktoken or its BPE file is unavailable"""
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(settings.CONTEXT_TOKENIZER)
+        except Exception as e:
+            # e.g. offline without a cached BPE file (TIKTOKEN_CACHE_DIR)
+            _encoding_failed = True
+            logger.warning(f"tiktoken encoding {settings.CONTEXT_TOKENIZER} unavailable, estimating tokens: {e}")
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """Token count of text (cached per string)"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class ContextWindow:
+    """Most recent dialogue lines with running token counts
+
+    append() and the evictions it triggers are O(1) per line; view() walks back
+    only as far as the requested budget.
+    """
+
+    def __init__(self, max_tokens: int, max_lines: Optional[int] = None):
+        self.max_tokens = max_tokens
+        self.max_lines = max_lines
+        self._lines: Deque[Tuple[str, int]] = deque()
+        self.tokens = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def append(self, line: str):
+        tokens = count_tokens(line)
+        self._lines.append((line, tokens))
+        self.tokens += tokens
+        while self._lines and (
+            self.tokens > self.max_tokens or (self.max_lines is not None and len(self._lines) > self.max_lines)
+        ):
+            _, evicted = self._lines.popleft()
+            self.tokens -= evicted
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def view(self, budget: Optional[int] = None) -> List[str]:
+        """Newest lines (oldest first) whose tokens fit in budget (default: the whole window)"""
+        if budget is None or budget >= self.tokens:
+            return [line for line, _ in self._lines]
+        selected = []
+        used = 0
+        for line, tokens in reversed(self._lines):
+            if used + tokens > budget:
+                break
+            selected.append(line)
+            used += tokens
+        selected.reverse()
+        return selected
+
+    def text(self, budget: Optional[int] = None) -> str:
+        return "\n".join(self.view(budget))
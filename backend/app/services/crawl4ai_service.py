@@ -1,15 +1,88 @@
-from crawl4ai import AsyncWebCrawler
+import asyncio
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
 from app.models.crawler import CrawledContent, ContentType
 from app.models.podcast import Topic
-from bs4 import BeautifulSoup
-import requests
+from app.core.config import settings
+from app.core.http import http_clients
+from app.core.telemetry import upstream
+from app.services.voice_backends import RateLimiter
+import httpx
 import re
 import xml.etree.ElementTree as ET
 import logging
 
 logger = logging.getLogger(__name__)
 
+_crawler = None
+_crawler_lock = asyncio.Lock()
+_host_limits: Dict[str, asyncio.Semaphore] = {}
+_arxiv_limiter: Optional[RateLimiter] = None
+
+ARXIV = "arxiv.org"
+
+async def get_crawler():
+    """Shared, started AsyncWebCrawler: the Playwright browser is launched once and reused across crawls"""
+    global _crawler
+    async with _crawler_lock:
+        if _crawler is None:
+            # crawl4ai 會連帶載入 Playwright，延後到真的要爬網頁時才匯入
+            from crawl4ai import AsyncWebCrawler
+            _crawler = await AsyncWebCrawler().start()
+    return _crawler
+
+async def close_crawler():
+    """Close the shared browser (app shutdown)"""
+    global _crawler
+    async with _crawler_lock:
+        if _crawler is not None:
+            crawler, _crawler = _crawler, None
+            await crawler.close()
+
+def _host_key(url: str) -> str:
+    host = urlsplit(url).netloc
+    # arxiv.org 與 export.arxiv.org 共用 arXiv 的請求額度
+    return ARXIV if host == ARXIV or host.endswith("." + ARXIV) else host
+
+def _host_limit(url: str) -> asyncio.Semaphore:
+    """Per-host cap on requests in flight (CRAWL_PER_HOST_CONCURRENCY, one for arXiv), shared by HTTP fetches and browser crawls"""
+    host = _host_key(url)
+    semaphore = _host_limits.get(host)
+    if semaphore is None:
+        semaphore = _host_limits[host] = asyncio.Semaphore(1 if host == ARXIV else settings.CRAWL_PER_HOST_CONCURRENCY)
+    return semaphore
+
+async def _host_turn(url: str):
+    """Wait for the host's rate limit (arXiv: ARXIV_REQUESTS_PER_MINUTE)"""
+    global _arxiv_limiter
+    if _host_key(url) != ARXIV or settings.ARXIV_REQUESTS_PER_MINUTE <= 0:
+        return
+    if _arxiv_limiter is None:
+        _arxiv_limiter = RateLimiter(settings.ARXIV_REQUESTS_PER_MINUTE)
+    await _arxiv_limiter.acquire()
+
+async def _get(url: str, timeout: float, service: str = "crawler", operation: str = "get") -> httpx.Response:
+    """GET on the shared crawler client within the host's limit; raises on network errors and HTTP error statuses"""
+    client = http_clients.get("crawler", follow_redirects=True)
+    async with _host_limit(url):
+        await _host_turn(url)
+        with upstream(service, operation, url=url):
+            response = await client.get(url, timeout=timeout)
+            response.raise_for_status()
+    return response
+
+async def fetch_text(url: str, timeout: float, service: str = "crawler", operation: str = "get", encoding: Optional[str] = None) -> str:
+    response = await _get(url, timeout, service, operation)
+    if encoding:
+        response.encoding = encoding
+    return response.text
+
+async def fetch_soup(url: str, timeout: float, service: str = "crawler", operation: str = "get"):
+    """Fetch and parse a page; parsing runs off the event loop"""
+    html = await fetch_text(url, timeout, service, operation)
+    return await asyncio.to_thread(_soup, html)
+
 def clean_markdown(md: str) -> str:
     """移除 markdown 中的 [文字](連結) 與多餘星號/空白行"""
     text = re.sub(r"\[.*?\]\(.*?\)", "", md)  # 移除 markdown 連結
@@ -20,10 +93,13 @@ def clean_markdown(md: str) -> str:
     ]
     return "\n".join(lines)
 
-def extract_fallback_content(url: str) -> str:
+def _soup(html: str):
+    # bs4 只在解析頁面時才載入
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, "html.parser")
+
+def extract_fallback_content(soup) -> str:
     try:
-        res = requests.get(url, timeout=20)
-        soup = BeautifulSoup(res.text, "html.parser")
         article = soup.select_one("div.td-post-content")
         if article:
             return article.get_text(separator="\n", strip=True)
@@ -31,10 +107,8 @@ def extract_fallback_content(url: str) -> str:
         print(f"Fallback 抓內容失敗：{e}")
     return ""
 
-def extract_published_date(url: str) -> datetime:
+def extract_published_date(soup) -> datetime:
     try:
-        res = requests.get(url, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
         time_tag = soup.select_one("time.entry-date") or soup.select_one("div.td-module-meta-info time")
         if time_tag:
             if time_tag.has_attr("datetime"):
@@ -54,56 +128,63 @@ def clean_content(raw_content: str) -> str:
             raw_content = raw_content[:idx]
     return raw_content.strip()
 
-def get_arxiv_license(arxiv_id: str) -> str:
+async def _arxiv_api_license(arxiv_id: str) -> str:
     # 用 API
     api_url = f"https://export.arxiv.org/api/query?id_list={arxiv_id}"
     try:
-        res = requests.get(api_url, timeout=10)
-        root = ET.fromstring(res.text)
-        ns = {'arxiv': 'https://arxiv.org/schemas/atom'}
+        text = await fetch_text(api_url, timeout=10, service="arxiv", operation="api_query")
+        root = ET.fromstring(text)
+        ns = {'arxiv': 'http://arxiv.org/schemas/atom'}
         license_elem = root.find('.//arxiv:license', ns)
         if license_elem is not None and license_elem.text:
             return license_elem.text
     except Exception as e:
         print(f"查詢 arXiv API license 失敗：{e}")
+    return ""
 
-    # 若 API 無，爬網頁
+async def _arxiv_abs_page(arxiv_id: str):
+    url = f"https://arxiv.org/abs/{arxiv_id}"
     try:
-        url = f"https://arxiv.org/abs/{arxiv_id}"
-        res = requests.get(url, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
-        # 抓網頁右邊的 license 
-        license_tag = soup.select_one('div.abs-license a')
-        if license_tag and license_tag.get('href', '').startswith('http'):
-            return license_tag['href']
+        return await fetch_soup(url, timeout=10, service="arxiv", operation="abs_page")
     except Exception as e:
-        print(f"爬 arXiv 網頁 license 失敗：{e}")
+        print(f"抓 arXiv HTML 失敗：{e}")
+        return None
 
+def _abs_page_license(soup) -> str:
+    # 抓網頁右邊的 license 
+    license_tag = soup.select_one('div.abs-license a') if soup else None
+    if license_tag and license_tag.get('href', '').startswith('http'):
+        return license_tag['href']
     return ""
 
-def fetch_arxiv_abstract(arxiv_id: str) -> str:
+def _abs_page_abstract(soup) -> str:
+    abstract = soup.select_one("blockquote.abstract") if soup else None
+    return abstract.get_text(separator="\n", strip=True) if abstract else ""
+
+async def fetch_arxiv_paper(arxiv_id: str) -> Tuple[str, str]:
+    """License URL and HTML abstract of a paper, both from its abstract page (one request)"""
+    soup = await _arxiv_abs_page(arxiv_id)
+    # 網頁上沒有 license 才查 API
+    license_url = _abs_page_license(soup) or await _arxiv_api_license(arxiv_id)
+    return license_url, _abs_page_abstract(soup)
+
+async def get_arxiv_license(arxiv_id: str) -> str:
+    license_url = await _arxiv_api_license(arxiv_id)
+    return license_url or _abs_page_license(await _arxiv_abs_page(arxiv_id))
+
+async def fetch_arxiv_abstract(arxiv_id: str) -> str:
     """抓 arXiv 論文 HTML 摘要"""
-    url = f"https://arxiv.org/abs/{arxiv_id}"
-    try:
-        res = requests.get(url, timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
-        abstract = soup.select_one("blockquote.abstract")
-        return abstract.get_text(separator="\n", strip=True) if abstract else ""
-    except Exception as e:
-        print(f"抓 arXiv HTML 失敗：{e}")
-        return ""
+    return _abs_page_abstract(await _arxiv_abs_page(arxiv_id))
 
 def get_arxiv_html_url(arxiv_id: str) -> str:
     """回傳 arXiv HTML 全文網址"""
     return f"https://arxiv.org/html/{arxiv_id}"
 
-def fetch_arxiv_full_html(arxiv_id: str) -> str:
+async def fetch_arxiv_full_html(arxiv_id: str) -> str:
     """抓 arXiv HTML 全文"""
     html_url = get_arxiv_html_url(arxiv_id)
     try:
-        res = requests.get(html_url, timeout=15)
-        res.encoding = "utf-8"
-        return res.text
+        return await fetch_text(html_url, timeout=15, service="arxiv", operation="full_html", encoding="utf-8")
     except Exception as e:
         print(f"抓 arXiv HTML 全文失敗：{e}")
         return ""
@@ -140,18 +221,16 @@ async def _crawl_research_papers(topic: Topic, max_articles: int):
     crawled = []
     
     try:
-        found = 0
         page_num = 1
         page_size = 10
         
-        while found < max_articles:
+        while len(crawled) < max_articles:
             api_url = f"https://api.alphaxiv.org/v2/papers/trending-papers?page_num={page_num}&sort_by=Hot&page_size={page_size}"
             
             try:
-                response = requests.get(api_url, timeout=20)
-                response.raise_for_status()
+                response = await _get(api_url, timeout=20, service="alphaxiv", operation="trending_papers")
                 json_data = response.json()
-            except requests.RequestException as e:
+            except httpx.HTTPError as e:
                 logger.error(f"API request failed: {e}")
                 break
             except ValueError as e:
@@ -160,35 +239,32 @@ async def _crawl_research_papers(topic: Topic, max_articles: int):
             
             papers = json_data.get("data", {}).get("trending_papers", [])
             if not isinstance(papers, list) or not papers:
-                if found == 0:
+                if not crawled:
                     logger.info("No CC licensed papers found")
                 break
 
             logger.info(f"Page {page_num}: {len(papers)} papers found")
             
-            for item in papers:
-                if found >= max_articles:
-                    break
-                    
-                try:
-                    paper_data = _extract_paper_data(item)
-                    if not paper_data:
-                        continue
-                        
-                    license_url = get_arxiv_license(paper_data['arxiv_id'])
+            # 一次只查還缺的篇數（arXiv 有請求頻率限制），不夠再查下一批
+            candidates = [paper_data for paper_data in map(_extract_paper_data, papers) if paper_data]
+            position = 0
+            while position < len(candidates) and len(crawled) < max_articles:
+                wave = candidates[position:position + max_articles - len(crawled)]
+                position += len(wave)
+                details = await asyncio.gather(*(fetch_arxiv_paper(paper_data['arxiv_id']) for paper_data in wave))
+                for paper_data, (license_url, abstract) in zip(wave, details):
                     if not is_usable_license(license_url):
                         logger.debug(f"Skipping non-CC paper: {paper_data['arxiv_id']}")
                         continue
-
-                    content_item = _create_research_content_item(paper_data, topic, license_url)
-                    crawled.append(content_item)
-                    found += 1
-                    
-                    logger.info(f"Added paper: {paper_data['title'][:50]}...")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to process paper: {e}")
-                    continue
+                    try:
+                        content_item = _create_research_content_item(paper_data, topic, license_url, abstract)
+                        crawled.append(content_item)
+                        
+                        logger.info(f"Added paper: {paper_data['title'][:50]}...")
+                        
+                    except Exception as e:
+                        logger.error(f"Failed to process paper: {e}")
+                        continue
                     
             page_num += 1
 
@@ -201,31 +277,20 @@ async def _crawl_research_papers(topic: Topic, max_articles: int):
 
 async def _crawl_general_news(topic: Topic, max_articles: int):
     """Crawl general news articles"""
-    crawled = []
-    
     try:
         list_page_url = _list_page_url_for_topic(topic)
         if not list_page_url:
             logger.error(f"No URL configured for topic: {topic}")
             return []
             
-        article_urls = _extract_article_links(list_page_url, limit=max_articles)
+        article_urls = await _extract_article_links(list_page_url, limit=max_articles)
         if not article_urls:
             logger.warning(f"No article URLs found for topic: {topic}")
             return []
 
-        async with AsyncWebCrawler() as crawler:
-            for url in article_urls:
-                try:
-                    result = await crawler.arun(url)
-                    content_item = _create_news_content_item(result, topic)
-                    crawled.append(content_item)
-                    
-                    logger.info(f"Added news: {content_item.title[:50]}...")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to crawl URL {url}: {e}")
-                    continue
+        crawler = await get_crawler()
+        results = await asyncio.gather(*(_crawl_article(crawler, url, topic) for url in article_urls))
+        crawled = [content_item for content_item in results if content_item is not None]
 
         logger.info(f"Successfully crawled {len(crawled)} news articles")
         return crawled
@@ -234,6 +299,23 @@ async def _crawl_general_news(topic: Topic, max_articles: int):
         logger.error(f"General news crawling failed: {e}")
         return []
 
+async def _crawl_article(crawler, url: str, topic: Topic) -> Optional[CrawledContent]:
+    """Crawl one article with the shared browser; None if it fails"""
+    try:
+        async with _host_limit(url):
+            with upstream("crawler", "fetch", url=url) as outcome:
+                result = await crawler.arun(url)
+                if not getattr(result, "success", True):
+                    outcome.fail(getattr(result, "error_message", None) or "crawl failed")
+        content_item = await _create_news_content_item(result, topic)
+        
+        logger.info(f"Added news: {content_item.title[:50]}...")
+        return content_item
+        
+    except Exception as e:
+        logger.error(f"Failed to crawl URL {url}: {e}")
+        return None
+
 def _extract_paper_data(item):
     """Extract paper data from API response"""
     try:
@@ -252,11 +334,10 @@ def _extract_paper_data(item):
         logger.error(f"Failed to extract paper data: {e}")
         return None
 
-def _create_research_content_item(paper_data, topic, license_url):
+def _create_research_content_item(paper_data, topic, license_url, html_content=""):
     """Create CrawledContent item for research paper"""
     arxiv_id = paper_data['arxiv_id']
-    html_content = fetch_arxiv_abstract(arxiv_id)
-    # html_content = fetch_arxiv_full_html(arxiv_id) (超大)
+    # html_content = await fetch_arxiv_full_html(arxiv_id) (超大)
     url = f"https://arxiv.org/abs/{arxiv_id}"
     
     published_at = None
@@ -283,17 +364,26 @@ def _create_research_content_item(paper_data, topic, license_url):
         license_type=parse_license_type(license_url)
     )
 
-def _create_news_content_item(result, topic):
+async def _create_news_content_item(result, topic):
     """Create CrawledContent item for news article"""
     title = result.metadata.get("title", "No title")
     markdown = getattr(result, "markdown", "")
     content = getattr(result, "content", "")
 
-    raw_content = content if content and len(content.strip()) > 50 else extract_fallback_content(result.url)
+    # 內文備援與發佈時間都從瀏覽器已載入的頁面解析，沒有才另外抓一次
+    html = getattr(result, "html", "") or ""
+    if not html:
+        try:
+            html = await fetch_text(result.url, timeout=20)
+        except Exception as e:
+            print(f"抓文章頁面失敗：{e}")
+    soup = await asyncio.to_thread(_soup, html)
+
+    raw_content = content if content and len(content.strip()) > 50 else extract_fallback_content(soup)
     raw_content = clean_content(raw_content)  
     raw_summary = raw_content if raw_content else markdown
     summary = clean_markdown(raw_summary).strip()[:300]
-    published_time = extract_published_date(result.url)
+    published_time = extract_published_date(soup)
 
     return CrawledContent(
         id=result.url,
@@ -317,10 +407,9 @@ def _list_page_url_for_topic(topic: Topic):
         "research_deep_learning": "https://api.alphaxiv.org/v2/papers/trending-papers?page_num=1&sort_by=Hot&page_size=5",
     }.get(topic.name, "")
 
-def _extract_article_links(list_page_url: str, limit: int = 5):
+async def _extract_article_links(list_page_url: str, limit: int = 5):
     try:
-        response = requests.get(list_page_url, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = await fetch_soup(list_page_url, timeout=10, operation="list_page")
         links = []
         for a in soup.select("h3.entry-title > a"):
             href = a.get("href")
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import aiosqlite
+
+from app.core.config import settings
+from app.core.telemetry import record_cache
+from app.models.glossary import GlossaryEntry
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS glossary (
+    key TEXT PRIMARY KEY,
+    term TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    source TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# ASCII-only case folding keeps string lengths (and so match offsets) unchanged
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def normalize(term: str) -> str:
+    return " ".join(term.split()).translate(_ASCII_LOWER)
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isascii() and c.isalnum()
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: all glossary terms are found in one pass over a line"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._length: List[int] = [0]   # pattern length if a pattern ends at this node
+        self._output: List[int] = [-1]  # nearest node on the fail chain where a pattern ends
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        node = 0
+        for c in pattern:
+            nxt = self._goto[node].get(c)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][c] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._length.append(0)
+                self._output.append(-1)
+            node = nxt
+        self._length[node] = len(pattern)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(c, 0)
+                self._fail[child] = target if target != child else 0
+                fail_node = self._fail[child]
+                self._output[child] = fail_node if self._length[fail_node] else self._output[fail_node]
+                queue.append(child)
+
+    def matches(self, text: str) -> List[Tuple[int, int]]:
+        """Leftmost-longest, non-overlapping (start, end) matches on whole words"""
+        candidates = []
+        node = 0
+        for i, c in enumerate(text):
+            while node and c not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(c, 0)
+            hit = node if self._length[node] else self._output[node]
+            while hit > 0:
+                start = i + 1 - self._length[hit]
+                end = i + 1
+                left_ok = start == 0 or not (_is_word_char(text[start]) and _is_word_char(text[start - 1]))
+                right_ok = end == len(text) or not (_is_word_char(text[end - 1]) and _is_word_char(text[end]))
+                if left_ok and right_ok:
+                    candidates.append((start, end))
+                hit = self._output[hit]
+
+        candidates.sort(key=lambda m: (m[0], m[0] - m[1]))
+        selected = []
+        position = 0
+        for start, end in candidates:
+            if start >= position:
+                selected.append((start, end))
+                position = end
+        return selected
+
+
+class Glossary:
+    """Persistent English -> Chinese term glossary shared by all episodes
+
+    Terms are matched case-insensitively (ASCII) on word boundaries. Entries learned from
+    the LLM never overwrite manual ones; manual entries are edited via /api/glossary.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path
+        self._entries: Dict[str, GlossaryEntry] = {}
+        self._matcher: Optional[AhoCorasick] = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def db_path(self) -> Path:
+        return Path(self._db_path or settings.GLOSSARY_DB_PATH).resolve()
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with aiosqlite.connect(self.db_path) as conn:
+            conn.row_factory = aiosqlite.Row
+            yield conn
+
+    async def init(self):
+        """Create the table and load all entries into memory (runs once)"""
+        async with self._lock:
+            if self._loaded:
+                return
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            async with self._connect() as conn:
+                await conn.execute("PRAGMA journal_mode = WAL")
+                await conn.executescript(SCHEMA)
+                await conn.commit()
+                async with conn.execute("SELECT key, term, translation, source, hits, updated_at FROM glossary") as cursor:
+                    rows = await cursor.fetchall()
+            self._entries = {row["key"]: self._row_to_entry(row) for row in rows}
+            self._matcher = None
+            self._loaded = True
+            logger.info(f"Glossary loaded: {len(self._entries)} terms from {self.db_path}")
+
+    @staticmethod
+    def _row_to_entry(row: aiosqlite.Row) -> GlossaryEntry:
+        return GlossaryEntry(
+            term=row["term"],
+            translation=row["translation"],
+            source=row["source"],
+            hits=row["hits"],
+            updatedAt=row["updated_at"],
+        )
+
+    async def lookup(self, terms: Iterable[str]) -> Dict[str, str]:
+        """Known translations for terms; the rest still need the LLM"""
+        await self.init()
+        found = {}
+        hit_keys = []
+        for term in terms:
+            key = normalize(term)
+            entry = self._entries.get(key)
+            record_cache("glossary", entry is not None)
+            if entry is not None:
+                found[term] = entry.translation
+                entry.hits += 1
+                hit_keys.append((key,))
+        if hit_keys:
+            async with self._connect() as conn:
+                await conn.executemany("UPDATE glossary SET hits = hits + 1 WHERE key = ?", hit_keys)
+                await conn.commit()
+        return found
+
+    async def learn(self, translations: Dict[str, str]):
+        """Store LLM translations (manual entries are kept)"""
+        await self.init()
+        now = datetime.now().isoformat()
+        rows = []
+        for term, translation in translations.items():
+            key = normalize(term)
+            existing = self._entries.get(key)
+            if not key or (existing is not None and existing.source == "manual"):
+                continue
+            self._entries[key] = GlossaryEntry(term=term, translation=translation, source="llm", hits=existing.hits if existing else 0, updatedAt=now)
+            rows.append((key, term, translation, "llm", self._entries[key].hits, now))
+        if not rows:
+            return
+        self._matcher = None
+        async with self._connect() as conn:
+            await conn.executemany(
+                "INSERT OR REPLACE INTO glossary (key, term, translation, source, hits, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            await conn.commit()
+
+    async def set(self, term: str, translation: str) -> GlossaryEntry:
+        """Add or override an entry by hand"""
+        await self.init()
+        key = normalize(term)
+        if not key:
+            raise ValueError("Empty glossary term")
+        existing = self._entries.get(key)
+        entry = GlossaryEntry(term=term.strip(), translation=translation.strip(), source="manual", hits=existing.hits if existing else 0, updatedAt=datetime.now().isoformat())
+        async with self._connect() as conn:
+            await conn.execute(
+                "INSERT OR REPLACE INTO glossary (key, term, translation, source, hits, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.term, entry.translation, entry.source, entry.hits, entry.updatedAt)
+            )
+            await conn.commit()
+        self._entries[key] = entry
+        self._matcher = None
+        return entry
+
+    async def delete(self, term: str) -> bool:
+        await self.init()
+        key = normalize(term)
+        if self._entries.pop(key, None) is None:
+            return False
+        async with self._connect() as conn:
+            await conn.execute("DELETE FROM glossary WHERE key = ?", (key,))
+            await conn.commit()
+        self._matcher = None
+        return True
+
+    async def list(self, q: Optional[str] = None, source: Optional[str] = None, limit: int = 50, offset: int = 0) -> Tuple[List[GlossaryEntry], int]:
+        """Entries sorted by term; q filters on term or translation"""
+        await self.init()
+        entries = sorted(self._entries.values(), key=lambda e: normalize(e.term))
+        if source:
+            entries = [e for e in entries if e.source == source]
+        if q:
+            needle = normalize(q)
+            entries = [e for e in entries if needle in normalize(e.term) or q in e.translation]
+        return entries[offset:offset + limit], len(entries)
+
+    async def replace(self, texts: List[str]) -> List[str]:
+        """Substitute every glossary term in each text, one automaton pass per text"""
+        await self.init()
+        if self._matcher is None:
+            self._matcher = AhoCorasick(self._entries.keys())
+        results = []
+        for text in texts:
+            folded = text.translate(_ASCII_LOWER)
+            parts = []
+            position = 0
+            for start, end in self._matcher.matches(folded):
+                parts.append(text[position:start])
+                parts.append(self._entries[folded[start:end]].translation)
+                position = end
+            parts.append(text[position:])
+            results.append("".join(parts))
+        return results
+
+
+glossary = Glossary()
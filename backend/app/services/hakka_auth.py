@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.telemetry import record_cache, upstream
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str]  # (base URL, username)
+
+
+class HakkaTokenBroker:
+    """Bearer tokens for the Hakka AI Hackathon APIs, shared by every TTS / translation service
+
+    One login per (base URL, username) until the token is older than HAKKA_TOKEN_TTL_S
+    or a request is rejected with 401 (invalidate()); concurrent callers wait for the same
+    login instead of each logging in.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[Key, Tuple[str, float]] = {}
+        self._locks: Dict[Key, asyncio.Lock] = {}
+
+    def _fresh(self, key: Key) -> Optional[str]:
+        entry = self._tokens.get(key)
+        if entry is None or time.monotonic() - entry[1] > settings.HAKKA_TOKEN_TTL_S:
+            return None
+        return entry[0]
+
+    async def token(self, client: httpx.AsyncClient, base_url: str, username: str, password: str, service: str = "hakka") -> Optional[str]:
+        """Cached token, logging in (once for all waiting callers) when missing or expired; None if login fails"""
+        key = (base_url, username)
+        token = self._fresh(key)
+        if token is not None:
+            return token
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            token = self._fresh(key)
+            if token is not None:
+                return token
+            token = await self._login(client, base_url, username, password, service)
+            if token is not None:
+                self._tokens[key] = (token, time.monotonic())
+            return token
+
+    async def _login(self, client: httpx.AsyncClient, base_url: str, username: str, password: str, service: str) -> Optional[str]:
+        try:
+            with upstream(service, "login") as outcome:
+                response = await client.post(
+                    f'{base_url}/api/v1/tts/login',
+                    json={'username': username, 'password': password}
+                )
+                if response.status_code != 200:
+                    outcome.fail(f"HTTP {response.status_code}")
+                    return None
+                token = response.json().get('token')
+                if not token:
+                    outcome.fail("no token in response")
+                return token
+        except Exception as e:
+            logger.error(f"Hakka API login to {base_url} failed: {e}")
+            return None
+
+    def invalidate(self, base_url: str, username: str):
+        """Forget a token the API rejected; the next caller logs in again"""
+        self._tokens.pop((base_url, username), None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            base_url: {"authenticated": self._fresh((base_url, username)) is not None, "age_s": round(now - issued, 1)}
+            for (base_url, username), (_, issued) in self._tokens.items()
+        }
+
+
+class VoiceCatalog:
+    """TTS voice models (GET /api/v1/tts/models) per base URL, fetched once for all TTSService instances"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _fresh(self, base_url: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(base_url)
+        if entry is None or time.monotonic() - entry[1] > settings.VOICE_CATALOG_TTL_S:
+            return None
+        return entry[0]
+
+    async def get(self, base_url: str, fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """Cached catalog, or fetch() it; failed fetches (None) are not cached"""
+        models = self._fresh(base_url)
+        if models is None:
+            async with self._locks.setdefault(base_url, asyncio.Lock()):
+                models = self._fresh(base_url)
+                if models is None:
+                    record_cache("voice_catalog", False)
+                    models = await fetch()
+                    if models is not None:
+                        self._entries[base_url] = (models, time.monotonic())
+                    return models
+        record_cache("voice_catalog", True)
+        return models
+
+    def invalidate(self, base_url: str):
+        self._entries.pop(base_url, None)
+
+
+hakka_auth = HakkaTokenBroker()
+voice_catalog = VoiceCatalog()
@@ -0,0 +1,209 @@
+import json
+import os
+import re
+import uuid
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.models.crawler import CrawledContent
+from app.models.podcast import PodcastScript
+
+# Speaker code in a segment file name, e.g. podcast_x_SXF_003_... or ..._GMM2_010_...
+_SEGMENT_CODE = re.compile(r"_([A-Z]{2,3}\d*)_\d{3}")
+
+
+class JobCheckpoint:
+    """Checkpointed stage outputs for a single podcast generation job
+
+    Layout of a job directory:
+        job.json        request, script name, status and current stage
+        articles.json   crawled articles
+        dialogue.json   raw dialogue (original + TTS-ready script)
+        script.json     Hakka-translated script
+        manifest.json   per-segment audio status
+        timing.json     segment timing index of the merged episode
+        segments/       per-segment audio files
+        work/           raw TTS output and other scratch files of this job
+    """
+
+    JOB = "job.json"
+    ARTICLES = "articles.json"
+    DIALOGUE = "dialogue.json"
+    SCRIPT = "script.json"
+    MANIFEST = "manifest.json"
+    TIMING = "timing.json"
+
+    def __init__(self, job_id: str, root: Path):
+        self.job_id = job_id
+        self.job_dir = root / job_id
+        self.segments_dir = self.job_dir / "segments"
+        self.work_dir = self.job_dir / "work"
+
+    def ensure_dirs(self):
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+
+    def exists(self) -> bool:
+        return (self.job_dir / self.JOB).exists()
+
+    def has(self, name: str) -> bool:
+        return (self.job_dir / name).exists()
+
+    def load_json(self, name: str) -> Any:
+        with open(self.job_dir / name, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_json(self, name: str, data: Any):
+        """Write a checkpoint file atomically so a crash never leaves half a file behind"""
+        self.ensure_dirs()
+        path = self.job_dir / name
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    # Job state
+    def load_state(self) -> Dict[str, Any]:
+        return self.load_json(self.JOB) if self.has(self.JOB) else {}
+
+    def update_state(self, **fields) -> Dict[str, Any]:
+        state = self.load_state()
+        if not state:
+            state = {"job_id": self.job_id, "created_at": datetime.now().isoformat()}
+        state.update(fields)
+        state["updated_at"] = datetime.now().isoformat()
+        self.save_json(self.JOB, state)
+        return state
+
+    # Stage checkpoints
+    def save_articles(self, articles: List[CrawledContent]):
+        self.save_json(self.ARTICLES, [article.model_dump(mode="json") for article in articles])
+
+    def load_articles(self) -> Optional[List[CrawledContent]]:
+        if not self.has(self.ARTICLES):
+            return None
+        return [CrawledContent(**item) for item in self.load_json(self.ARTICLES)]
+
+    def save_dialogue(self, result: Dict[str, PodcastScript]):
+        self.save_json(self.DIALOGUE, {key: script.model_dump(mode="json") for key, script in result.items()})
+
+    def load_dialogue(self) -> Optional[Dict[str, PodcastScript]]:
+        if not self.has(self.DIALOGUE):
+            return None
+        return {key: PodcastScript(**data) for key, data in self.load_json(self.DIALOGUE).items()}
+
+    def save_script(self, script: PodcastScript):
+        self.save_json(self.SCRIPT, script.model_dump(mode="json"))
+
+    def load_script(self) -> Optional[PodcastScript]:
+        if not self.has(self.SCRIPT):
+            return None
+        return PodcastScript(**self.load_json(self.SCRIPT))
+
+    # Segment manifest
+    def load_manifest(self) -> Dict[str, Any]:
+        if not self.has(self.MANIFEST):
+            return {"segments": {}}
+        return self.load_json(self.MANIFEST)
+
+    def get_done_segment(self, index: int, fingerprint: str) -> Optional[Path]:
+        """Return the checkpointed audio for a segment if it is complete and still matches its input"""
+        entry = self.load_manifest()["segments"].get(str(index))
+        if not entry or entry.get("status") != "done" or entry.get("fingerprint") != fingerprint:
+            return None
+        path = Path(entry.get("path", ""))
+        if not path.exists() or path.stat().st_size == 0:
+            return None
+        return path
+
+    def mark_segment(self, index: int, status: str, fingerprint: str, path: Optional[Path] = None, **extra):
+        manifest = self.load_manifest()
+        entry = {
+            "status": status,
+            "fingerprint": fingerprint,
+            "path": str(path) if path else None,
+            "updated_at": datetime.now().isoformat(),
+        }
+        entry.update(extra)
+        manifest["segments"][str(index)] = entry
+        self.save_json(self.MANIFEST, manifest)
+
+    def segment_files(self) -> List[Dict[str, Any]]:
+        """Completed segments whose audio is still on disk, in script order"""
+        files = []
+        for index, entry in self.load_manifest()["segments"].items():
+            path = Path(entry.get("path") or "")
+            if entry.get("status") != "done" or not path.is_file():
+                continue
+            code = entry.get("code")
+            if not code:
+                match = _SEGMENT_CODE.search(path.name)
+                code = match.group(1) if match else "UNK"
+            files.append({"index": int(index), "speaker": entry.get("speaker"), "code": code, "path": path})
+        return sorted(files, key=lambda item: item["index"])
+
+    def update_manifest(self, **fields):
+        manifest = self.load_manifest()
+        manifest.update(fields)
+        self.save_json(self.MANIFEST, manifest)
+
+    def summary(self) -> Dict[str, Any]:
+        """Job state plus which stages are checkpointed"""
+        segments = self.load_manifest()["segments"]
+        return {
+            **self.load_state(),
+            "checkpoints": {
+                "articles": self.has(self.ARTICLES),
+                "dialogue": self.has(self.DIALOGUE),
+                "script": self.has(self.SCRIPT),
+                "segments_done": sum(1 for s in segments.values() if s.get("status") == "done"),
+                "segments_failed": sum(1 for s in segments.values() if s.get("status") == "failed"),
+            },
+        }
+
+
+def segment_fingerprint(**fields) -> str:
+    """Stable hash of everything that determines a segment's audio"""
+    payload = json.dumps(fields, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """Directory of generation job checkpoints"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.JOBS_DIR).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def create(self, job_id: Optional[str] = None) -> JobCheckpoint:
+        if job_id and not re.fullmatch(r"[A-Za-z0-9_-]+", job_id):
+            raise ValueError(f"Invalid job id: {job_id}")
+        job = JobCheckpoint(job_id or uuid.uuid4().hex, self.root)
+        job.ensure_dirs()
+        return job
+
+    def get(self, job_id: str) -> Optional[JobCheckpoint]:
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", job_id):
+            return None
+        job = JobCheckpoint(job_id, self.root)
+        return job if job.exists() else None
+
+    def jobs(self) -> List[JobCheckpoint]:
+        """All jobs, most recently updated first"""
+        jobs = [JobCheckpoint(path.name, self.root) for path in self.root.iterdir() if path.is_dir()]
+        states = {job.job_id: job.load_state() for job in jobs if job.exists()}
+        return sorted(
+            (job for job in jobs if job.job_id in states),
+            key=lambda job: states[job.job_id].get("updated_at", ""),
+            reverse=True
+        )
+
+    def latest_for_script(self, script_name: str) -> Optional[JobCheckpoint]:
+        """Most recently updated job of a script; its segments are the script's current render"""
+        for job in self.jobs():
+            if job.load_state().get("script_name") == script_name:
+                return job
+        return None
@@ -0,0 +1,160 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiosqlite
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+from app.core.telemetry import record_cache
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    output TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed_at ON llm_responses (accessed_at);
+"""
+
+# Unset sentinel: a cached output may legitimately be falsy (e.g. an empty string)
+MISS = object()
+
+
+def model_name(model: Any) -> str:
+    """Stable identifier of a pydantic-ai model (or model string)"""
+    if model is None or isinstance(model, str):
+        return str(model)
+    return f"{getattr(model, 'system', '')}:{getattr(model, 'model_name', type(model).__name__)}"
+
+
+def _schema(output_type: Any) -> Any:
+    if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+        return output_type.model_json_schema()
+    return getattr(output_type, "__name__", str(output_type))
+
+
+class LLMResponseCache:
+    """SQLite-backed cache of LLM outputs keyed by (model, system prompt, user prompt, output schema)
+
+    Entries expire after LLM_CACHE_TTL_HOURS; when the stored outputs exceed
+    LLM_CACHE_MAX_MB the least recently used ones are evicted.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LLM_CACHE_ENABLED
+
+    @property
+    def db_path(self) -> Path:
+        # Resolved on first use so a changed working directory / settings still apply
+        return Path(self._db_path or settings.LLM_CACHE_PATH).resolve()
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with aiosqlite.connect(self.db_path) as conn:
+            yield conn
+
+    async def init(self):
+        """Create the table (runs once)"""
+        async with self._init_lock:
+            if self._initialized:
+                return
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            async with self._connect() as conn:
+                await conn.execute("PRAGMA journal_mode = WAL")
+                await conn.executescript(SCHEMA)
+                await conn.commit()
+            self._initialized = True
+
+    @staticmethod
+    def key(model: Any, system_prompts, prompt: str, output_type: Any) -> str:
+        payload = json.dumps(
+            [model_name(model), [p.strip() for p in system_prompts], prompt, _schema(output_type)],
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str, output_type: Any) -> Any:
+        """Cached output for key, or MISS"""
+        await self.init()
+        now = time.time()
+        async with self._connect() as conn:
+            async with conn.execute(
+                "SELECT output FROM llm_responses WHERE key = ? AND created_at > ?",
+                (key, now - settings.LLM_CACHE_TTL_HOURS * 3600)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is not None:
+                await conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+                await conn.commit()
+        record_cache("llm", row is not None)
+        if row is None:
+            return MISS
+        try:
+            return TypeAdapter(output_type).validate_json(row[0])
+        except ValueError as e:
+            # Schema changed under the same name: treat as a miss, the next put overwrites it
+            logger.warning(f"Discarding unreadable LLM cache entry {key[:12]}: {e}")
+            return MISS
+
+    async def put(self, key: str, model: Any, output: Any, output_type: Any):
+        await self.init()
+        data = TypeAdapter(output_type).dump_json(output).decode("utf-8")
+        now = time.time()
+        async with self._connect() as conn:
+            await conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, output, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name(model), data, len(data.encode("utf-8")), now, now)
+            )
+            await conn.execute("DELETE FROM llm_responses WHERE created_at <= ?", (now - settings.LLM_CACHE_TTL_HOURS * 3600,))
+            await self._evict(conn)
+            await conn.commit()
+
+    async def _evict(self, conn: aiosqlite.Connection):
+        """Drop least recently used entries until the total size fits LLM_CACHE_MAX_MB"""
+        limit = settings.LLM_CACHE_MAX_MB * 2**20
+        async with conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses") as cursor:
+            total = (await cursor.fetchone())[0]
+        if total <= limit:
+            return
+        async with conn.execute("SELECT key, size FROM llm_responses ORDER BY accessed_at") as cursor:
+            stale = []
+            async for key, size in cursor:
+                if total <= limit:
+                    break
+                stale.append((key,))
+                total -= size
+        await conn.executemany("DELETE FROM llm_responses WHERE key = ?", stale)
+        logger.info(f"LLM cache evicted {len(stale)} entries")
+
+    async def stats(self) -> Dict[str, Any]:
+        await self.init()
+        async with self._connect() as conn:
+            async with conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses") as cursor:
+                entries, size = await cursor.fetchone()
+        return {"entries": entries, "size_bytes": size}
+
+    async def clear(self):
+        await self.init()
+        async with self._connect() as conn:
+            await conn.execute("DELETE FROM llm_responses")
+            await conn.commit()
+
+
+llm_cache = LLMResponseCache()
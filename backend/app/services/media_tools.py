@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import shutil
+from typing import Dict, List, NamedTuple, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MediaToolError(Exception):
+    """Raised when a media tool fails, times out or is missing"""
+
+
+class MediaToolUnavailable(MediaToolError):
+    """Raised when a media tool is not installed"""
+
+
+class MediaResult(NamedTuple):
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+class MediaToolRunner:
+    """Async runner for ffmpeg/ffprobe
+
+    Processes are started with asyncio.create_subprocess_exec so they never block the
+    event loop, a semaphore caps how many run at once, and every call has a timeout.
+    Tool paths are detected once (at app startup) instead of probing on every request.
+    """
+
+    TOOLS = ("ffmpeg", "ffprobe")
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_concurrency = max_concurrency or settings.MEDIA_MAX_CONCURRENCY
+        self.timeout = timeout or settings.MEDIA_TOOL_TIMEOUT
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.tools: Dict[str, Optional[str]] = {}
+        self.versions: Dict[str, str] = {}
+        self._detected = False
+        self._detect_lock = asyncio.Lock()
+
+    async def detect(self) -> Dict[str, Optional[str]]:
+        """Locate media tools and record their versions (runs once)"""
+        async with self._detect_lock:
+            if self._detected:
+                return self.tools
+            for tool in self.TOOLS:
+                path = shutil.which(tool)
+                self.tools[tool] = path
+                if not path:
+                    logger.warning(f"{tool} not found on PATH")
+                    continue
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        path, "-version",
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
+                    self.versions[tool] = stdout.decode("utf-8", "replace").splitlines()[0] if stdout else ""
+                    logger.info(f"Detected {self.versions[tool] or tool} at {path}")
+                except Exception as e:
+                    logger.warning(f"{tool} found at {path} but could not be executed: {e}")
+                    self.tools[tool] = None
+            self._detected = True
+            return self.tools
+
+    def available(self, tool: str) -> bool:
+        return bool(self.tools.get(tool))
+
+    async def has(self, tool: str) -> bool:
+        """Whether a tool is available, detecting tools first if startup detection has not run"""
+        if not self._detected:
+            await self.detect()
+        return self.available(tool)
+
+    async def run(self, tool: str, args: List[str], timeout: Optional[float] = None, check: bool = False) -> MediaResult:
+        """Run a media tool with the given arguments"""
+        if not self._detected:
+            await self.detect()
+        path = self.tools.get(tool)
+        if not path:
+            raise MediaToolUnavailable(f"{tool} is not installed or not available")
+
+        timeout = timeout or self.timeout
+        async with self._semaphore:
+            proc = await asyncio.create_subprocess_exec(
+                path, *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise MediaToolError(f"{tool} timed out after {timeout}s")
+            except asyncio.CancelledError:
+                proc.kill()
+                await proc.wait()
+                raise
+
+        result = MediaResult(
+            returncode=proc.returncode,
+            stdout=stdout.decode("utf-8", "replace"),
+            stderr=stderr.decode("utf-8", "replace")
+        )
+        if check and result.returncode != 0:
+            raise MediaToolError(f"{tool} exited with {result.returncode}: {result.stderr[-500:]}")
+        return result
+
+    async def ffmpeg(self, args: List[str], **kwargs) -> MediaResult:
+        return await self.run("ffmpeg", args, **kwargs)
+
+    async def ffprobe(self, args: List[str], **kwargs) -> MediaResult:
+        return await self.run("ffprobe", args, **kwargs)
+
+    def status(self) -> Dict[str, Dict[str, Optional[str]]]:
+        return {
+            tool: {"path": self.tools.get(tool), "version": self.versions.get(tool)}
+            for tool in self.TOOLS
+        }
+
+
+media_runner = MediaToolRunner()
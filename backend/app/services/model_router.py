@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.core.config import settings
+from app.core.telemetry import upstream
+
+logger = logging.getLogger(__name__)
+
+WINDOW = 50        # recent calls kept per model
+MIN_SAMPLES = 5    # latency samples needed before a model is ranked / hedged on its latency
+ERROR_PENALTY = 4  # expected latency is scaled by (1 + ERROR_PENALTY * error rate)
+MAX_COOLDOWN_S = 300
+
+Candidate = Tuple[str, Any]  # (model name, pydantic-ai model)
+
+
+class ModelStats:
+    """Rolling latency / outcome window of one model"""
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=WINDOW)
+        self.outcomes: Deque[bool] = deque(maxlen=WINDOW)
+        self.consecutive_errors = 0
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.hedges = 0
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_errors = 0
+
+    def record_error(self):
+        self.outcomes.append(False)
+        self.consecutive_errors += 1
+        # Exponential cooldown: 1x, 2x, 4x ... LLM_ERROR_COOLDOWN_S after consecutive errors
+        cooldown = min(settings.LLM_ERROR_COOLDOWN_S * 2 ** (self.consecutive_errors - 1), MAX_COOLDOWN_S)
+        self.cooldown_until = time.monotonic() + cooldown
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": len(self.outcomes),
+            "error_rate": round(self.error_rate, 4),
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p95_s": round(p95, 3) if p95 is not None else None,
+            "in_flight": self.in_flight,
+            "hedges": self.hedges,
+            "cooling_down": not self.healthy(time.monotonic()),
+        }
+
+
+class ModelRouter:
+    """Routes agent calls to the fastest healthy model allowed for the task
+
+    Models are ranked by rolling p50 latency (penalized by error rate); ones that just
+    failed sit out an exponential cooldown. A call slower than the primary's
+    LLM_HEDGE_PERCENTILE latency is hedged on the runner-up (first answer wins) and a
+    failed call fails over to the next model. Stats are process-wide.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, ModelStats] = {}
+
+    def stats(self, name: str) -> ModelStats:
+        if name not in self._stats:
+            self._stats[name] = ModelStats()
+        return self._stats[name]
+
+    def rank(self, candidates: Sequence[Candidate]) -> List[Candidate]:
+        """Healthy before cooling down, then by expected latency, then by the task's preference order
+
+        A model without enough samples is assumed as fast as the most preferred sampled
+        (healthy) model, so the preference order decides between them: a fallback is only
+        explored through hedges and failover, never because the primary has samples.
+        """
+        now = time.monotonic()
+        expected: Dict[str, Optional[float]] = {}
+        for name, _ in candidates:
+            stats = self.stats(name)
+            if len(stats.latencies) >= MIN_SAMPLES:
+                expected[name] = stats.percentile(0.5) * (1 + ERROR_PENALTY * stats.error_rate)
+            else:
+                expected[name] = None
+        sampled = [name for name, _ in candidates if expected[name] is not None]
+        healthy_sampled = [name for name in sampled if self.stats(name).healthy(now)]
+        reference = expected[(healthy_sampled or sampled)[0]] if sampled else 0.0
+
+        def key(item):
+            index, (name, _) = item
+            latency = expected[name] if expected[name] is not None else reference
+            return (not self.stats(name).healthy(now), latency, index)
+
+        return [candidate for _, candidate in sorted(enumerate(candidates), key=key)]
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        if not settings.LLM_HEDGING:
+            return None
+        stats = self.stats(name)
+        if len(stats.latencies) < MIN_SAMPLES:
+            return None
+        return max(stats.percentile(settings.LLM_HEDGE_PERCENTILE), settings.LLM_HEDGE_MIN_DELAY_S)
+
+    async def _attempt(self, agent, prompt: str, candidate: Candidate, operation: str):
+        name, model = candidate
+        stats = self.stats(name)
+        stats.in_flight += 1
+        start = time.perf_counter()
+        try:
+            with upstream("llm", operation, model=name):
+                result = await agent.run(prompt, model=model)
+        except asyncio.CancelledError:
+            # Lost a hedge race (or the caller gave up): neither a latency sample nor an error
+            raise
+        except Exception:
+            stats.record_error()
+            raise
+        else:
+            stats.record_success(time.perf_counter() - start)
+            return result.output
+        finally:
+            stats.in_flight -= 1
+
+    async def _hedged(self, agent, prompt: str, primary: Candidate, backup: Optional[Candidate], operation: str, tried: Set[str]):
+        tried.add(primary[0])
+        primary_task = asyncio.ensure_future(self._attempt(agent, prompt, primary, operation))
+        tasks = {primary_task}
+        try:
+            delay = self._hedge_delay(primary[0]) if backup else None
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    logger.info(f"LLM {operation}: {primary[0]} slower than {delay:.1f}s, hedging on {backup[0]}")
+                    self.stats(primary[0]).hedges += 1
+                    tried.add(backup[0])
+                    tasks.add(asyncio.ensure_future(self._attempt(agent, prompt, backup, operation)))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(self, agent, prompt: str, candidates: Sequence[Candidate], operation: str):
+        """Run agent on the best candidate, hedging and failing over; returns the output"""
+        if not candidates:
+            # No configured model for the task: the agent's own (or overridden) model
+            with upstream("llm", operation):
+                return (await agent.run(prompt)).output
+
+        ranked = self.rank(candidates)
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+        while True:
+            remaining = [c for c in ranked if c[0] not in tried]
+            if not remaining:
+                raise last_error
+            primary = remaining[0]
+            backup = remaining[1] if len(remaining) > 1 else None
+            try:
+                return await self._hedged(agent, prompt, primary, backup, operation, tried)
+            except Exception as e:
+                last_error = e
+                if len(tried) < len(ranked):
+                    logger.warning(f"LLM {operation} failed on {primary[0]}, failing over: {e}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.snapshot() for name, stats in sorted(self._stats.items())}
+
+
+model_router = ModelRouter()
@@ -0,0 +1,177 @@
+import json
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from app.core.config import settings
+from app.models.podcast import Podcast
+
+logger = logging.getLogger(__name__)
+
+# Metadata and transcripts live in separate tables so listing never reads the
+# (large) Chinese/Hakka/romanization bodies.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS podcasts (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    language TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    hosts TEXT NOT NULL,
+    interests TEXT,
+    created_at TEXT NOT NULL,
+    audio_url TEXT,
+    audio_duration INTEGER,
+    renditions TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_podcasts_created_at ON podcasts (created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_podcasts_topic ON podcasts (topic, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_podcasts_language ON podcasts (language, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS podcast_transcripts (
+    podcast_id TEXT PRIMARY KEY REFERENCES podcasts (id) ON DELETE CASCADE,
+    chinese_content TEXT NOT NULL,
+    hakka_content TEXT NOT NULL,
+    romanization TEXT
+);
+"""
+
+SUMMARY_COLUMNS = "id, title, topic, language, duration, hosts, interests, created_at, audio_url, audio_duration, renditions"
+
+# Columns added after the first release of the schema: (name, type)
+MIGRATED_COLUMNS = [("renditions", "TEXT")]
+
+
+class PodcastLibrary:
+    """SQLite-backed podcast catalog
+
+    Listing queries are served from the indexed metadata table with LIMIT/OFFSET;
+    transcripts are only read when a single podcast is fetched.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path or settings.PODCAST_DB_PATH).resolve()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with aiosqlite.connect(self.db_path) as conn:
+            conn.row_factory = aiosqlite.Row
+            await conn.execute("PRAGMA foreign_keys = ON")
+            yield conn
+
+    async def init(self):
+        """Create tables and indexes (runs once)"""
+        async with self._init_lock:
+            if self._initialized:
+                return
+            async with self._connect() as conn:
+                # WAL lets readers list the catalog while a generation is being saved
+                await conn.execute("PRAGMA journal_mode = WAL")
+                await conn.executescript(SCHEMA)
+                async with conn.execute("PRAGMA table_info(podcasts)") as cursor:
+                    existing = {row["name"] for row in await cursor.fetchall()}
+                for name, column_type in MIGRATED_COLUMNS:
+                    if name not in existing:
+                        await conn.execute(f"ALTER TABLE podcasts ADD COLUMN {name} {column_type}")
+                await conn.commit()
+            self._initialized = True
+            logger.info(f"Podcast library ready at {self.db_path}")
+
+    async def save(self, podcast: Podcast):
+        """Insert or replace a podcast and its transcript"""
+        await self.init()
+        async with self._connect() as conn:
+            await conn.execute(
+                f"INSERT OR REPLACE INTO podcasts ({SUMMARY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    podcast.id,
+                    podcast.title,
+                    podcast.topic,
+                    podcast.language,
+                    podcast.duration,
+                    json.dumps([host.model_dump() for host in podcast.hosts], ensure_ascii=False),
+                    podcast.interests,
+                    podcast.created_at.isoformat(),
+                    podcast.audio_url,
+                    podcast.audio_duration,
+                    json.dumps([r.model_dump() for r in podcast.renditions], ensure_ascii=False),
+                )
+            )
+            await conn.execute(
+                "INSERT OR REPLACE INTO podcast_transcripts (podcast_id, chinese_content, hakka_content, romanization) VALUES (?, ?, ?, ?)",
+                (podcast.id, podcast.chinese_content, podcast.hakka_content, podcast.romanization)
+            )
+            await conn.commit()
+
+    async def get(self, podcast_id: str) -> Optional[Podcast]:
+        """Load a single podcast with its full transcript"""
+        await self.init()
+        async with self._connect() as conn:
+            async with conn.execute(
+                "SELECT p.*, t.chinese_content, t.hakka_content, t.romanization "
+                "FROM podcasts p LEFT JOIN podcast_transcripts t ON t.podcast_id = p.id WHERE p.id = ?",
+                (podcast_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if not row:
+            return None
+        data = self._row_to_dict(row)
+        return Podcast(
+            **data,
+            chinese_content=row["chinese_content"] or "",
+            hakka_content=row["hakka_content"] or "",
+            romanization=row["romanization"]
+        )
+
+    async def list(self, limit: int = 20, offset: int = 0, topic: Optional[str] = None, language: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """List podcast metadata newest first; returns (rows, total matching)"""
+        await self.init()
+        conditions = []
+        params: List[Any] = []
+        if topic:
+            conditions.append("topic = ?")
+            params.append(topic)
+        if language:
+            conditions.append("language = ?")
+            params.append(language)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        async with self._connect() as conn:
+            async with conn.execute(f"SELECT COUNT(*) FROM podcasts {where}", params) as cursor:
+                total = (await cursor.fetchone())[0]
+            async with conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM podcasts {where} ORDER BY created_at DESC, id LIMIT ? OFFSET ?",
+                [*params, limit, offset]
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return [self._row_to_dict(row) for row in rows], total
+
+    async def delete(self, podcast_id: str) -> bool:
+        await self.init()
+        async with self._connect() as conn:
+            cursor = await conn.execute("DELETE FROM podcasts WHERE id = ?", (podcast_id,))
+            await conn.commit()
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def _row_to_dict(row: aiosqlite.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "topic": row["topic"],
+            "language": row["language"],
+            "duration": row["duration"],
+            "hosts": json.loads(row["hosts"]),
+            "interests": row["interests"],
+            "created_at": row["created_at"],
+            "audio_url": row["audio_url"],
+            "audio_duration": row["audio_duration"],
+            "renditions": json.loads(row["renditions"]) if row["renditions"] else [],
+        }
@@ -1,70 +1,188 @@
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
 from pathlib import Path
 import json
+import os
 import re
-import subprocess
+import struct
+import shutil
+import uuid
 import asyncio
-from app.models.podcast import Podcast, PodcastGenerationRequest, PodcastResponse, PodcastScript, PodcastScriptContent, HostConfig
+from app.core.config import settings
+from app.core.telemetry import stage, record_cache, record_items
+from app.models.podcast import AudioRendition, Podcast, PodcastGenerationRequest, PodcastResponse, PodcastSummary, PodcastListResponse, PodcastScript, PodcastScriptContent, HostConfig, ScriptLineEdit
 from app.services.ai_service import AIService
 from app.services.tts_service import TTSService
 from app.services.translation_service import TranslationService
 from app.services.crawl4ai_service import crawl_news
+from app.services.podcast_library import PodcastLibrary
+from app.services.job_store import JobStore, JobCheckpoint, segment_fingerprint
+from app.services.media_tools import media_runner, MediaToolError
+from app.services.audio_postprocess import postprocess_concat, splice_segments
+from app.services.renditions import CODECS, WAV_MIME_TYPE, configured_bitrates, encode_rendition
+from app.services.timing_index import build_timing_index, timing_filename
+from app.services.voice_backends import SynthesisRequest, create_voice_registry
+from app.services.speech_rate import speech_rates
+from app.services.wav_concat import WavFormat, WavFormatError, ConcatResult, read_wav_info, concat_wav_files
 
 class PodcastAudioManager:
     """Audio file management for podcast generation"""
     
+    # 最終 Podcast 音檔格式：44.1kHz / 16-bit / mono
+    OUTPUT_FORMAT = WavFormat(channels=1, sample_width=2, sample_rate=44100)
+    
     def __init__(self):
         self.audio_dir = Path("static/audio").resolve()
         self.audio_dir.mkdir(parents=True, exist_ok=True)
     
-    def get_organized_files(self, script_name: str, speaker_code: str) -> List[Path]:
-        """Get organized audio files for a specific script and speaker"""
-        pattern = f"{script_name}_{speaker_code}_*.wav"
-        files = list(self.audio_dir.glob(pattern))
-        return sorted(files, key=lambda x: self._extract_segment_index(x.name))
-    
-    def _extract_segment_index(self, filename: str) -> int:
-        """Extract segment index from filename"""
-        try:
-            parts = filename.split('_')
-            return int(parts[-1].replace('.wav', ''))
-        except (ValueError, IndexError):
-            return 9999
-    
-    def show_script_info(self, script_name: str, speaker_code: str):
-        """Show information about audio files for a script"""
-        files = self.get_organized_files(script_name, speaker_code)
-        if files:
-            print(f"  {speaker_code}: {len(files)} 個音檔")
-            for f in files[:3]:  # Show first 3 files
-                print(f"    - {f.name}")
-            if len(files) > 3:
-                print(f"    ... (還有 {len(files) - 3} 個)")
-    
-    def create_ffmpeg_concat_file(self, audio_files: List[Path], concat_file: Path):
-        """Create FFmpeg concat file for merging audio"""
-        with open(concat_file, 'w', encoding='utf-8') as f:
-            for audio_file in audio_files:
-                f.write(f"file '{audio_file.absolute()}'\n")
-    
-    def fix_wav_format(self, input_path: Path, output_path: Path, sample_rate: int = 44100) -> bool:
+    async def fix_wav_format(self, input_path: Path, output_path: Path, sample_rate: int = 44100) -> bool:
         """Fix WAV format using FFmpeg for better compatibility"""
-        cmd = [
-            "ffmpeg", "-y", "-i", str(input_path),
+        args = [
+            "-y", "-i", str(input_path),
             "-ar", str(sample_rate), "-ac", "1", "-sample_fmt", "s16",
             str(output_path)
         ]
-        print(f"執行 ffmpeg：{' '.join(cmd)}")
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        print(f"執行 ffmpeg：ffmpeg {' '.join(args)}")
+        try:
+            result = await media_runner.ffmpeg(args)
+        except MediaToolError as e:
+            print(f"ffmpeg 轉檔失敗：{input_path.name} ({e})")
+            return False
         
         if result.returncode != 0:
             print(f"ffmpeg 轉檔失敗：{input_path.name}")
-            print(result.stderr.decode("utf-8"))
+            print(result.stderr)
             return False
         else:
             print(f"ffmpeg 成功轉檔為：{output_path.name}")
             return True
+    
+    async def conform_wav(self, input_path: Path, output_path: Path, sample_rate: int = 44100) -> bool:
+        """Move a WAV into place if it already has the output format, otherwise convert it with FFmpeg"""
+        try:
+            info = read_wav_info(input_path)
+        except (WavFormatError, OSError, struct.error):
+            info = None
+        
+        if info and info.format == self.OUTPUT_FORMAT._replace(sample_rate=sample_rate):
+            os.replace(input_path, output_path)
+            return True
+        return await self.fix_wav_format(input_path, output_path, sample_rate)
+    
+    def url_for(self, path: Path) -> str:
+        """Public URL of a file in the served audio directory"""
+        return f"/static/audio/{Path(path).name}"
+    
+    def describe_rendition(self, path: Path, fmt: str, bitrate_kbps: Optional[int] = None) -> AudioRendition:
+        """Build the rendition record of a published file"""
+        return AudioRendition(
+            format=fmt,
+            url=self.url_for(path),
+            mimeType=CODECS[fmt].mime_type if fmt in CODECS else WAV_MIME_TYPE,
+            bitrateKbps=bitrate_kbps,
+            sizeBytes=Path(path).stat().st_size
+        )
+    
+    async def create_renditions(self, source_path: Path, stem: str, work_dir: Path) -> List[AudioRendition]:
+        """Encode the configured compressed renditions of a final episode and publish them
+
+        Encoding happens in the job work directory; formats that fail are skipped so the
+        WAV master is always still served.
+        """
+        bitrates = configured_bitrates()
+        if not bitrates or not await media_runner.has("ffmpeg"):
+            print("未產生壓縮版本（未設定格式或 ffmpeg 不可用）")
+            return []
+        
+        async def _encode(fmt: str, bitrate_kbps: int) -> Optional[AudioRendition]:
+            filename = f"{stem}{CODECS[fmt].extension}"
+            encoded_path = work_dir / filename
+            if not await encode_rendition(source_path, encoded_path, fmt, bitrate_kbps):
+                return None
+            published = self.publish(encoded_path, filename)
+            return self.describe_rendition(published, fmt, bitrate_kbps)
+        
+        # 各格式同時編碼（media_runner 會限制 ffmpeg 併發數）
+        results = await asyncio.gather(*[_encode(fmt, kbps) for fmt, kbps in bitrates.items()])
+        renditions = [r for r in results if r]
+        for rendition in renditions:
+            print(f"壓縮版本 {rendition.format} ({rendition.bitrateKbps} kbps): {rendition.sizeBytes} bytes")
+        return renditions
+    
+    def publish(self, source_path: Path, filename: str, keep_source: bool = False) -> Path:
+        """Atomically move a finished file from a job directory into the served audio directory
+
+        The file is staged under a unique temporary name inside static/audio and then
+        renamed, so clients never see a partially written file and concurrent jobs
+        never share a staging path. With keep_source the file is copied instead of moved.
+        """
+        target_path = self.audio_dir / filename
+        staging_path = self.audio_dir / f".{filename}.{uuid.uuid4().hex}.tmp"
+        try:
+            if keep_source:
+                shutil.copyfile(source_path, staging_path)
+            else:
+                try:
+                    os.replace(source_path, staging_path)
+                except OSError:
+                    # jobs/ 與 static/ 不在同一個檔案系統時改用複製
+                    shutil.copyfile(source_path, staging_path)
+                    Path(source_path).unlink(missing_ok=True)
+            os.replace(staging_path, target_path)
+        finally:
+            staging_path.unlink(missing_ok=True)
+        return target_path
+    
+    async def _conform_segments(self, audio_paths: List[Path], target: WavFormat, temp_paths: List[Path]) -> List[Path]:
+        """Return paths in the target format, converting mismatched ones into temp files (appended to temp_paths)"""
+        conformed_paths = []
+        for path in audio_paths:
+            path = Path(path)
+            try:
+                matches = read_wav_info(path).format == target
+            except (WavFormatError, struct.error):
+                matches = False
+            if matches:
+                conformed_paths.append(path)
+                continue
+            
+            converted = path.with_name(f"{path.stem}_conformed_{target.sample_rate}.wav")
+            if not await self.fix_wav_format(path, converted, target.sample_rate):
+                raise WavFormatError(f"Could not convert {path.name} to {target}")
+            conformed_paths.append(converted)
+            temp_paths.append(converted)
+        return conformed_paths
+    
+    async def splice_wav_segments(self, source_path: Path, timing_index: Dict[str, Any], replacements: Dict[int, Path], output_path: Path, postprocess: bool = False) -> ConcatResult:
+        """Rebuild an episode from its previous render, re-processing only the replaced segments"""
+        target = self.OUTPUT_FORMAT._replace(sample_rate=timing_index["sample_rate"])
+        temp_paths = []
+        try:
+            indices = list(replacements)
+            conformed = await self._conform_segments([replacements[i] for i in indices], target, temp_paths)
+            return await asyncio.to_thread(
+                splice_segments, source_path, timing_index, dict(zip(indices, conformed)), output_path, target, postprocess
+            )
+        finally:
+            for path in temp_paths:
+                path.unlink(missing_ok=True)
+    
+    async def merge_wav_segments(self, audio_paths: List[Path], output_path: Path, sample_rate: int = 44100, speakers: Optional[List[str]] = None, postprocess: bool = False) -> ConcatResult:
+        """Concatenate segments into one WAV, converting only the segments whose format differs
+
+        With postprocess, segments are silence-trimmed, loudness-normalized and joined with
+        speaker-turn pauses and crossfades in the same pass (see audio_postprocess).
+        """
+        target = self.OUTPUT_FORMAT._replace(sample_rate=sample_rate)
+        temp_paths = []
+        try:
+            conformed_paths = await self._conform_segments(audio_paths, target, temp_paths)
+            if postprocess:
+                return await asyncio.to_thread(postprocess_concat, conformed_paths, output_path, target, speakers)
+            return await asyncio.to_thread(concat_wav_files, conformed_paths, output_path, target)
+        finally:
+            for path in temp_paths:
+                path.unlink(missing_ok=True)
 
 class PodcastService:
     def __init__(self):
@@ -72,7 +190,9 @@ class PodcastService:
         self.tts_service = TTSService()
         self.translation_service = TranslationService()
         self.audio_manager = PodcastAudioManager()
-        self.podcasts_storage: List[Podcast] = []  # In-memory storage for demo
+        self.job_store = JobStore()
+        self.library = PodcastLibrary()
+        self.voice_registry = create_voice_registry(self.tts_service)
     
     # 說話者配置常量
     SPEAKER_MAPPING = {
@@ -92,6 +212,10 @@ class PodcastService:
         }
     }
     
+    # 說話者代碼（用於音檔命名）
+    DIALECT_CODES = {"sihxian": "SX", "hailu": "HL"}
+    GENDER_CODES = {"male": "M", "female": "F"}
+    
     def _get_hakka_speaker(self, dialect: str, gender: str) -> str:
         """根據腔調和性別獲取客語說話者ID"""
         dialect = dialect.lower() if dialect else "sihxian"
@@ -112,7 +236,10 @@ class PodcastService:
         """Get speaker configuration based on host configs and language mode"""
         speaker_map = {}
         for i, host in enumerate(hosts):
-            if language == "bilingual":
+            if host.voice:
+                # 指定聲音時直接使用，由 voice backend registry 決定引擎
+                speaker_map[host.name] = host.voice
+            elif language == "bilingual":
                 # 雙語模式：第一個主持人使用Gemini，其他使用客語TTS
                 if i == 0:  # 第一個主持人
                     speaker_map[host.name] = self._get_gemini_speaker(host.gender)
@@ -124,87 +251,288 @@ class PodcastService:
         
         return speaker_map
     
-    def get_speaker_code(self, hosts: List[HostConfig]) -> Dict[str, str]:
-        """Get speaker codes for audio file naming"""
+    def _get_voice_code(self, voice: str) -> str:
+        """Short code of a voice ID, e.g. hak-xi-TW-vs2-F01 -> SXF, gemini_puck -> GMM"""
+        for gender, voice_id in self.SPEAKER_MAPPING["gemini"].items():
+            if voice_id == voice:
+                return "GM" + self.GENDER_CODES[gender]
+        for dialect, speakers in self.SPEAKER_MAPPING["hakka"].items():
+            for gender, voice_id in speakers.items():
+                if voice_id == voice:
+                    return self.DIALECT_CODES[dialect] + self.GENDER_CODES[gender]
+        return "UNK"
+    
+    def get_speaker_code(self, hosts: List[HostConfig], language: str = "bilingual") -> Dict[str, str]:
+        """Get speaker codes for audio file naming, derived from each host's voice and unique per host"""
+        speaker_config = self.get_speaker_config(hosts, language)
         speaker_code = {}
-        for i, host in enumerate(hosts):
-            if i == 0:  # First host
-                speaker_code[host.name] = "UNK"
-            else:  # Second host
-                speaker_code[host.name] = "SXM"
+        used_codes: Dict[str, int] = {}
+        for host in hosts:
+            code = self._get_voice_code(speaker_config.get(host.name, ""))
+            used_codes[code] = used_codes.get(code, 0) + 1
+            # 相同聲音的主持人加上序號區分（例如 SXM、SXM2）
+            speaker_code[host.name] = code if used_codes[code] == 1 else f"{code}{used_codes[code]}"
         return speaker_code
     
-    async def generate_podcast(self, request: PodcastGenerationRequest, dialect: str = "sihxian") -> Dict[str, Any]:
-        """Generate podcast with full audio pipeline including TTS generation"""
-        
-        # Step 1: Generate podcast script using AI with configurable hosts
-        print(f"Generating podcast script with hosts: {[host.name for host in request.hosts]}...")
-        result = await self.ai_service.generate_podcast_script_with_agents(
-            await crawl_news(request.topic), 
-            max_minutes=request.duration,
-            hosts=request.hosts
+    async def generate_podcast(self, request: PodcastGenerationRequest, dialect: str = "sihxian", job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Generate podcast with full audio pipeline including TTS generation
+
+        Every stage output is checkpointed under the job directory, so calling this
+        again with the same job_id only re-runs the stages that are missing.
+        """
+        job = self.job_store.create(job_id)
+        state = job.load_state()
+        script_name = state.get("script_name") or f"podcast_{request.topic.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{job.job_id[:8]}"
+        job.update_state(
+            request=request.model_dump(mode="json"),
+            dialect=dialect,
+            script_name=script_name,
+            status="running",
+            error=None
         )
-        podcast_script = result["tts_ready_script"]
-        
-        # Step 2: Add Hakka translation
-        print("Adding Hakka translation...")
-        podcast_script = await self.add_hakka_translation_to_script(podcast_script, dialect=dialect)
         
-        import os
-        script_name = f"podcast_{request.topic.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        json_dir = "json"
-        os.makedirs(json_dir, exist_ok=True)
-        
-        filepath = os.path.join(json_dir, script_name)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(podcast_script.model_dump_json(indent=2))
-        print(f"腳本已保存至: {filepath}")
+        try:
+            # Step 1: Crawl articles
+            articles = job.load_articles()
+            if articles is None:
+                job.update_state(stage="crawl")
+                with stage("crawl", topic=request.topic.name) as outcome:
+                    articles = await crawl_news(request.topic)
+                    outcome.set("articles", len(articles))
+                if not articles:
+                    raise ValueError(f"No articles crawled for topic: {request.topic.name}")
+                job.save_articles(articles)
+            else:
+                print(f"[{job.job_id}] 使用已保存的文章 ({len(articles)} 篇)")
+            
+            # Step 2: Generate podcast script using AI with configurable hosts
+            result = job.load_dialogue()
+            if result is None:
+                job.update_state(stage="dialogue")
+                print(f"Generating podcast script with hosts: {[host.name for host in request.hosts]}...")
+                with stage("dialogue", articles=len(articles)):
+                    result = await self.ai_service.generate_podcast_script_with_agents(
+                        articles, 
+                        max_minutes=request.duration,
+                        hosts=request.hosts,
+                        voices=self.get_speaker_config(request.hosts, request.language)
+                    )
+                job.save_dialogue(result)
+            else:
+                print(f"[{job.job_id}] 使用已保存的對話腳本")
+            
+            # Step 3: Add Hakka translation
+            podcast_script = job.load_script()
+            if podcast_script is None:
+                job.update_state(stage="translation")
+                print("Adding Hakka translation...")
+                with stage("translation", dialect=dialect):
+                    podcast_script = await self.add_hakka_translation_to_script(result["tts_ready_script"], dialect=dialect)
+                job.save_script(podcast_script)
+            else:
+                print(f"[{job.job_id}] 使用已保存的客語翻譯腳本")
+            
+            json_dir = "json"
+            os.makedirs(json_dir, exist_ok=True)
+            
+            filepath = os.path.join(json_dir, f"{script_name}.json")
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(podcast_script.model_dump_json(indent=2))
+            print(f"腳本已保存至: {filepath}")
+            
+            # Step 4: Generate audio files
+            job.update_state(stage="audio")
+            print("Generating audio files...")
+            with stage("audio", segments=len(podcast_script.content)) as outcome:
+                audio_result = await self.generate_podcast_audio_with_voices(podcast_script, script_name, request.language, request.hosts, job=job)
+                if not audio_result.get("success"):
+                    outcome.fail(audio_result.get("error", "Audio generation failed"))
         
-        # Step 3: Generate audio files
-        print("Generating audio files...")
-        audio_result = await self.generate_podcast_audio_with_voices(podcast_script, script_name.replace(".json", ""), request.language, request.hosts)
+        except Exception as e:
+            job.update_state(status="failed", error=str(e))
+            raise
         
         # Create podcast object with audio information
         podcast = Podcast(
+            id=job.job_id,
             title=podcast_script.title,
             chinese_content="\n".join([item.text for item in podcast_script.content]),
             hakka_content="\n".join([item.hakka_text for item in podcast_script.content if item.hakka_text]),
             romanization="\n".join([item.romanization for item in podcast_script.content if item.romanization]),
-            topic=request.topic,
+            topic=request.topic.value,
             duration=request.duration,
             language=request.language,
             hosts=request.hosts,
             interests=request.interests,
-            audio_url=audio_result.get("final_audio_file"),
-            audio_duration=audio_result.get("total_duration")
+            audio_url=audio_result.get("final_audio_url"),
+            audio_duration=round(audio_result["total_duration"]) if audio_result.get("total_duration") is not None else None,
+            renditions=audio_result.get("renditions", [])
         )
         
-        # Store the podcast
-        self.podcasts_storage.append(podcast)
+        # Store the podcast (a resumed job replaces its earlier entry)
+        await self.library.save(podcast)
+        
+        if audio_result.get("success"):
+            record_items("podcasts")
+        if audio_result.get("success") and not audio_result.get("failed_segments"):
+            job.update_state(status="completed", stage="done")
+        elif audio_result.get("success"):
+            job.update_state(status="partial", error=f"{audio_result['failed_segments']} segments failed")
+        else:
+            job.update_state(status="failed", error=audio_result.get("error", "Audio generation failed"))
         
         return {
+            "job_id": job.job_id,
             "podcast": self._to_response(podcast),
             "audio_result": audio_result,
             "script": podcast_script.model_dump()
         }
     
+    async def resume_podcast(self, job_id: str) -> Dict[str, Any]:
+        """Resume a failed or interrupted generation job, re-running only missing stages and segments"""
+        job = self.job_store.get(job_id)
+        if not job:
+            raise ValueError(f"Job not found: {job_id}")
+        
+        state = job.load_state()
+        if "request" not in state:
+            raise ValueError(f"Job {job_id} was not started from a generation request and cannot be resumed")
+        request = PodcastGenerationRequest(**state["request"])
+        return await self.generate_podcast(request, dialect=state.get("dialect", "sihxian"), job_id=job_id)
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the checkpoint status of a generation job"""
+        job = self.job_store.get(job_id)
+        return job.summary() if job else None
+    
     async def add_hakka_translation_to_script(self, podcast_script: PodcastScript, dialect: str = "sihxian") -> PodcastScript:
         """Add Hakka translation to podcast script content"""
         if not self.translation_service.headers:
             await self.translation_service.login()
         
         for item in podcast_script.content:
-            print(f"[Processing] {item.speaker}: {item.text}")
-            result = await self.translation_service.translate_chinese_to_hakka(item.text, dialect=dialect)
-            item.hakka_text = result.get("hakka_text", "")
-            item.romanization = result.get("romanization", "")
-            item.romanization_tone = result.get("romanization_tone", "")
+            await self._translate_item(item, dialect)
         
-        await self.translation_service.close()
         return podcast_script
     
-    async def generate_podcast_audio_with_voices(self, podcast_script: PodcastScript, script_name: str, language: str = "bilingual", hosts: List[HostConfig] = None) -> Dict[str, Any]:
-        """Generate audio files for podcast with TTS based on language setting"""
+    async def _translate_item(self, item: PodcastScriptContent, dialect: str = "sihxian"):
+        """Translate one script line to Hakka in place"""
+        print(f"[Processing] {item.speaker}: {item.text}")
+        result = await self.translation_service.translate_chinese_to_hakka(item.text, dialect=dialect)
+        item.hakka_text = result.get("hakka_text", "")
+        item.romanization = result.get("romanization", "")
+        item.romanization_tone = result.get("romanization_tone", "")
+    
+    async def edit_podcast(self, job_id: str, edits: List[ScriptLineEdit]) -> Dict[str, Any]:
+        """Apply edited script lines and re-render only what changed
+
+        Lines whose Chinese text changed are re-translated (unless new Hakka text is
+        given), only lines whose synthesis inputs changed are re-synthesized (via the
+        segment manifest fingerprints), and the episode is re-spliced from its previous
+        render using the timing index.
+        """
+        job = self.job_store.get(job_id)
+        if not job:
+            raise ValueError(f"Job not found: {job_id}")
+        podcast_script = job.load_script()
+        if podcast_script is None:
+            raise ValueError(f"Job {job_id} has no translated script to edit")
+        
+        state = job.load_state()
+        request = state.get("request") or {}
+        language = request.get("language") or state.get("language", "bilingual")
+        hosts = [HostConfig(**host) for host in (request.get("hosts") or state.get("hosts") or [])] or podcast_script.hosts
+        dialect = state.get("dialect", "sihxian")
+        
+        changed_lines = []
+        retranslate = []
+        for line_edit in edits:
+            if line_edit.index >= len(podcast_script.content):
+                raise ValueError(f"Line {line_edit.index} out of range (script has {len(podcast_script.content)} lines)")
+            item = podcast_script.content[line_edit.index]
+            before = (item.text, item.hakka_text, item.romanization)
+            
+            if line_edit.text is not None and line_edit.text != item.text:
+                item.text = line_edit.text
+                if line_edit.hakka_text is None:
+                    retranslate.append(item)
+            if line_edit.hakka_text is not None and line_edit.hakka_text != item.hakka_text:
+                item.hakka_text = line_edit.hakka_text
+                # 沒有提供新的羅馬拼音時清空，讓 TTS 直接讀客語漢字
+                item.romanization = line_edit.romanization or ""
+                item.romanization_tone = ""
+            elif line_edit.romanization is not None and line_edit.romanization != item.romanization:
+                item.romanization = line_edit.romanization
+                item.romanization_tone = ""
+            
+            if (item.text, item.hakka_text, item.romanization) != before:
+                changed_lines.append(line_edit.index)
+        
+        if retranslate:
+            if not self.translation_service.headers:
+                await self.translation_service.login()
+            for item in retranslate:
+                await self._translate_item(item, dialect)
+        
+        if not changed_lines:
+            return {"job_id": job.job_id, "changed_lines": [], "retranslated_lines": 0, "audio_result": None}
+        
+        # 修改只寫入 job 的 script.json；由本服務產生的集數才同步更新 json/ 下的腳本匯出檔，
+        # 從外部腳本檔產生的（script_file）不覆寫呼叫端的檔案
+        job.save_script(podcast_script)
+        script_name = state["script_name"]
+        if not state.get("script_file"):
+            script_path = Path("json", f"{script_name}.json")
+            if script_path.exists():
+                script_path.write_text(podcast_script.model_dump_json(indent=2), encoding="utf-8")
+        job.update_state(status="running", stage="edit", error=None)
+        print(f"[{job.job_id}] 修改 {len(changed_lines)} 行：{changed_lines}")
+        
+        audio_result = await self.generate_podcast_audio_with_voices(
+            podcast_script, script_name, language, hosts, job=job, splice=True
+        )
+        job.update_state(
+            status="completed" if audio_result.get("success") and not audio_result.get("failed_segments") else ("partial" if audio_result.get("success") else "failed"),
+            stage="done",
+            error=audio_result.get("error")
+        )
+        
+        # Keep the library record in sync with the edited transcript and new audio
+        podcast = await self.library.get(job.job_id)
+        if podcast and audio_result.get("success"):
+            podcast = Podcast(**{
+                **podcast.model_dump(),
+                "title": podcast_script.title,
+                "chinese_content": "\n".join([item.text for item in podcast_script.content]),
+                "hakka_content": "\n".join([item.hakka_text for item in podcast_script.content if item.hakka_text]),
+                "romanization": "\n".join([item.romanization for item in podcast_script.content if item.romanization]),
+                "audio_url": audio_result.get("final_audio_url"),
+                "audio_duration": round(audio_result["total_duration"]),
+                "renditions": audio_result.get("renditions", []),
+            })
+            await self.library.save(podcast)
+        
+        return {
+            "job_id": job.job_id,
+            "changed_lines": changed_lines,
+            "retranslated_lines": len(retranslate),
+            "audio_result": audio_result,
+            "podcast": self._to_response(podcast) if podcast else None
+        }
+    
+    async def generate_podcast_audio_with_voices(self, podcast_script: PodcastScript, script_name: str, language: str = "bilingual", hosts: List[HostConfig] = None, job: Optional[JobCheckpoint] = None, splice: bool = False) -> Dict[str, Any]:
+        """Generate audio files for podcast with TTS based on language setting
+
+        All intermediate audio is written inside the job directory (a new job is created
+        when none is given), so concurrent generations never touch each other's files.
+        Finished segments are recorded in the job manifest and reused on the next run as
+        long as their text and voice are unchanged; only the final episode is published
+        into static/audio. With splice, the previous render is re-used and only the newly
+        synthesized segments are swapped in (falls back to a full merge when not possible).
+        Segments are synthesized concurrently through the voice backend registry, which
+        picks the engine for each host's voice, so any number of hosts is supported.
+        """
+        job = job or self.job_store.create()
         
         if not hosts:
             hosts = [
@@ -215,268 +543,152 @@ class PodcastService:
         print(f"=== Starting audio generation (language: {language}) ===")
         
         try:
-            # Login to TTS API for Hakka TTS (needed for both language modes)
-            print("Logging into TTS API...")
-            login_success = await self.tts_service.login()
-            if not login_success:
-                print("❌ TTS API login failed, will use fallback mode")
-            else:
-                print("✅ TTS API login successful")
-            
             # Process each dialogue segment
             fixed_audio_paths = []
+            merged_segments = []  # (script index, content) aligned with fixed_audio_paths
+            rendered_segments: Dict[int, Path] = {}  # segments synthesized in this run
             total_duration = 0
             successful_segments = 0
+            reused_segments = 0
             
             # Get speaker configuration and codes based on hosts
             speaker_config = self.get_speaker_config(hosts, language)
-            speaker_code = self.get_speaker_code(hosts)
+            speaker_code = self.get_speaker_code(hosts, language)
             
+            # Reuse finished segments, queue the rest for synthesis
+            fingerprints: Dict[int, str] = {}
+            segment_paths: Dict[int, Path] = {}
+            pending: List[SynthesisRequest] = []
             for idx, content_item in enumerate(podcast_script.content):
-                speaker_name = content_item.speaker
-                hakka_text = content_item.hakka_text
-                romanization = content_item.romanization
-                original_text = content_item.text
-                
-                print(f"\n--- Processing segment {idx+1}: {speaker_name} ---")
-                print(f"Original: {original_text[:50]}...")
-                print(f"Hakka: {hakka_text[:50]}...")
-                
-                # Generate audio based on language setting and speaker
-                if language == "bilingual":
-                    # Bilingual mode: Use Gemini for first host, Hakka TTS for second host
-                    if speaker_name == hosts[0].name:  # First host (traditionally 佳昀)
-                        # Use Gemini TTS for Chinese text
-                        print(f"呼叫 Gemini TTS for {speaker_name} (bilingual mode)")
-                        try:
-                            # Generate filename
-                            filename = self.tts_service._generate_readable_filename(
-                                original_text, 
-                                speaker_code.get(speaker_name, speaker_name), 
-                                idx, 
-                                script_name, 
-                                idx
-                            )
-                            output_path = self.audio_manager.audio_dir / filename
-                            
-                            # Get Gemini voice based on gender
-                            gemini_voice = speaker_config[speaker_name]
-                            
-                            # Call Gemini TTS with appropriate voice
-                            await self.tts_service.generate_gemini_tts(original_text, str(output_path), gemini_voice)
-                            
-                            if not output_path.exists() or output_path.stat().st_size == 0:
-                                print(f"Gemini 產生的音檔無效：{output_path}")
-                                continue
-                            
-                            # Create fixed version
-                            fixed_path = output_path.parent / (output_path.stem + "_fixed.wav")
-                            if self.audio_manager.fix_wav_format(output_path, fixed_path):
-                                print(f"Gemini 音檔產生成功: {fixed_path}")
-                                fixed_audio_paths.append(str(fixed_path))
-                                successful_segments += 1
-                                
-                                # Delete original file, keep only fixed version
-                                try:
-                                    output_path.unlink()
-                                except:
-                                    pass
-                            else:
-                                print(f"Gemini 音檔格式修復失敗")
-                                continue
-                                
-                        except Exception as e:
-                            print(f"Gemini 音檔產生失敗: {e}")
-                            continue
-                    
-                    elif speaker_name == hosts[1].name:  # Second host (traditionally 敏權)
-                        # Use TWCC TTS for Hakka text
-                        speaker_id = speaker_config[speaker_name]
-                        print(f"🎤 呼叫 TWCC TTS：speaker_id={speaker_id} (bilingual mode)")
-                        try:
-                            # Generate Hakka audio
-                            result = await self.tts_service.generate_hakka_audio(
-                                hakka_text=hakka_text,
-                                romanization=romanization,
-                                speaker=speaker_id,
-                                segment_index=idx,
-                                script_name=script_name
-                            )
-                            
-                            if not isinstance(result, dict) or "audio_path" not in result or not result["audio_path"]:
-                                print(f"TWCC 回傳格式錯誤：{result}")
-                                continue
-                            
-                            output_path = Path(result["audio_path"])
-                            
-                            if not output_path.exists() or output_path.stat().st_size == 0:
-                                print(f"TWCC 產生的音檔無效：{output_path}")
-                                continue
-                            
-                            # Create fixed version
-                            fixed_path = output_path.parent / (output_path.stem + "_fixed.wav")
-                            if self.audio_manager.fix_wav_format(output_path, fixed_path):
-                                print(f"TWCC 音檔產生成功: {fixed_path}")
-                                fixed_audio_paths.append(str(fixed_path))
-                                successful_segments += 1
-                                
-                                # Delete original file, keep only fixed version
-                                try:
-                                    output_path.unlink()
-                                except:
-                                    pass
-                            else:
-                                print(f"TWCC 音檔格式修復失敗")
-                                continue
-                            
-                        except Exception as e:
-                            print(f"TWCC 音檔產生失敗: {e}")
-                            continue
-                
-                elif language == "hakka":
-                    # Hakka-only mode: Use Hakka TTS for both speakers
-                    if speaker_name == hosts[0].name:  # First host
-                        # Use Hakka TTS for first host (convert Chinese to Hakka if needed)
-                        if not hakka_text.strip():
-                            print(f"{speaker_name}第 {idx} 段沒有 hakka_text，跳過")
-                            continue
-                        
-                        speaker_id = speaker_config[speaker_name]
-                        print(f"🎤 呼叫 TWCC TTS for {speaker_name}：speaker_id={speaker_id} (hakka-only mode)")
-                        try:
-                            # Generate Hakka audio for first host
-                            result = await self.tts_service.generate_hakka_audio(
-                                hakka_text=hakka_text,
-                                romanization=romanization,
-                                speaker=speaker_id,
-                                segment_index=idx,
-                                script_name=script_name
-                            )
-                            
-                            if not isinstance(result, dict) or "audio_path" not in result or not result["audio_path"]:
-                                print(f"TWCC 回傳格式錯誤：{result}")
-                                continue
-                            
-                            output_path = Path(result["audio_path"])
-                            
-                            if not output_path.exists() or output_path.stat().st_size == 0:
-                                print(f"TWCC 產生的音檔無效：{output_path}")
-                                continue
-                            
-                            # Create fixed version
-                            fixed_path = output_path.parent / (output_path.stem + "_fixed.wav")
-                            if self.audio_manager.fix_wav_format(output_path, fixed_path):
-                                print(f"TWCC 音檔產生成功: {fixed_path}")
-                                fixed_audio_paths.append(str(fixed_path))
-                                successful_segments += 1
-                                
-                                # Delete original file, keep only fixed version
-                                try:
-                                    output_path.unlink()
-                                except:
-                                    pass
-                            else:
-                                print(f"TWCC 音檔格式修復失敗")
-                                continue
-                            
-                        except Exception as e:
-                            print(f"TWCC 音檔產生失敗: {e}")
-                            continue
-                    
-                    elif speaker_name == hosts[1].name:  # Second host
-                        # Use TWCC TTS for second host (same as bilingual mode)
-                        speaker_id = speaker_config[speaker_name]
-                        print(f"🎤 呼叫 TWCC TTS：speaker_id={speaker_id} (hakka-only mode)")
-                        try:
-                            # Generate Hakka audio
-                            result = await self.tts_service.generate_hakka_audio(
-                                hakka_text=hakka_text,
-                                romanization=romanization,
-                                speaker=speaker_id,
-                                segment_index=idx,
-                                script_name=script_name
-                            )
-                            
-                            if not isinstance(result, dict) or "audio_path" not in result or not result["audio_path"]:
-                                print(f"TWCC 回傳格式錯誤：{result}")
-                                continue
-                            
-                            output_path = Path(result["audio_path"])
-                            
-                            if not output_path.exists() or output_path.stat().st_size == 0:
-                                print(f"TWCC 產生的音檔無效：{output_path}")
-                                continue
-                            
-                            # Create fixed version
-                            fixed_path = output_path.parent / (output_path.stem + "_fixed.wav")
-                            if self.audio_manager.fix_wav_format(output_path, fixed_path):
-                                print(f"TWCC 音檔產生成功: {fixed_path}")
-                                fixed_audio_paths.append(str(fixed_path))
-                                successful_segments += 1
-                                
-                                # Delete original file, keep only fixed version
-                                try:
-                                    output_path.unlink()
-                                except:
-                                    pass
-                            else:
-                                print(f"TWCC 音檔格式修復失敗")
-                                continue
-                            
-                        except Exception as e:
-                            print(f"TWCC 音檔產生失敗: {e}")
-                            continue
+                voice = speaker_config.get(content_item.speaker)
+                fingerprints[idx] = segment_fingerprint(
+                    speaker=content_item.speaker,
+                    voice=voice,
+                    language=language,
+                    text=content_item.text,
+                    hakka_text=content_item.hakka_text,
+                    romanization=content_item.romanization
+                )
                 
+                done_path = job.get_done_segment(idx, fingerprints[idx])
+                record_cache("tts_segments", done_path is not None)
+                if done_path:
+                    print(f"--- Segment {idx+1}: 使用已完成的音檔 {done_path.name} ---")
+                    segment_paths[idx] = done_path
+                    reused_segments += 1
+                elif voice:
+                    filename = self.tts_service._generate_readable_filename(
+                        content_item.text, speaker_code.get(content_item.speaker, content_item.speaker), idx, script_name, idx
+                    )
+                    pending.append(SynthesisRequest(
+                        index=idx,
+                        voice=voice,
+                        text=content_item.text,
+                        hakka_text=content_item.hakka_text,
+                        romanization=content_item.romanization,
+                        output_path=job.work_dir / filename
+                    ))
+                else:
+                    print(f"未知說話者: {content_item.speaker}，跳過")
+                    job.mark_segment(idx, "failed", fingerprints[idx], speaker=content_item.speaker, code=speaker_code.get(content_item.speaker))
+            
+            # Synthesize all pending segments concurrently, throttled per voice backend
+            # 每個段落完成（合成 + 格式修復）就立即寫入 manifest，中斷後可從已完成的段落續跑
+            def _checkpoint(request: SynthesisRequest, fixed_path: Optional[Path]):
+                item = podcast_script.content[request.index]
+                if fixed_path:
+                    segment_paths[request.index] = fixed_path
+                    job.mark_segment(request.index, "done", fingerprints[request.index], fixed_path, speaker=item.speaker, code=speaker_code.get(item.speaker))
                 else:
-                    print(f"未知說話者: {speaker_name}，跳過")
-                    continue
+                    job.mark_segment(request.index, "failed", fingerprints[request.index], speaker=item.speaker, code=speaker_code.get(item.speaker))
+            
+            with stage("tts", segments=len(pending)):
+                rendered_segments = await self._render_segments(pending, job, on_segment=_checkpoint)
+            
+            for idx in sorted(segment_paths):
+                fixed_audio_paths.append(str(segment_paths[idx]))
+                merged_segments.append((idx, podcast_script.content[idx]))
+            successful_segments = len(segment_paths)
             
             # Merge all fixed audio files
             if not fixed_audio_paths:
                 print("沒有任何成功產生的音檔，無法合併")
                 return {"success": False, "error": "No audio files generated"}
             
+            failed_segments = len(podcast_script.content) - successful_segments
+            if failed_segments:
+                print(f"⚠️ {failed_segments} 個段落產生失敗，可使用 resume 重新產生")
+            
             print(f"\n=== 開始合併最終 Podcast ===")
             print(f"共有 {len(fixed_audio_paths)} 個音檔要合併：")
             for i, path in enumerate(fixed_audio_paths):
                 file_size = Path(path).stat().st_size if Path(path).exists() else 0
                 print(f"  {i+1}. {Path(path).name} ({file_size} bytes)")
             
-            # Create merge file list
-            filelist_txt = self.audio_manager.audio_dir / "filelist.txt"
-            with open(filelist_txt, "w", encoding="utf-8") as f:
-                for path in fixed_audio_paths:
-                    f.write(f"file '{Path(path).resolve().as_posix()}'\n")
-            
-            # Execute final merge
-            final_path = self.audio_manager.audio_dir / f"{script_name}_final.wav"
-            cmd = [
-                "ffmpeg", "-y", "-f", "concat", "-safe", "0",
-                "-i", str(filelist_txt),
-                "-ar", "44100", "-ac", "1", "-sample_fmt", "s16",
-                str(final_path)
-            ]
-            
-            print(f"執行最終合併：{' '.join(cmd)}")
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # Execute final merge (in-process streaming concat, no re-encode) inside the job directory
+            final_filename = f"{script_name}_final.wav"
+            merged_path = job.work_dir / final_filename
+            merge_result = None
+            if splice:
+                with stage("splice", segments=len(rendered_segments)):
+                    merge_result = await self._splice_episode(job, merged_segments, rendered_segments, merged_path)
+            spliced = merge_result is not None
+            try:
+                if merge_result is None:
+                    print(f"執行最終合併：{final_filename}")
+                    with stage("merge", segments=len(fixed_audio_paths), postprocess=settings.AUDIO_POSTPROCESS):
+                        merge_result = await self.audio_manager.merge_wav_segments(
+                            [Path(p) for p in fixed_audio_paths], merged_path,
+                            speakers=[item.speaker for _, item in merged_segments],
+                            postprocess=settings.AUDIO_POSTPROCESS
+                        )
+            except (WavFormatError, OSError) as e:
+                print(f"❌ Podcast 最終合併失敗：{e}")
+                return {"success": False, "error": f"Final merge failed: {e}"}
             
-            if final_path.exists() and final_path.stat().st_size > 0:
-                print(f"✅ Podcast 音檔已產生：{final_path}")
-                total_duration = final_path.stat().st_size / (44100 * 2)  # Rough duration estimate
+            if merged_path.exists() and merged_path.stat().st_size > 0:
+                # Compressed delivery renditions are encoded from the merged master
+                with stage("renditions"):
+                    renditions = await self.audio_manager.create_renditions(merged_path, Path(final_filename).stem, job.work_dir)
+                
+                # Timing sidecar: frame-exact position of every line, computed from the merge itself
+                timing_index = build_timing_index(script_name, merge_result, merged_segments, postprocessed=settings.AUDIO_POSTPROCESS)
+                job.save_json(job.TIMING, timing_index)
+                timing_path = self.audio_manager.publish(job.job_dir / job.TIMING, timing_filename(script_name), keep_source=True)
                 
-                # Clean up temporary files
+                # 以本次實際合成的段落更新各聲音的語速模型（供之後的集數估算長度）
                 try:
-                    filelist_txt.unlink()
-                except:
-                    pass
+                    await speech_rates.observe(
+                        timing_index,
+                        {host.name: (speaker_config[host.name], host.dialect or "") for host in hosts if host.name in speaker_config},
+                        indexes=rendered_segments.keys()
+                    )
+                except Exception as e:
+                    print(f"語速模型更新失敗：{e}")
+                
+                # Publish the finished episode into the served tree in one atomic rename
+                final_path = self.audio_manager.publish(merged_path, final_filename)
+                renditions.append(self.audio_manager.describe_rendition(final_path, "wav"))
+                print(f"✅ Podcast 音檔已產生：{final_path}")
+                total_duration = merge_result.duration
+                
+                renditions = [r.model_dump() for r in renditions]
+                job.update_manifest(final_audio_file=str(final_path), renditions=renditions)
                 
                 return {
                     "success": True,
                     "total_audio_files": len(fixed_audio_paths),
                     "total_duration": total_duration,
                     "final_audio_file": str(final_path),
+                    "final_audio_url": self.audio_manager.url_for(final_path),
+                    "timing_url": self.audio_manager.url_for(timing_path),
+                    "renditions": renditions,
                     "fixed_audio_paths": fixed_audio_paths,
                     "successful_segments": successful_segments,
+                    "failed_segments": failed_segments,
+                    "reused_segments": reused_segments,
+                    "rendered_segments": sorted(rendered_segments),
+                    "spliced": spliced,
                     "language_mode": language
                 }
             else:
@@ -488,10 +700,80 @@ class PodcastService:
             import traceback
             traceback.print_exc()
             return {"success": False, "error": str(e)}
+    
+    async def _splice_episode(self, job: JobCheckpoint, merged_segments: List[tuple], rendered_segments: Dict[int, Path], output_path: Path) -> Optional[ConcatResult]:
+        """Re-splice the previous render of a job with re-rendered segments
+
+        Returns None when a full merge is needed instead: no previous render or timing
+        index, a different set of segments or speakers, a change of post-processing
+        mode, or a render with crossfaded joins.
+        """
+        if not job.has(job.TIMING):
+            return None
+        timing_index = job.load_json(job.TIMING)
+        previous_path = Path(job.load_manifest().get("final_audio_file") or "")
+        if not previous_path.is_file():
+            return None
         
-        finally:
-            await self.tts_service.close()
-            print("TTS service closed")
+        previous_layout = [(entry["index"], entry["speaker"]) for entry in timing_index["segments"]]
+        if previous_layout != [(idx, item.speaker) for idx, item in merged_segments]:
+            return None
+        if timing_index.get("postprocessed") != settings.AUDIO_POSTPROCESS:
+            return None
+        if any(entry["gap_frames"] < 0 for entry in timing_index["segments"]):
+            return None
+        
+        print(f"重新拼接 {len(rendered_segments)} 個段落：{sorted(rendered_segments)}")
+        try:
+            return await self.audio_manager.splice_wav_segments(
+                previous_path, timing_index, rendered_segments, output_path, postprocess=settings.AUDIO_POSTPROCESS
+            )
+        except (WavFormatError, OSError, KeyError) as e:
+            print(f"重新拼接失敗，改為完整合併：{e}")
+            return None
+    
+    async def _render_segments(self, requests: List[SynthesisRequest], job: JobCheckpoint, on_segment: Optional[Callable[[SynthesisRequest, Optional[Path]], None]] = None) -> Dict[int, Path]:
+        """Synthesize segments through the voice backend registry and format-fix them
+
+        Raw TTS output goes to the job's work directory and the fixed segments to its
+        segments directory; returns {script index: fixed WAV path} for the successes.
+        on_segment(request, fixed path or None) is called as soon as each segment is
+        finished, so it can be checkpointed before the others complete.
+        """
+        if not requests:
+            return {}
+        print(f"合成 {len(requests)} 個段落：{[backend['name'] for backend in self.voice_registry.status()]}")
+        
+        async def _fix(result) -> Optional[Path]:
+            request = result.request
+            if result.error:
+                print(f"Segment {request.index + 1} ({result.backend}) 音檔產生失敗: {result.error}")
+                return None
+            output_path = result.path
+            if not output_path.exists() or output_path.stat().st_size == 0:
+                print(f"{result.backend} 產生的音檔無效：{output_path}")
+                return None
+            
+            fixed_path = job.segments_dir / (output_path.stem + "_fixed.wav")
+            if not await self.audio_manager.conform_wav(output_path, fixed_path):
+                print(f"{result.backend} 音檔格式修復失敗：{output_path.name}")
+                return None
+            # Delete original file, keep only fixed version
+            output_path.unlink(missing_ok=True)
+            print(f"Segment {request.index + 1} ({result.backend}) 音檔產生成功: {fixed_path.name}")
+            return fixed_path
+        
+        fixed_paths: Dict[int, Path] = {}
+        
+        async def _finish(result):
+            fixed_path = await _fix(result)
+            if fixed_path:
+                fixed_paths[result.request.index] = fixed_path
+            if on_segment:
+                on_segment(result.request, fixed_path)
+        
+        await self.voice_registry.dispatch(requests, on_result=_finish)
+        return fixed_paths
     
     def split_long_text(self, hakka_text: str, romanization: str, max_length: int = 60) -> List[tuple]:
         """Split long text for processing to avoid TTS timeout"""
@@ -535,83 +817,50 @@ class PodcastService:
         
         return segments if segments else [(hakka_text, romanization)]
     
+    def get_segment_files(self, script_name: str) -> Dict[str, List[Path]]:
+        """Rendered segment files of a script's latest job, by speaker code (SXF, GMM, SXM2...), in script order"""
+        job = self.job_store.latest_for_script(script_name)
+        files: Dict[str, List[Path]] = {}
+        for segment in (job.segment_files() if job else []):
+            files.setdefault(segment["code"], []).append(segment["path"])
+        return files
+    
     async def merge_audio_files(self, script_name: str, auto_merge: bool = False) -> Dict[str, Any]:
         """Merge audio files into complete podcast"""
         try:
-            # Check for available audio files
-            speaker_codes = ["SXF", "SXM", "HLF", "HLM"]
-            available_speakers = []
-            
-            for code in speaker_codes:
-                files = self.audio_manager.get_organized_files(script_name, code)
-                if files:
-                    available_speakers.append((code, len(files)))
-                    print(f"Found {code} speaker audio files: {len(files)}")
-            
-            if not available_speakers:
+            # 段落音檔在最新一次產生的 job 目錄中（jobs/<id>/segments），依 manifest 的腳本順序合併
+            job = self.job_store.latest_for_script(script_name)
+            segments = job.segment_files() if job else []
+            if not segments:
                 return {"success": False, "error": "No audio files found for merging"}
             
-            # Collect all audio files sorted by segment index
-            all_files = []
-            for code, count in available_speakers:
-                files = self.audio_manager.get_organized_files(script_name, code)
-                for file in files:
-                    try:
-                        name_parts = file.stem.split('_')
-                        segment_index = int(name_parts[-1])
-                        all_files.append((segment_index, file))
-                    except (ValueError, IndexError):
-                        all_files.append((9999, file))
-            
-            all_files.sort(key=lambda x: x[0])
-            sorted_files = [file for _, file in all_files]
+            speaker_counts: Dict[str, int] = {}
+            for segment in segments:
+                speaker_counts[segment["code"]] = speaker_counts.get(segment["code"], 0) + 1
+            for code, count in speaker_counts.items():
+                print(f"Found {code} speaker audio files: {count}")
+            sorted_files = [segment["path"] for segment in segments]
             
             print(f"Preparing to merge {len(sorted_files)} audio files...")
             
-            # Create merge files
-            concat_file = self.audio_manager.audio_dir / f"{script_name}_all_speakers_concat.txt"
             output_file = self.audio_manager.audio_dir / f"{script_name}_complete_all_speakers.wav"
             
-            self.audio_manager.create_ffmpeg_concat_file(sorted_files, concat_file)
-            
-            # Check FFmpeg availability
-            try:
-                subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                return {"success": False, "error": "FFmpeg not installed"}
-            
-            # Execute FFmpeg merge
-            cmd = [
-                'ffmpeg',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', str(concat_file),
-                '-c', 'copy',
-                '-y',
-                str(output_file)
-            ]
-            
             print("Executing multi-speaker audio merge...")
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            try:
+                await self.audio_manager.merge_wav_segments(sorted_files, output_file)
+            except (WavFormatError, MediaToolError) as e:
+                return {"success": False, "error": f"Merge failed: {e}"}
             
-            if result.returncode == 0:
-                concat_file.unlink(missing_ok=True)
-                
-                if output_file.exists():
-                    file_size = output_file.stat().st_size
-                    return {
-                        "success": True,
-                        "output_file": str(output_file),
-                        "file_size_mb": file_size / 1024 / 1024,
-                        "total_files": len(sorted_files)
-                    }
-                else:
-                    return {"success": False, "error": "Merge completed but output file not found"}
-            else:
+            if output_file.exists():
+                file_size = output_file.stat().st_size
                 return {
-                    "success": False, 
-                    "error": f"FFmpeg merge failed: {result.stderr}"
+                    "success": True,
+                    "output_file": str(output_file),
+                    "file_size_mb": file_size / 1024 / 1024,
+                    "total_files": len(sorted_files)
                 }
+            else:
+                return {"success": False, "error": "Merge completed but output file not found"}
                 
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -650,10 +899,24 @@ class PodcastService:
             # Extract script name
             script_name = Path(script_file_path).stem
             
+            # Each run gets its own job directory so repeated runs of the same script don't collide
+            job = self.job_store.create()
+            job.update_state(
+                script_name=script_name,
+                script_file=str(script_file_path),
+                language=language,
+                hosts=[host.model_dump() for host in hosts],
+                status="running",
+                stage="audio"
+            )
+            job.save_script(podcast_script)
+            
             # Generate audio
-            audio_result = await self.generate_podcast_audio_with_voices(podcast_script, script_name, language, hosts)
+            audio_result = await self.generate_podcast_audio_with_voices(podcast_script, script_name, language, hosts, job=job)
+            job.update_state(status="completed" if audio_result.get("success") else "failed", error=audio_result.get("error"))
             
             return {
+                "job_id": job.job_id,
                 "success": audio_result.get("success", False),
                 "script_name": script_name,
                 "audio_result": audio_result,
@@ -663,24 +926,40 @@ class PodcastService:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    async def get_all_podcasts(self) -> List[PodcastResponse]:
-        """Get all generated podcasts"""
-        return [self._to_response(podcast) for podcast in self.podcasts_storage]
+    async def list_podcasts(self, limit: int = 20, offset: int = 0, topic: Optional[str] = None, language: Optional[str] = None) -> PodcastListResponse:
+        """List generated podcasts (newest first) as lightweight summaries"""
+        rows, total = await self.library.list(limit=limit, offset=offset, topic=topic, language=language)
+        return PodcastListResponse(
+            items=[self._to_summary(row) for row in rows],
+            total=total,
+            limit=limit,
+            offset=offset
+        )
     
     async def get_podcast(self, podcast_id: str) -> Optional[PodcastResponse]:
-        """Get a specific podcast by ID"""
-        for podcast in self.podcasts_storage:
-            if podcast.id == podcast_id:
-                return self._to_response(podcast)
-        return None
+        """Get a specific podcast by ID, including its full transcript"""
+        podcast = await self.library.get(podcast_id)
+        return self._to_response(podcast) if podcast else None
     
     async def delete_podcast(self, podcast_id: str) -> bool:
         """Delete a podcast by ID"""
-        for i, podcast in enumerate(self.podcasts_storage):
-            if podcast.id == podcast_id:
-                del self.podcasts_storage[i]
-                return True
-        return False
+        return await self.library.delete(podcast_id)
+    
+    def _to_summary(self, row: Dict[str, Any]) -> PodcastSummary:
+        """Convert a library row to PodcastSummary"""
+        return PodcastSummary(
+            id=row["id"],
+            title=row["title"],
+            topic=row["topic"],
+            duration=row["duration"],
+            language=row["language"],
+            hosts=row["hosts"],
+            interests=row["interests"],
+            createdAt=row["created_at"],
+            audioUrl=row["audio_url"],
+            audioDuration=row["audio_duration"],
+            renditions=row["renditions"]
+        )
     
     def _to_response(self, podcast: Podcast) -> PodcastResponse:
         """Convert Podcast model to PodcastResponse"""
@@ -697,5 +976,6 @@ class PodcastService:
             interests=podcast.interests,
             createdAt=podcast.created_at.isoformat(),
             audioUrl=podcast.audio_url,
-            audioDuration=podcast.audio_duration
+            audioDuration=podcast.audio_duration,
+            renditions=podcast.renditions
         )
\ No newline at end of file
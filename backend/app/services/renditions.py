@@ -0,0 +1,131 @@
+import logging
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from app.core.config import settings
+from app.models.podcast import AudioRendition
+from app.services.media_tools import media_runner, MediaToolError
+
+logger = logging.getLogger(__name__)
+
+
+class RenditionCodec(NamedTuple):
+    extension: str
+    mime_type: str
+    ffmpeg_args: List[str]
+
+
+# Compressed delivery formats for final episodes (speech, mono)
+CODECS: Dict[str, RenditionCodec] = {
+    "opus": RenditionCodec(".opus", "audio/ogg; codecs=opus", ["-c:a", "libopus", "-application", "voip", "-vbr", "on"]),
+    "aac": RenditionCodec(".m4a", "audio/mp4", ["-c:a", "aac", "-movflags", "+faststart"]),
+    "mp3": RenditionCodec(".mp3", "audio/mpeg", ["-c:a", "libmp3lame"]),
+}
+WAV_MIME_TYPE = "audio/wav"
+
+# Smallest first: what a client gets when it accepts everything
+DEFAULT_PREFERENCE = ("opus", "aac", "mp3", "wav")
+# Podcast apps reliably play MP3/AAC enclosures, not Ogg Opus
+RSS_PREFERENCE = ("mp3", "aac", "wav")
+# Safari/iOS only plays Opus inside CAF/WebM, not the Ogg container we produce
+APPLE_PREFERENCE = ("aac", "mp3", "wav")
+
+
+def configured_bitrates() -> Dict[str, int]:
+    """Enabled rendition formats and their bitrates (kbps) from settings"""
+    bitrates = {
+        "opus": settings.OPUS_BITRATE_KBPS,
+        "aac": settings.AAC_BITRATE_KBPS,
+        "mp3": settings.MP3_BITRATE_KBPS,
+    }
+    formats = [f.strip().lower() for f in settings.RENDITION_FORMATS.split(",") if f.strip()]
+    return {fmt: bitrates[fmt] for fmt in formats if fmt in CODECS}
+
+
+def mime_type_for(path_or_url: str) -> str:
+    """Guess the MIME type of an audio file from its extension"""
+    suffix = Path(path_or_url.split("?", 1)[0]).suffix.lower()
+    for codec in CODECS.values():
+        if codec.extension == suffix:
+            return codec.mime_type
+    return WAV_MIME_TYPE if suffix == ".wav" else "application/octet-stream"
+
+
+async def encode_rendition(source_path: Path, output_path: Path, fmt: str, bitrate_kbps: int) -> bool:
+    """Encode a WAV into one compressed rendition with FFmpeg"""
+    codec = CODECS[fmt]
+    args = [
+        "-y", "-i", str(source_path),
+        "-vn", "-ac", "1",
+        *codec.ffmpeg_args,
+        "-b:a", f"{bitrate_kbps}k",
+        str(output_path)
+    ]
+    try:
+        result = await media_runner.ffmpeg(args)
+    except MediaToolError as e:
+        logger.warning(f"{fmt} rendition failed for {source_path.name}: {e}")
+        return False
+    if result.returncode != 0 or not output_path.exists() or output_path.stat().st_size == 0:
+        logger.warning(f"{fmt} rendition failed for {source_path.name}: {result.stderr[-300:]}")
+        output_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _accepted_types(accept: str) -> Dict[str, float]:
+    """Parse an Accept header into {media type: q}"""
+    accepted = {}
+    for part in accept.split(","):
+        fields = [f.strip() for f in part.split(";")]
+        if not fields[0]:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[fields[0].lower()] = q
+    return accepted
+
+
+def _accept_q(accepted: Dict[str, float], mime_type: str) -> float:
+    base = mime_type.split(";", 1)[0].strip().lower()
+    for key in (base, base.split("/", 1)[0] + "/*", "*/*"):
+        if key in accepted:
+            return accepted[key]
+    return 0.0
+
+
+def select_rendition(
+    renditions: Sequence[AudioRendition],
+    accept: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    preference: Optional[Sequence[str]] = None,
+) -> Optional[AudioRendition]:
+    """Pick the rendition to serve to a client
+
+    Formats are tried in preference order (smallest first by default); explicit
+    audio types in the Accept header win over that order, and Apple clients, which
+    cannot play Ogg Opus, default to AAC.
+    """
+    if not renditions:
+        return None
+    if preference is None:
+        ua = (user_agent or "").lower()
+        is_apple = ("iphone" in ua or "ipad" in ua or "macintosh" in ua) and "chrome" not in ua and "firefox" not in ua
+        preference = APPLE_PREFERENCE if is_apple else DEFAULT_PREFERENCE
+
+    by_format = {r.format: r for r in renditions}
+    candidates = [by_format[fmt] for fmt in preference if fmt in by_format]
+    if not candidates:
+        candidates = list(renditions)
+
+    accepted = _accepted_types(accept or "")
+    if not accepted:
+        return candidates[0]
+    # Stable sort keeps the preference order among equally acceptable formats
+    ranked = sorted(candidates, key=lambda r: -_accept_q(accepted, r.mimeType))
+    return ranked[0] if _accept_q(accepted, ranked[0].mimeType) > 0 else candidates[0]
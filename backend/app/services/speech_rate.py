@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import aiosqlite
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS speech_rates (
+    voice TEXT NOT NULL,
+    dialect TEXT NOT NULL,
+    units REAL NOT NULL,
+    seconds REAL NOT NULL,
+    segments REAL NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (voice, dialect)
+);
+"""
+
+DEFAULT_TURN_UNITS = 60  # prior length of one host turn, in spoken units
+PRIOR_SEGMENTS = 5       # weight of that prior, in segments
+
+# One syllable per CJK ideograph; Latin words and numbers count as one unit each
+_CJK = re.compile(r"[㐀-䶿一-鿿豈-﫿\U00020000-\U0002ffff]")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+
+Key = Tuple[str, str]  # (voice, dialect)
+
+
+def spoken_units(text: str) -> int:
+    """Spoken length of script text: CJK characters (syllables) plus Latin words / numbers"""
+    return len(_CJK.findall(text)) + len(_WORD.findall(text))
+
+
+def pause_seconds() -> float:
+    """Silence the merge inserts between turns (none without post-processing)"""
+    return settings.AUDIO_TURN_PAUSE_MS / 1000 if settings.AUDIO_POSTPROCESS else 0.0
+
+
+class RateStats(NamedTuple):
+    units: float
+    seconds: float
+    segments: float
+
+    def __add__(self, other: "RateStats") -> "RateStats":
+        return RateStats(self.units + other.units, self.seconds + other.seconds, self.segments + other.segments)
+
+
+class EpisodeBudget:
+    """Predicted spoken length of a script while it is being written
+
+    Lines are 'name: text'; each is priced with its host's speech rate plus the pause
+    before it, so generation can stop once the predicted audio reaches the target.
+    Lines without a host prefix are dropped from the script, so they cost nothing.
+    """
+
+    def __init__(self, target_seconds: float, speakers: Iterable[str], rates: Dict[str, float], default_rate: float, turn_units: float):
+        self.target_seconds = target_seconds
+        self.speakers = set(speakers)
+        self.rates = rates
+        self.default_rate = default_rate
+        self.turn_units = turn_units
+        self.pause = pause_seconds()
+        self.elapsed = 0.0
+        self.lines = 0
+
+    @property
+    def remaining(self) -> float:
+        return self.target_seconds - self.elapsed
+
+    def seconds(self, speaker: Optional[str], text: str) -> float:
+        """Predicted audio for one line of a host, including the pause before it"""
+        rate = self.rates.get(speaker, self.default_rate)
+        return spoken_units(text) * rate + self.pause
+
+    def line_seconds(self, line: str) -> float:
+        speaker, sep, text = line.partition(":")
+        if not sep or speaker.strip() not in self.speakers:
+            return 0.0
+        return self.seconds(speaker.strip(), text)
+
+    def add(self, line: str) -> float:
+        seconds = self.line_seconds(line)
+        self.elapsed += seconds
+        self.lines += 1
+        return seconds
+
+    def turn_seconds(self) -> float:
+        """Predicted length of an average host turn"""
+        return self.turn_units * self.default_rate + self.pause
+
+    def units_for(self, seconds: float) -> int:
+        """Script length (characters) that fills the given time at the hosts' average rate"""
+        return max(int(seconds / self.default_rate), 0)
+
+
+class SpeechRateModel:
+    """Seconds of rendered audio per spoken unit of script text, per voice and dialect
+
+    Learned from the timing index of every render: segment durations are frame-exact and,
+    with post-processing, exclude trimmed silence. Units are counted on the script text the
+    dialogue generator writes, so the Hakka translation's expansion is part of the rate.
+    Estimates are shrunk toward SPEECH_RATE_PRIOR_CPM by SPEECH_RATE_PRIOR_UNITS pseudo-units,
+    and totals are scaled down past SPEECH_RATE_WINDOW_UNITS so recent audio dominates.
+    Unknown voices fall back to the voice in any dialect, then to all voices.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path
+        self._stats: Dict[Key, RateStats] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def db_path(self) -> Path:
+        return Path(self._db_path or settings.SPEECH_RATE_DB_PATH).resolve()
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with aiosqlite.connect(self.db_path) as conn:
+            conn.row_factory = aiosqlite.Row
+            yield conn
+
+    async def init(self):
+        """Create the table and load the learned rates into memory (runs once)"""
+        async with self._lock:
+            if self._loaded:
+                return
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            async with self._connect() as conn:
+                await conn.execute("PRAGMA journal_mode = WAL")
+                await conn.executescript(SCHEMA)
+                await conn.commit()
+                async with conn.execute("SELECT voice, dialect, units, seconds, segments FROM speech_rates") as cursor:
+                    rows = await cursor.fetchall()
+            self._stats = {(row["voice"], row["dialect"]): RateStats(row["units"], row["seconds"], row["segments"]) for row in rows}
+            self._loaded = True
+
+    def _lookup(self, voice: Optional[str], dialect: Optional[str]) -> Optional[RateStats]:
+        if voice is not None and (voice, dialect or "") in self._stats:
+            return self._stats[(voice, dialect or "")]
+        matches = [stats for (v, _), stats in self._stats.items() if voice is None or v == voice]
+        if not matches and voice is not None:
+            matches = list(self._stats.values())
+        if not matches:
+            return None
+        total = matches[0]
+        for stats in matches[1:]:
+            total = total + stats
+        return total
+
+    def seconds_per_unit(self, voice: Optional[str] = None, dialect: Optional[str] = None) -> float:
+        prior = 60 / settings.SPEECH_RATE_PRIOR_CPM
+        weight = settings.SPEECH_RATE_PRIOR_UNITS
+        stats = self._lookup(voice, dialect)
+        if stats is None:
+            return prior
+        return (stats.seconds + prior * weight) / (stats.units + weight)
+
+    def units_per_segment(self, voice: Optional[str] = None, dialect: Optional[str] = None) -> float:
+        stats = self._lookup(voice, dialect)
+        if stats is None:
+            return DEFAULT_TURN_UNITS
+        return (stats.units + DEFAULT_TURN_UNITS * PRIOR_SEGMENTS) / (stats.segments + PRIOR_SEGMENTS)
+
+    async def budget(self, target_seconds: float, speakers: Iterable[str], voices: Dict[str, Key]) -> EpisodeBudget:
+        """Budget for an episode of these hosts; voices maps host names to their (voice, dialect) when known"""
+        await self.init()
+        rates = {name: self.seconds_per_unit(voice, dialect) for name, (voice, dialect) in voices.items()}
+        if rates:
+            default_rate = sum(rates.values()) / len(rates)
+            turn_units = sum(self.units_per_segment(voice, dialect) for voice, dialect in voices.values()) / len(voices)
+        else:
+            default_rate = self.seconds_per_unit()
+            turn_units = self.units_per_segment()
+        return EpisodeBudget(target_seconds, speakers, rates, default_rate, turn_units)
+
+    async def observe(self, timing_index: Dict[str, Any], voices: Dict[str, Key], indexes: Optional[Iterable[int]] = None) -> int:
+        """Learn from a rendered episode's timing index; only segments in indexes (default: all). Returns segments used"""
+        await self.init()
+        wanted = set(indexes) if indexes is not None else None
+        segments = [
+            entry for entry in timing_index.get("segments", [])
+            if (wanted is None or entry["index"] in wanted) and entry.get("speaker") in voices
+        ]
+        observed: Dict[Key, RateStats] = {}
+        predicted = actual = 0.0
+        for entry in segments:
+            units = spoken_units(entry.get("text", ""))
+            if units == 0 or entry["duration"] <= 0:
+                continue
+            key = (voices[entry["speaker"]][0], voices[entry["speaker"]][1] or "")
+            predicted += units * self.seconds_per_unit(*key)
+            actual += entry["duration"]
+            observed[key] = observed.get(key, RateStats(0, 0, 0)) + RateStats(units, entry["duration"], 1)
+        if not observed:
+            return 0
+
+        now = datetime.now().isoformat()
+        rows = []
+        async with self._lock:
+            for key, new in observed.items():
+                stats = self._stats.get(key, RateStats(0, 0, 0)) + new
+                if stats.units > settings.SPEECH_RATE_WINDOW_UNITS:
+                    scale = settings.SPEECH_RATE_WINDOW_UNITS / stats.units
+                    stats = RateStats(stats.units * scale, stats.seconds * scale, stats.segments * scale)
+                self._stats[key] = stats
+                rows.append((key[0], key[1], stats.units, stats.seconds, stats.segments, now))
+            async with self._connect() as conn:
+                await conn.executemany(
+                    "INSERT OR REPLACE INTO speech_rates (voice, dialect, units, seconds, segments, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                await conn.commit()
+
+        used = int(sum(stats.segments for stats in observed.values()))
+        logger.info(
+            f"Speech rates updated from {used} segments: predicted {predicted:.0f}s vs rendered {actual:.0f}s of speech "
+            f"({(predicted - actual) / actual:+.0%})"
+        )
+        return used
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "voice": voice,
+                "dialect": dialect,
+                "units": round(stats.units),
+                "segments": round(stats.segments),
+                "seconds_per_unit": round(self.seconds_per_unit(voice, dialect), 4),
+                "units_per_minute": round(60 / self.seconds_per_unit(voice, dialect), 1),
+            }
+            for (voice, dialect), stats in sorted(self._stats.items())
+        ]
+
+
+speech_rates = SpeechRateModel()
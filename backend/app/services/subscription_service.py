@@ -2,9 +2,9 @@ import uuid
 import smtplib
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
-from email.mime.base import MimeBase
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.base import MIMEBase
 from email import encoders
 import logging
 
@@ -15,6 +15,7 @@ from ..models.subscription import (
 from ..core.config import settings
 from .ai_service import AIService
 from .podcast_service import PodcastService
+from .renditions import RSS_PREFERENCE, DEFAULT_PREFERENCE, mime_type_for, select_rendition
 
 logger = logging.getLogger(__name__)
 
@@ -244,6 +245,18 @@ class SubscriptionService:
         
         subject = f"🎙️ 今日客語播客：{title}"
         
+        # 每個壓縮版本各一個 <source>，郵件客戶端會播放第一個支援的格式
+        renditions = sorted(
+            content.get('renditions') or [],
+            key=lambda r: DEFAULT_PREFERENCE.index(r['format']) if r.get('format') in DEFAULT_PREFERENCE else len(DEFAULT_PREFERENCE)
+        )
+        if renditions:
+            audio_sources = "\n".join(f'<source src="{self._absolute_url(r["url"])}" type="{r["mimeType"]}">' for r in renditions)
+            audio_link = self._absolute_url(renditions[0]["url"])
+        else:
+            audio_link = content.get('audio_url', '')
+            audio_sources = f'<source src="{audio_link}" type="{mime_type_for(audio_link)}">'
+        
         html_content = f"""
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
             <div style="background: linear-gradient(135deg, #0E2148, #483AA0); padding: 30px; text-align: center; color: white;">
@@ -255,7 +268,7 @@ class SubscriptionService:
                 <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
                     <h3 style="color: #0E2148; margin-top: 0;">🎵 音訊播客</h3>
                     <audio controls style="width: 100%;">
-                        <source src="{content.get('audio_url', '')}" type="audio/mpeg">
+                        {audio_sources}
                         您的瀏覽器不支援音訊播放。
                     </audio>
                 </div>
@@ -289,7 +302,7 @@ class SubscriptionService:
         中文原稿：
         {content.get('chinese_content', '')}
         
-        音訊連結：{content.get('audio_url', '')}
+        音訊連結：{audio_link}
         
         管理訂閱：{settings.BASE_URL}/subscription/{subscription.id}
         取消訂閱：{settings.BASE_URL}/unsubscribe/{subscription.id}
@@ -334,14 +347,14 @@ class SubscriptionService:
     async def _send_email(self, to_email: str, subject: str, html_content: str, text_content: str):
         """Send email using SMTP"""
         try:
-            msg = MimeMultipart('alternative')
+            msg = MIMEMultipart('alternative')
             msg['Subject'] = subject
             msg['From'] = settings.SMTP_FROM_EMAIL
             msg['To'] = to_email
             
             # Add text and HTML parts
-            text_part = MimeText(text_content, 'plain', 'utf-8')
-            html_part = MimeText(html_content, 'html', 'utf-8')
+            text_part = MIMEText(text_content, 'plain', 'utf-8')
+            html_part = MIMEText(html_content, 'html', 'utf-8')
             
             msg.attach(text_part)
             msg.attach(html_part)
@@ -378,6 +391,10 @@ class SubscriptionService:
         # For now, return empty list
         return []
     
+    def _absolute_url(self, url: str) -> str:
+        """Feeds and emails need absolute links; static files are served relative to BASE_URL"""
+        return f"{settings.BASE_URL}{url}" if url.startswith("/") else url
+    
     def _generate_rss_xml(self, subscription: Subscription, episodes: List[PodcastEpisode]) -> str:
         """Generate RSS XML for podcast feed"""
         import xml.etree.ElementTree as ET
@@ -409,11 +426,20 @@ class SubscriptionService:
             ET.SubElement(item, "pubDate").text = episode.published_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
             ET.SubElement(item, "guid", isPermaLink="false").text = episode.id
             
-            if episode.audio_url:
+            ET.SubElement(item, "itunes:duration").text = str(episode.duration)
+            
+            # RSS allows one enclosure per item: use the most compatible rendition, length in bytes
+            rendition = select_rendition(episode.renditions, preference=RSS_PREFERENCE)
+            if rendition:
+                enclosure = ET.SubElement(item, "enclosure")
+                enclosure.set("url", self._absolute_url(rendition.url))
+                enclosure.set("type", rendition.mimeType)
+                enclosure.set("length", str(rendition.sizeBytes))
+            elif episode.audio_url:
                 enclosure = ET.SubElement(item, "enclosure")
-                enclosure.set("url", episode.audio_url)
-                enclosure.set("type", "audio/mpeg")
-                enclosure.set("length", str(episode.duration))
+                enclosure.set("url", self._absolute_url(episode.audio_url))
+                enclosure.set("type", mime_type_for(episode.audio_url))
+                enclosure.set("length", "0")
         
         # Pretty print XML
         rough_string = ET.tostring(rss, encoding='unicode')
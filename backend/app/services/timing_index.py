@@ -0,0 +1,133 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.podcast import PodcastScriptContent
+from app.services.wav_concat import ConcatResult, WAV_HEADER_BYTES
+
+TIMING_VERSION = 1
+TEXT_FIELDS = ("hakka_text", "romanization", "text")
+
+
+def timing_filename(script_name: str) -> str:
+    return f"{script_name}_final.timing.json"
+
+
+def build_timing_index(script_name: str, merge_result: ConcatResult, segments: List[Tuple[int, PodcastScriptContent]], postprocessed: bool = False) -> Dict[str, Any]:
+    """Frame-exact timing of every segment in a merged episode
+
+    segments is a list of (script index, PodcastScriptContent) in merge order, aligned
+    with merge_result.segment_offsets / segment_frames.
+    """
+    fmt = merge_result.format
+    rate = fmt.sample_rate
+    entries = []
+    previous_end = 0
+    for (index, item), start, frames in zip(segments, merge_result.segment_offsets, merge_result.segment_frames):
+        entries.append({
+            "index": index,
+            "speaker": item.speaker,
+            "start_frame": start,
+            "frames": frames,
+            "start": round(start / rate, 3),
+            "duration": round(frames / rate, 3),
+            "byte_offset": WAV_HEADER_BYTES + start * fmt.frame_size,
+            "byte_length": frames * fmt.frame_size,
+            # Negative when the segment crossfades into the previous one
+            "gap_frames": start - previous_end if entries else start,
+            "text": item.text,
+            "hakka_text": item.hakka_text or "",
+            "romanization": item.romanization or "",
+        })
+        previous_end = start + frames
+
+    return {
+        "version": TIMING_VERSION,
+        "script_name": script_name,
+        "sample_rate": rate,
+        "channels": fmt.channels,
+        "sample_width": fmt.sample_width,
+        "data_offset": WAV_HEADER_BYTES,
+        "total_frames": merge_result.total_frames,
+        "duration": round(merge_result.total_frames / rate, 3),
+        "postprocessed": postprocessed,
+        "segments": entries,
+    }
+
+
+def _timestamp(frames: int, rate: int, decimal: str) -> str:
+    millis = frames * 1000 // rate
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    seconds, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal}{millis:03d}"
+
+
+def _cues(index: Dict[str, Any], field: str):
+    if field not in TEXT_FIELDS:
+        raise ValueError(f"Unknown text field: {field}")
+    for segment in index["segments"]:
+        text = segment.get(field) or segment.get("text", "")
+        if segment["frames"] > 0 and text:
+            yield segment, text.strip()
+
+
+def to_webvtt(index: Dict[str, Any], field: str = "hakka_text") -> str:
+    """WebVTT cues with the speaker as a voice span"""
+    rate = index["sample_rate"]
+    lines = ["WEBVTT", ""]
+    for segment, text in _cues(index, field):
+        start = segment["start_frame"]
+        end = start + segment["frames"]
+        lines.append(str(segment["index"] + 1))
+        lines.append(f"{_timestamp(start, rate, '.')} --> {_timestamp(end, rate, '.')}")
+        lines.append(f"<v {segment['speaker']}>{text}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def to_srt(index: Dict[str, Any], field: str = "hakka_text") -> str:
+    """SubRip cues numbered in playback order"""
+    rate = index["sample_rate"]
+    lines: List[str] = []
+    for number, (segment, text) in enumerate(_cues(index, field), start=1):
+        start = segment["start_frame"]
+        end = start + segment["frames"]
+        lines.append(str(number))
+        lines.append(f"{_timestamp(start, rate, ',')} --> {_timestamp(end, rate, ',')}")
+        lines.append(f"{segment['speaker']}: {text}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+
+TIMING_FORMATS = {
+    "json": "application/json",
+    "vtt": "text/vtt; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+}
+
+
+def load_timing_index(audio_dir: Path, script_name: str) -> Optional[Dict[str, Any]]:
+    """Load a published timing sidecar; None if the script has none"""
+    if not re.fullmatch(r"[\w-]+", script_name):
+        return None
+    path = audio_dir / timing_filename(script_name)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def render_timing(index: Dict[str, Any], fmt: str = "json", field: str = "hakka_text") -> Tuple[str, str]:
+    """Serialize a timing index as JSON, WebVTT or SRT; returns (content, media type)"""
+    if fmt == "vtt":
+        content = to_webvtt(index, field)
+    elif fmt == "srt":
+        content = to_srt(index, field)
+    elif fmt == "json":
+        content = json.dumps(index, ensure_ascii=False)
+    else:
+        raise ValueError(f"Unknown timing format: {fmt}")
+    return content, TIMING_FORMATS[fmt]
@@ -2,7 +2,9 @@ import httpx
 import logging
 from typing import Dict, Any, Optional
 from app.core.config import settings
-from cn2an import an2cn  #記得 pip install cn2an ㄛ
+from app.core.telemetry import upstream, record_items
+from app.core.http import http_clients
+from app.services.hakka_auth import hakka_auth
 
 logger = logging.getLogger(__name__)
 
@@ -10,7 +12,7 @@ class TranslationService:
     """Service for translating Traditional Chinese to Hakka using Hakka AI Hackathon API"""
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=15.0, verify=False)  # SSL verification disabled
+        self.client = http_clients.get("hakka_mt", timeout=15.0, verify=False)  # SSL verification disabled
         self.base_url = settings.HAKKA_TRANSLATE_API_URL
         self.username = settings.HAKKA_USERNAME
         self.password = settings.HAKKA_PASSWORD
@@ -18,30 +20,32 @@ class TranslationService:
         self.headers = None
     
     async def login(self):
-        """Authenticate and obtain bearer token for API requests"""
-        try:
-            login_payload = {
-                'username': self.username,
-                'password': self.password
-            }
-            
+        """Obtain the bearer token for API requests (shared; only logs in when it is missing or expired)"""
+        token = await hakka_auth.token(self.client, self.base_url, self.username, self.password, service="hakka_mt")
+        if token is None:
+            self.token = None
+            self.headers = None
+            return False
+        if token != self.token:
+            logger.info("Successfully authenticated with Hakka translation API")
+        self.token = token
+        self.headers = {'Authorization': f'Bearer {self.token}'}
+        return True
+
+    async def _post(self, operation: str, endpoint: str, payload: Dict[str, Any]) -> httpx.Response:
+        """POST to one MT endpoint, traced and counted per endpoint"""
+        with upstream("hakka_mt", operation, endpoint=endpoint) as outcome:
             response = await self.client.post(
-                f'{self.base_url}/api/v1/tts/login',
-                json=login_payload
+                f'{self.base_url}{endpoint}',
+                headers=self.headers,
+                json=payload
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'token' in data:
-                    self.token = data['token']
-                    self.headers = {'Authorization': f'Bearer {self.token}'}
-                    logger.info("Successfully authenticated with Hakka translation API")
-                    return True
-                    
-        except Exception as e:
-            logger.error(f"Login failed: {e}")
-            
-        return False
+            if response.status_code != 200:
+                outcome.fail(f"HTTP {response.status_code}")
+                if response.status_code == 401:
+                    # 共用 token 被拒，下一次請求重新登入
+                    hakka_auth.invalidate(self.base_url, self.username)
+            return response
 
 #根據 dialect (四縣/海陸)決定 endpoint。中文->客語漢字->調型符號/數字調
     def _convert_numbers_to_chinese(self, text: str) -> str:
@@ -49,6 +53,7 @@ class TranslationService:
         將字串中的數字->中文
         """
         import re
+        from cn2an import an2cn  #記得 pip install cn2an ㄛ（匯入慢，用到時才載入）
         def repl(match):
             num = match.group()
             try:
@@ -66,9 +71,8 @@ class TranslationService:
             # 將數字轉為中文
             chinese_text = self._convert_numbers_to_chinese(chinese_text)
 
-            # Ensure we're authenticated
-            if not self.headers:
-                await self.login()
+            # Ensure we're authenticated (shared token, no request unless it expired)
+            await self.login()
             
             if not self.headers:
                 logger.warning("Authentication failed, using fallback translation")
@@ -86,11 +90,7 @@ class TranslationService:
 
             payload = {'input': chinese_text}
             # 中文→客語漢字
-            response = await self.client.post(
-                f'{self.base_url}{hanzi_endpoint}',
-                headers=self.headers,
-                json=payload
-            )
+            response = await self._post("hakka_hanzi", hanzi_endpoint, payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -98,27 +98,20 @@ class TranslationService:
                     hakka_text = result.get('output', chinese_text)
 
                     # 客語漢字→數字調拼音
-                    py_resp = await self.client.post(
-                        f'{self.base_url}{py_endpoint}',
-                        headers=self.headers,
-                        json={"input": hakka_text}
-                    )
+                    py_resp = await self._post("romanization", py_endpoint, {"input": hakka_text})
                     if py_resp.status_code == 200:
                         romanization = py_resp.json().get("output", "")
                     else:
                         romanization = self._generate_romanization(hakka_text)
 
                     # 客語漢字→調型符號拼音
-                    tone_resp = await self.client.post(
-                        f'{self.base_url}{tone_endpoint}',
-                        headers=self.headers,
-                        json={"input": hakka_text}
-                    )
+                    tone_resp = await self._post("romanization_tone", tone_endpoint, {"input": hakka_text})
                     if tone_resp.status_code == 200:
                         romanization_tone = tone_resp.json().get("output", "")
                     else:
                         romanization_tone = self._generate_tone_symbol_romanization(hakka_text)
 
+                    record_items("translations")
                     return {
                         "hakka_text": hakka_text,
                         "romanization": romanization,
@@ -556,5 +549,6 @@ class TranslationService:
         return ' '.join(result)
 
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+        """Close the HTTP client (the shared pooled client stays open until app shutdown)"""
+        if not http_clients.is_shared(self.client):
+            await self.client.aclose()
\ No newline at end of file
@@ -1,14 +1,27 @@
 import os
+import asyncio
+import struct
 import logging
 from typing import Optional, Dict, Any
-import httpx
 from pathlib import Path
 from app.core.config import settings
-import google.genai as genai
-from google.genai import types
+from app.core.http import http_clients
+from app.services.hakka_auth import hakka_auth, voice_catalog
+from app.services.media_tools import media_runner
+from app.services.wav_concat import WavFormat, WavFormatError, read_wav_info, concat_wav_files
 
 logger = logging.getLogger(__name__)
 
+_gemini_clients: Dict[str, Any] = {}
+
+
+def gemini_client(api_key: str):
+    """google-genai client, built once per API key and shared (construction imports the SDK)"""
+    if api_key not in _gemini_clients:
+        import google.genai as genai
+        _gemini_clients[api_key] = genai.Client(api_key=api_key)
+    return _gemini_clients[api_key]
+
 class TTSService:
     """Text-to-Speech service for Hakka language using Hakka AI Hackathon API"""
     
@@ -20,7 +33,7 @@ class TTSService:
     }
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=60.0, verify=False)  # SSL verification disabled
+        self.client = http_clients.get("hakka_tts", timeout=60.0, verify=False)  # SSL verification disabled
         self.audio_dir = Path("static/audio")
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         
@@ -72,30 +85,17 @@ class TTSService:
         return False
     
     async def login(self):
-        """Authenticate and obtain bearer token for TTS API requests"""
-        try:
-            login_payload = {
-                'username': self.username,
-                'password': self.password
-            }
-            
-            response = await self.client.post(
-                f'{self.base_url}/api/v1/tts/login',
-                json=login_payload
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'token' in data:
-                    self.token = data['token']
-                    self.headers = {'Authorization': f'Bearer {self.token}'}
-                    logger.info("Successfully authenticated with Hakka TTS API")
-                    return True
-                    
-        except Exception as e:
-            logger.error(f"TTS Login failed: {e}")
-            
-        return False
+        """Obtain the bearer token for TTS API requests (shared; only logs in when it is missing or expired)"""
+        token = await hakka_auth.token(self.client, self.base_url, self.username, self.password, service="hakka_tts")
+        if token is None:
+            self.token = None
+            self.headers = None
+            return False
+        if token != self.token:
+            logger.info("Successfully authenticated with Hakka TTS API")
+        self.token = token
+        self.headers = {'Authorization': f'Bearer {self.token}'}
+        return True
     
     async def logout(self):
         """Logout from TTS API"""
@@ -105,6 +105,7 @@ class TTSService:
                     f'{self.base_url}/api/v1/tts/logout',
                     headers=self.headers
                 )
+                hakka_auth.invalidate(self.base_url, self.username)
                 self.token = None
                 self.headers = None
                 logger.info("Successfully logged out from Hakka TTS API")
@@ -113,10 +114,12 @@ class TTSService:
     
 
     async def get_models(self) -> Optional[Dict[str, Any]]:
-        """Get available TTS voice models"""
+        """Get available TTS voice models (cached for all instances, see VOICE_CATALOG_TTL_S)"""
+        return await voice_catalog.get(self.base_url, self._fetch_models)
+
+    async def _fetch_models(self) -> Optional[Dict[str, Any]]:
         try:
-            if not self.headers:
-                await self.login()
+            await self.login()
                 
             if not self.headers:
                 return None
@@ -144,7 +147,7 @@ class TTSService:
         import re
         
         # 移除羅馬拼音標調符號 (¹²³⁴⁵⁶⁷⁸⁰)
-        cleaned_text = re.sub(r'[¹²³⁴⁵⁶⁷⁸⁰]', '', cleaned_text)
+        cleaned_text = re.sub(r'[¹²³⁴⁵⁶⁷⁸⁰]', '', text)
         
         # 只有在不保留羅馬拼音時才進行英文替換和移除
         if not preserve_romanization:
@@ -248,7 +251,8 @@ class TTSService:
         # 說話者簡寫
         speaker_short = ""
         if speaker:
-            if speaker in ["SXM", "SXF", "HLM", "HLF", "UNK"]:
+            if re.fullmatch(r"[A-Z]{2,3}\d*", speaker):
+                # 已經是說話者代碼（如 SXF、GMM、SXM2）
                 speaker_short = speaker
             elif "xi" in speaker.lower() and ("F01" in speaker or "f" in speaker.lower()):
                 speaker_short = "SXF"
@@ -282,7 +286,7 @@ class TTSService:
         
         return filename
 
-    async def generate_hakka_audio(self, hakka_text: str, romanization: str = "", speaker: str = "", segment_index: int = None, script_name: str = "") -> Dict[str, Any]:
+    async def generate_hakka_audio(self, hakka_text: str, romanization: str = "", speaker: str = "", segment_index: int = None, script_name: str = "", output_dir: Optional[Path] = None) -> Dict[str, Any]:
         """
         Generate audio from Hakka text using Hakka AI TTS service
         
@@ -292,14 +296,14 @@ class TTSService:
             speaker: Speaker ID for filename generation
             segment_index: Segment index within the script for filename ordering
             script_name: Script name for grouping related audio files
+            output_dir: Directory to write the audio to (defaults to static/audio)
             
         Returns:
             Dict containing audio file path and metadata
         """
         try:
-            # Ensure we're authenticated
-            if not self.headers:
-                await self.login()
+            # Ensure we're authenticated (shared token, no request unless it expired)
+            await self.login()
             
             # 優先使用羅馬拼音，因為客語TTS引擎對羅馬拼音支持更好
             if romanization and romanization.strip():
@@ -334,7 +338,8 @@ class TTSService:
             # 生成可讀性好的檔名
             audio_filename = self._generate_readable_filename(hakka_text, speaker, None, script_name, segment_index)
             audio_id = audio_filename.replace('.wav', '')  # 用檔名作為 ID
-            audio_path = self.audio_dir / audio_filename
+            audio_dir = Path(output_dir) if output_dir else self.audio_dir
+            audio_path = audio_dir / audio_filename
             
             # Get available models
             models = await self.get_models()
@@ -428,6 +433,9 @@ class TTSService:
                     )
                     
             if response.status_code != 200:
+                if response.status_code == 401:
+                    # 共用 token 被拒，下一次請求重新登入
+                    hakka_auth.invalidate(self.base_url, self.username)
                 logger.error(f"TTS synthesis failed: {response.status_code} {response.text}")
                 return None
             
@@ -443,7 +451,7 @@ class TTSService:
             return {
                 "audio_id": audio_id,
                 "audio_path": str(audio_path),
-                "audio_url": f"/static/audio/{audio_filename}",
+                "audio_url": f"/static/audio/{audio_filename}" if audio_dir == self.audio_dir else None,
                 "duration": int(duration),
                 "text": hakka_text,
                 "romanization": romanization,
@@ -560,63 +568,69 @@ class TTSService:
     #         logger.error(f"Segmented TTS generation failed: {e}")
     #         return await self._generate_fallback_audio(hakka_text, romanization, speaker, segment_index, script_name)
 
+    async def _convert_wav(self, path: str, output_path: str, wav_format: WavFormat):
+        """Convert an audio file to the given PCM WAV format with FFmpeg; raises MediaToolError on failure"""
+        codec = {1: "pcm_u8", 2: "pcm_s16le", 3: "pcm_s24le", 4: "pcm_s32le"}.get(wav_format.sample_width)
+        if codec is None:
+            raise WavFormatError(f"Unsupported sample width: {wav_format.sample_width}")
+        await media_runner.ffmpeg([
+            "-y", "-i", str(path),
+            "-ar", str(wav_format.sample_rate), "-ac", str(wav_format.channels), "-c:a", codec,
+            str(output_path)
+        ], check=True)
+
     async def _merge_audio_files(self, audio_paths, output_path):
-        """合併音檔並回傳是否成功"""
-        import wave
+        """合併音檔並回傳是否成功（串流寫入，不將所有音訊讀入記憶體）
+
+        格式（取樣率、聲道、位元深度）與第一個音檔不同的段落先用 FFmpeg 轉成相同格式；
+        轉檔失敗則整個合併失敗，不會默默少掉段落。
+        """
+        temp_paths = []
         try:
-            data = []
+            # 檢查所有音檔是否存在並讀取格式
+            existing = []
             params = None
-            
-            # 檢查所有音檔是否存在
-            valid_paths = []
             for path in audio_paths:
                 if not os.path.exists(path):
                     logger.warning(f"Audio file not found: {path}")
                     continue
-                valid_paths.append(path)
-            
-            if not valid_paths:
+                try:
+                    info = read_wav_info(path)
+                except (WavFormatError, OSError, struct.error) as e:
+                    # 截斷或損壞的音檔與格式不一致的段落一樣交給 FFmpeg 轉檔
+                    logger.warning(f"無法讀取音檔格式，將嘗試轉檔: {path}, 錯誤: {e}")
+                    info = None
+                if params is None and info is not None:
+                    params = info.format
+                    logger.info(f"音檔參數: {params}")
+                existing.append((path, info))
+            
+            if params is None:
                 logger.error("沒有可合併的音檔")
                 return False
             
-            # 讀取並合併音檔
-            for path in valid_paths:
+            valid_paths = []
+            for i, (path, info) in enumerate(existing):
+                if info is not None and info.format == params:
+                    valid_paths.append(path)
+                    continue
+                converted = str(Path(output_path).with_name(f"{Path(output_path).stem}_conformed_{i:03d}.wav"))
+                temp_paths.append(converted)
+                logger.info(f"音檔參數不一致，轉檔: {path} (預期: {params}, 實際: {info.format if info else '未知'})")
                 try:
-                    with wave.open(path, 'rb') as wf:
-                        if params is None:
-                            params = wf.getparams()
-                            logger.info(f"音檔參數: {params}")
-                        
-                        # 檢查音檔參數是否一致
-                        current_params = wf.getparams()
-                        if (current_params.nchannels != params.nchannels or 
-                            current_params.sampwidth != params.sampwidth or 
-                            current_params.framerate != params.framerate):
-                            logger.warning(f"音檔參數不一致: {path}")
-                            logger.warning(f"預期: {params}")
-                            logger.warning(f"實際: {current_params}")
-                        
-                        frame_data = wf.readframes(wf.getnframes())
-                        data.append(frame_data)
-                        logger.info(f"成功讀取音檔: {path} ({len(frame_data)} bytes)")
+                    await self._convert_wav(path, converted, params)
                 except Exception as e:
-                    logger.error(f"讀取音檔失敗: {path}, 錯誤: {e}")
-                    continue
+                    logger.error(f"音檔轉檔失敗，取消合併: {path}, 錯誤: {e}")
+                    return False
+                valid_paths.append(converted)
             
-            if not data:
-                logger.error("沒有成功讀取任何音檔數據")
+            if not valid_paths:
+                logger.error("沒有可合併的音檔")
                 return False
             
-            # 寫入合併後的音檔
-            with wave.open(output_path, 'wb') as out:
-                out.setparams(params)
-                total_bytes = 0
-                for d in data:
-                    out.writeframes(d)
-                    total_bytes += len(d)
-                
-                logger.info(f"合併音檔成功: {output_path}")
-                logger.info(f"總共寫入 {total_bytes} bytes")
+            result = await asyncio.to_thread(concat_wav_files, valid_paths, output_path, params)
+            logger.info(f"合併音檔成功: {output_path}")
+            logger.info(f"總共寫入 {result.total_frames * params.frame_size} bytes")
             
             # 驗證輸出檔案
             if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
@@ -629,6 +643,9 @@ class TTSService:
         except Exception as e:
             logger.error(f"音檔合併過程發生錯誤: {e}")
             return False
+        finally:
+            for path in temp_paths:
+                Path(path).unlink(missing_ok=True)
 
     # async def _generate_single_segment_audio(self, romanization: str, output_path: str, speaker: str = "") -> bool:
     #     """生成單個羅馬拼音片段的音檔
@@ -774,8 +791,9 @@ class TTSService:
     
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the HTTP client (the shared pooled client stays open until app shutdown)"""
+        if not http_clients.is_shared(self.client):
+            await self.client.aclose()
 
     # Gemini TTS integration
     async def generate_gemini_tts(self, text: str, output_path: str, voice: str = "gemini_zephyr") -> str:
@@ -790,8 +808,11 @@ class TTSService:
             voice_name = "Zephyr"  # Female voice (default)
         
         prompt = "Instruction: Read in a standard Taiwanese Mandarin accent. The delivery should have a relatively flat intonation, avoiding dramatic pitch fluctuations or overly formal, enunciated pronunciation. The speaking style should be soft, gentle, and friendly, with a warm and polite tone. The pronunciation should feature less distinct retroflex sounds:\n"
-        client = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
+        # google-genai 匯入很慢，只在真的用到 Gemini TTS 時才載入
+        from google.genai import types
+        client = gemini_client(api_key)
+        # Async client so concurrent segments do not block the event loop
+        response = await client.aio.models.generate_content(
             model="gemini-2.5-flash-preview-tts",
             contents=prompt + text,
             config=types.GenerateContentConfig(
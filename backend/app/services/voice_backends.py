@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.telemetry import upstream, record_items
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceBackendError(Exception):
+    """Raised when a voice backend cannot synthesize a segment"""
+
+
+class SynthesisRequest(NamedTuple):
+    index: int
+    voice: str
+    text: str           # Chinese text
+    hakka_text: str
+    romanization: str
+    output_path: Path   # WAV written by the backend
+
+
+class SynthesisResult(NamedTuple):
+    request: SynthesisRequest
+    backend: str
+    path: Optional[Path] = None
+    error: Optional[str] = None
+
+
+class RateLimiter:
+    """Spaces calls evenly so at most requests_per_minute start per minute"""
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class VoiceBackend:
+    """Base class of a TTS engine
+
+    Subclasses declare their throughput policy (concurrency, rate limit, batching) and
+    native sample rate, and implement synthesize(); run() applies the policy.
+    """
+
+    name = "base"
+    max_concurrency = 1
+    requests_per_minute: Optional[int] = None
+    supports_batching = False
+    max_batch_size = 1
+    native_sample_rate: Optional[int] = None  # None: varies, conformed after synthesis
+
+    def __init__(self, max_concurrency: Optional[int] = None, requests_per_minute: Optional[int] = None):
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        if requests_per_minute is not None:
+            self.requests_per_minute = requests_per_minute or None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._limiter = RateLimiter(self.requests_per_minute) if self.requests_per_minute else None
+
+    def handles(self, voice: str) -> bool:
+        raise NotImplementedError
+
+    async def synthesize(self, request: SynthesisRequest) -> Path:
+        """Synthesize one segment to request.output_path"""
+        raise NotImplementedError
+
+    async def synthesize_batch(self, requests: List[SynthesisRequest]) -> List[Path]:
+        """Synthesize several segments in one upstream call (batching backends override this)"""
+        return [await self.synthesize(request) for request in requests]
+
+    async def run(self, requests: List[SynthesisRequest]) -> List[SynthesisResult]:
+        """Synthesize a single request or a batch under this backend's concurrency and rate limits"""
+        async with self._semaphore:
+            if self._limiter:
+                await self._limiter.acquire()
+            with upstream(self.name, "synthesize", segments=len(requests)) as outcome:
+                try:
+                    if len(requests) == 1:
+                        paths = [await self.synthesize(requests[0])]
+                    else:
+                        paths = await self.synthesize_batch(requests)
+                except Exception as e:
+                    logger.warning(f"{self.name} synthesis failed for segments {[r.index for r in requests]}: {e}")
+                    outcome.fail(type(e).__name__)
+                    return [SynthesisResult(request, self.name, error=str(e)) for request in requests]
+        record_items("tts_segments", len(requests))
+        return [SynthesisResult(request, self.name, path=path) for request, path in zip(requests, paths)]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "supports_batching": self.supports_batching,
+            "max_batch_size": self.max_batch_size,
+            "native_sample_rate": self.native_sample_rate,
+        }
+
+
+class HakkaTTSBackend(VoiceBackend):
+    """Hakka AI Hackathon TTS (hak-* voices); speaks the Hakka text or its romanization"""
+
+    name = "hakka_tts"
+
+    def __init__(self, tts_service, **kwargs):
+        super().__init__(**kwargs)
+        self.tts_service = tts_service
+        self._login_lock = asyncio.Lock()
+
+    def handles(self, voice: str) -> bool:
+        return voice.startswith("hak-")
+
+    async def _ensure_login(self):
+        async with self._login_lock:
+            if not self.tts_service.headers and not await self.tts_service.login():
+                raise VoiceBackendError("Hakka TTS login failed")
+
+    async def synthesize(self, request: SynthesisRequest) -> Path:
+        if not (request.hakka_text or "").strip():
+            raise VoiceBackendError(f"Segment {request.index} has no hakka_text")
+        await self._ensure_login()
+        result = await self.tts_service.generate_hakka_audio(
+            hakka_text=request.hakka_text,
+            romanization=request.romanization,
+            speaker=request.voice,
+            segment_index=request.index,
+            script_name=request.output_path.stem,
+            output_dir=request.output_path.parent
+        )
+        if not isinstance(result, dict) or not result.get("audio_path"):
+            raise VoiceBackendError(f"Hakka TTS returned no audio: {result}")
+        os.replace(result["audio_path"], request.output_path)
+        return request.output_path
+
+
+class GeminiTTSBackend(VoiceBackend):
+    """Gemini TTS (gemini_* voices); speaks the Chinese text"""
+
+    name = "gemini_tts"
+    native_sample_rate = 24000
+
+    def __init__(self, tts_service, **kwargs):
+        super().__init__(**kwargs)
+        self.tts_service = tts_service
+
+    def handles(self, voice: str) -> bool:
+        return voice.startswith("gemini_")
+
+    async def synthesize(self, request: SynthesisRequest) -> Path:
+        if not (request.text or "").strip():
+            raise VoiceBackendError(f"Segment {request.index} has no text")
+        await self.tts_service.generate_gemini_tts(request.text, str(request.output_path), request.voice)
+        return request.output_path
+
+
+class VoiceBackendRegistry:
+    """Routes voices to backends and dispatches segments through them concurrently"""
+
+    def __init__(self):
+        self._backends: List[VoiceBackend] = []
+
+    def register(self, backend: VoiceBackend) -> VoiceBackend:
+        self._backends.append(backend)
+        return backend
+
+    def for_voice(self, voice: str) -> VoiceBackend:
+        for backend in self._backends:
+            if backend.handles(voice):
+                return backend
+        raise VoiceBackendError(f"No voice backend for voice: {voice}")
+
+    async def dispatch(self, requests: List[SynthesisRequest], on_result: Optional[Callable[[SynthesisResult], Awaitable[None]]] = None) -> List[SynthesisResult]:
+        """Synthesize all requests; results come back in request order
+
+        Each backend gets its own concurrent work items (batches for batching backends),
+        throttled by that backend's semaphore and rate limiter. on_result, if given, is
+        awaited for every result as soon as its work item finishes (e.g. to checkpoint it).
+        """
+        results: Dict[int, SynthesisResult] = {}
+        groups: Dict[str, List[SynthesisRequest]] = {}
+        backends: Dict[str, VoiceBackend] = {}
+        for position, request in enumerate(requests):
+            try:
+                backend = self.for_voice(request.voice)
+            except VoiceBackendError as e:
+                results[position] = SynthesisResult(request, "none", error=str(e))
+                continue
+            groups.setdefault(backend.name, []).append(request)
+            backends[backend.name] = backend
+
+        if on_result:
+            for result in list(results.values()):
+                await on_result(result)
+
+        async def _run(item) -> List[SynthesisResult]:
+            batch = await item
+            if on_result:
+                for result in batch:
+                    await on_result(result)
+            return batch
+
+        work = []
+        for name, group in groups.items():
+            backend = backends[name]
+            size = backend.max_batch_size if backend.supports_batching else 1
+            work.extend(_run(backend.run(group[i:i + size])) for i in range(0, len(group), size))
+
+        positions = {id(request): position for position, request in enumerate(requests)}
+        for batch in await asyncio.gather(*work):
+            for result in batch:
+                results[positions[id(result.request)]] = result
+        return [results[position] for position in range(len(requests))]
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [backend.status() for backend in self._backends]
+
+
+def create_voice_registry(tts_service) -> VoiceBackendRegistry:
+    """Registry with the built-in engines, throughput policies taken from settings"""
+    registry = VoiceBackendRegistry()
+    registry.register(HakkaTTSBackend(
+        tts_service,
+        max_concurrency=settings.HAKKA_TTS_CONCURRENCY,
+        requests_per_minute=settings.HAKKA_TTS_RPM
+    ))
+    registry.register(GeminiTTSBackend(
+        tts_service,
+        max_concurrency=settings.GEMINI_TTS_CONCURRENCY,
+        requests_per_minute=settings.GEMINI_TTS_RPM
+    ))
+    return registry
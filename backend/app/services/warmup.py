@@ -0,0 +1,129 @@
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Step = Tuple[str, Callable[[], Awaitable[Optional[str]]]]
+
+
+class Warmup:
+    """Optional startup warm-up, so the first generation sees steady-state latency
+
+    Runs in the background after startup (GET /health answers immediately, GET /ready
+    once this has finished): Hakka API logins through the shared token broker, the TTS
+    voice catalog, the pooled connections those requests open, the shared PodcastService
+    with its LLM agents, the Gemini SDK client, and the crawler's browser. Steps run concurrently, each bounded by
+    WARMUP_TIMEOUT_S. A failed step is reported but does not hold back readiness; the
+    request path still does that work lazily.
+    """
+
+    def __init__(self):
+        self.state = "pending"
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.duration_s: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("done", "disabled")
+
+    def start(self):
+        if not settings.WARMUP_ENABLED:
+            self.state = "disabled"
+            return
+        self.state = "running"
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _plan(self) -> List[Step]:
+        steps: List[Step] = []
+        if settings.HAKKA_USERNAME and settings.HAKKA_PASSWORD:
+            steps += [("hakka_tts", self._hakka_tts), ("hakka_mt", self._hakka_mt)]
+        else:
+            self.steps["hakka"] = {"status": "skipped", "detail": "HAKKA_USERNAME / HAKKA_PASSWORD not set"}
+        steps.append(("llm", self._llm))
+        if settings.GEMINI_API_KEY:
+            steps.append(("gemini_tts", self._gemini_tts))
+        if settings.WARMUP_CRAWLER:
+            steps.append(("crawler", self._crawler))
+        return steps
+
+    async def run(self):
+        start = time.perf_counter()
+        await asyncio.gather(*(self._step(name, fn) for name, fn in self._plan()))
+        self.duration_s = round(time.perf_counter() - start, 3)
+        self.state = "done"
+        failed = [name for name, step in self.steps.items() if step["status"] == "error"]
+        logger.info(f"Warm-up finished in {self.duration_s:.1f}s" + (f", failed: {', '.join(failed)}" if failed else ""))
+
+    async def _step(self, name: str, fn: Callable[[], Awaitable[Optional[str]]]):
+        self.steps[name] = {"status": "running"}
+        start = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(fn(), timeout=settings.WARMUP_TIMEOUT_S)
+            self.steps[name] = {"status": "ok", "detail": detail}
+        except asyncio.TimeoutError:
+            self.steps[name] = {"status": "error", "detail": f"timed out after {settings.WARMUP_TIMEOUT_S:.0f}s"}
+        except Exception as e:
+            self.steps[name] = {"status": "error", "detail": str(e)}
+            logger.warning(f"Warm-up step {name} failed: {e}")
+        self.steps[name]["duration_s"] = round(time.perf_counter() - start, 3)
+
+    async def _hakka_tts(self) -> str:
+        from app.services.tts_service import TTSService
+        tts = TTSService()
+        if not await tts.login():
+            raise RuntimeError("Hakka TTS login failed")
+        models = await tts.get_models()
+        if not models:
+            raise RuntimeError("voice catalog unavailable")
+        return f"{len(models.get('data', []))} voice models"
+
+    async def _hakka_mt(self) -> str:
+        from app.services.translation_service import TranslationService
+        if not await TranslationService().login():
+            raise RuntimeError("Hakka translation login failed")
+        return "authenticated"
+
+    async def _llm(self) -> str:
+        # SDK imports are slow and synchronous: run them off the event loop
+        await asyncio.to_thread(importlib.import_module, "pydantic_ai.models.gemini")
+        await asyncio.to_thread(importlib.import_module, "pydantic_ai.models.openai")
+        # Build the agents on the PodcastService the routes share, not on a throwaway instance
+        from app.routers.podcasts import get_podcast_service
+        routes = get_podcast_service().ai_service.agent_service.model_routes
+        return ", ".join(name for name, _ in routes["dialogue"]) or "no models configured"
+
+    async def _gemini_tts(self) -> str:
+        from app.services.tts_service import gemini_client
+        await asyncio.to_thread(gemini_client, settings.GEMINI_API_KEY)
+        return "client ready"
+
+    async def _crawler(self) -> str:
+        from app.services.crawl4ai_service import get_crawler
+        await asyncio.to_thread(importlib.import_module, "crawl4ai")
+        await get_crawler()
+        return "browser launched"
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "warmup": self.state,
+            "duration_s": self.duration_s,
+            "steps": self.steps,
+        }
+
+
+warmup = Warmup()
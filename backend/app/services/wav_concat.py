@@ -0,0 +1,182 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+PathLike = Union[str, Path]
+
+# 4 MiB sequential writes keep syscalls low without holding whole segments in memory
+WRITE_CHUNK_BYTES = 4 * 1024 * 1024
+WAV_HEADER_BYTES = 44
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavFormatError(Exception):
+    """Raised when a file is not a PCM WAV or does not match the output format"""
+
+
+class WavFormat(NamedTuple):
+    channels: int
+    sample_width: int  # bytes per sample
+    sample_rate: int
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+
+class WavInfo(NamedTuple):
+    format: WavFormat
+    data_offset: int
+    data_size: int
+
+    @property
+    def frames(self) -> int:
+        return self.data_size // self.format.frame_size
+
+
+class ConcatResult(NamedTuple):
+    format: WavFormat
+    total_frames: int
+    segment_frames: List[int]
+    segment_offsets: List[int]  # first output frame of each segment
+
+    @property
+    def duration(self) -> float:
+        return self.total_frames / self.format.sample_rate
+
+
+def read_wav_info(path: PathLike) -> WavInfo:
+    """Parse RIFF chunks to find the PCM format and the data chunk location"""
+    path = Path(path)
+    file_size = path.stat().st_size
+    with open(path, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise WavFormatError(f"Not a RIFF/WAVE file: {path}")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(chunk_size)
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if audio_format == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    audio_format = struct.unpack("<H", body[24:26])[0]
+                if audio_format != WAVE_FORMAT_PCM:
+                    raise WavFormatError(f"Unsupported WAV encoding {audio_format:#x}: {path}")
+                fmt = WavFormat(channels, bits // 8, sample_rate)
+                if chunk_size % 2:
+                    f.seek(1, 1)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise WavFormatError(f"data chunk before fmt chunk: {path}")
+                data_offset = f.tell()
+                # Streamed WAVs may leave the size as 0 or 0xFFFFFFFF; trust the file length then
+                available = file_size - data_offset
+                data_size = chunk_size if 0 < chunk_size <= available else available
+                data_size -= data_size % fmt.frame_size
+                return WavInfo(fmt, data_offset, data_size)
+            else:
+                f.seek(chunk_size + (chunk_size % 2), 1)
+
+    raise WavFormatError(f"No data chunk found: {path}")
+
+
+class WavConcatWriter:
+    """Streaming PCM WAV writer
+
+    Writes a single RIFF header with placeholder sizes, appends frames with large
+    sequential writes and patches the RIFF/data sizes on close, so memory use does
+    not grow with the episode length.
+    """
+
+    def __init__(self, output_path: PathLike, wav_format: WavFormat):
+        self.output_path = Path(output_path)
+        self.format = wav_format
+        self.data_bytes = 0
+        self._file = open(self.output_path, "wb")
+        self._write_header(0)
+
+    def _write_header(self, data_size: int):
+        fmt = self.format
+        self._file.write(struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + data_size, b"WAVE",
+            b"fmt ", 16, WAVE_FORMAT_PCM, fmt.channels, fmt.sample_rate,
+            fmt.sample_rate * fmt.frame_size, fmt.frame_size, fmt.sample_width * 8,
+            b"data", data_size
+        ))
+
+    def write_frames(self, data) -> int:
+        """Append raw PCM frames (bytes, bytearray or memoryview)"""
+        self._file.write(data)
+        self.data_bytes += len(data)
+        return len(data) // self.format.frame_size
+
+    def append_file(self, path: PathLike, info: Optional[WavInfo] = None) -> int:
+        """Stream a WAV file's frames from a memory map; returns the number of frames written"""
+        info = info or read_wav_info(path)
+        if info.format != self.format:
+            raise WavFormatError(f"{path} is {info.format}, expected {self.format}")
+        if info.data_size == 0:
+            return 0
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                end = info.data_offset + info.data_size
+                for start in range(info.data_offset, end, WRITE_CHUNK_BYTES):
+                    self._file.write(view[start:min(start + WRITE_CHUNK_BYTES, end)])
+            finally:
+                view.release()
+        self.data_bytes += info.data_size
+        return info.frames
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.data_bytes > 0xFFFFFFFF - 36:
+            self._file.close()
+            raise WavFormatError("Output exceeds the 4 GiB RIFF size limit")
+        # Patch RIFF and data chunk sizes now that the length is known
+        self._file.seek(4)
+        self._file.write(struct.pack("<I", 36 + self.data_bytes))
+        self._file.seek(40)
+        self._file.write(struct.pack("<I", self.data_bytes))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def concat_wav_files(paths: List[PathLike], output_path: PathLike, wav_format: Optional[WavFormat] = None) -> ConcatResult:
+    """Concatenate same-format PCM WAV files without decoding or re-encoding
+
+    Raises WavFormatError if any file does not match wav_format (defaults to the
+    format of the first file); callers convert mismatched segments first.
+    """
+    if not paths:
+        raise ValueError("No audio files to concatenate")
+
+    infos = [read_wav_info(path) for path in paths]
+    wav_format = wav_format or infos[0].format
+    for path, info in zip(paths, infos):
+        if info.format != wav_format:
+            raise WavFormatError(f"{path} is {info.format}, expected {wav_format}")
+
+    segment_frames = []
+    segment_offsets = []
+    with WavConcatWriter(output_path, wav_format) as writer:
+        for path, info in zip(paths, infos):
+            segment_offsets.append(sum(segment_frames))
+            segment_frames.append(writer.append_file(path, info))
+
+    return ConcatResult(wav_format, sum(segment_frames), segment_frames, segment_offsets)
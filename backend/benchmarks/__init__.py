@@ -0,0 +1 @@
+"""Micro-benchmarks for the CPU-bound hot paths; run with `python -m benchmarks` from backend/"""
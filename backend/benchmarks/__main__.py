@@ -0,0 +1,70 @@
+"""Run the micro-benchmarks and compare them with the stored baseline
+
+    cd backend
+    python -m benchmarks                      # run all, compare with benchmarks/baseline.json
+    python -m benchmarks -k translation       # only benchmarks whose name contains "translation"
+    python -m benchmarks --output result.json # also write the machine-readable results
+    python -m benchmarks --save-baseline      # record the current numbers as the new baseline
+
+Exits with status 1 when a benchmark is slower than its baseline by more than
+--tolerance (default 25%), so it can gate CI on a fixed runner.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks import bench_text, bench_audio, bench_rss  # noqa: E402,F401  (register benchmarks)
+from benchmarks.harness import BENCHMARKS, compare, load_json, run_benchmarks, save_json  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Hakkast hot-path micro-benchmarks")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline")
+    parser.add_argument("--output", type=Path, help="write the results (and comparison) as JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio before failing")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    selected = [b for b in BENCHMARKS if args.filter in b.name]
+    if args.list:
+        print("\n".join(b.name for b in selected))
+        return 0
+
+    report = run_benchmarks(selected, min_time=args.min_time, repeats=args.repeats)
+
+    regressed = []
+    baseline = load_json(args.baseline)
+    if baseline and not args.save_baseline:
+        report["comparison"] = compare(report, baseline, args.tolerance)
+        regressed = [row for row in report["comparison"] if row["status"] == "regressed"]
+        for row in report["comparison"]:
+            ratio = f"x{row['ratio']:.2f}" if "ratio" in row else ""
+            print(f"{row['status']:>13}  {row['name']:<40} {ratio}", file=sys.stderr)
+
+    if args.output:
+        save_json(args.output, report)
+    if args.save_baseline:
+        save_json(args.baseline, {"environment": report["environment"], "results": report["results"]})
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    if not args.output:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed by more than {args.tolerance:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
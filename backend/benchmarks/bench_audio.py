@@ -0,0 +1,58 @@
+"""Final episode merge on synthetic segments sized like the sample scripts"""
+import atexit
+import shutil
+import tempfile
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks import corpus
+from benchmarks.harness import Workload, benchmark
+
+SAMPLE_RATE = 44100
+SECONDS_PER_CHAR = 0.25  # roughly the TTS speaking rate
+
+
+def _segments():
+    """One mono 16-bit WAV per script line: a voiced tone with silent edges, like TTS output"""
+    tmp_dir = Path(tempfile.mkdtemp(prefix="hakkast_bench_"))
+    atexit.register(shutil.rmtree, tmp_dir, True)
+    rng = np.random.default_rng(0)
+    paths, speakers = [], []
+    for i, line in enumerate(corpus.script_lines()):
+        seconds = min(max(len(line["hakka_text"] or line["text"]) * SECONDS_PER_CHAR, 1.0), 30.0)
+        frames = int(seconds * SAMPLE_RATE)
+        t = np.arange(frames) / SAMPLE_RATE
+        voiced = 0.3 * np.sin(2 * np.pi * (140 + 60 * (i % 2)) * t) + 0.02 * rng.standard_normal(frames)
+        edge = int(0.15 * SAMPLE_RATE)
+        voiced[:edge] = 0
+        voiced[-edge:] = 0
+        path = tmp_dir / f"segment_{i:03d}.wav"
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(SAMPLE_RATE)
+            wf.writeframes((voiced * 32767).astype("<i2").tobytes())
+        paths.append(path)
+        speakers.append(line["speaker"])
+    return tmp_dir, paths, speakers
+
+
+@benchmark("audio.concat_wav_files")
+def bench_concat():
+    from app.services.wav_concat import concat_wav_files
+    tmp_dir, paths, _ = _segments()
+    output = tmp_dir / "final.wav"
+    return Workload(lambda: concat_wav_files(paths, output), {"segments": len(paths)})
+
+
+@benchmark("audio.postprocess_concat")
+def bench_postprocess_concat():
+    from app.services.audio_postprocess import PostProcessOptions, postprocess_concat
+    from app.services.wav_concat import read_wav_info
+    tmp_dir, paths, speakers = _segments()
+    output = tmp_dir / "final_postprocessed.wav"
+    wav_format = read_wav_info(paths[0]).format
+    options = PostProcessOptions()
+    return Workload(lambda: postprocess_concat(paths, output, wav_format, speakers, options), {"segments": len(paths)})
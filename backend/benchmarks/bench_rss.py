@@ -0,0 +1,52 @@
+"""RSS feed rendering for a subscription with a month of daily episodes"""
+from datetime import datetime, timedelta
+
+from benchmarks import corpus
+from benchmarks.harness import Workload, benchmark
+
+EPISODES = 30
+
+
+@benchmark("subscription.generate_rss_xml")
+def bench_rss():
+    from app.models.podcast import AudioRendition
+    from app.models.subscription import (
+        LanguageMode, PodcastEpisode, Subscription, SubscriptionFrequency, SubscriptionPreferences, ToneStyle
+    )
+    from app.services.subscription_service import SubscriptionService
+
+    # Feed rendering only needs settings; skip __init__ (no AI/podcast services)
+    service = SubscriptionService.__new__(SubscriptionService)
+    subscription = Subscription(
+        id="bench",
+        email="listener@example.com",
+        frequency=SubscriptionFrequency.DAILY,
+        topics=["research_deep_learning"],
+        language=LanguageMode.BILINGUAL,
+        tone=ToneStyle.CASUAL,
+        created_at=datetime(2025, 8, 1),
+        preferences=SubscriptionPreferences(delivery_time="08:00"),
+        rss_token="token",
+    )
+    lines = corpus.script_lines()
+    hakka = "\n".join(line["hakka_text"] for line in lines)
+    chinese = "\n".join(line["text"] for line in lines)
+    episodes = []
+    for i in range(EPISODES):
+        stem = f"/static/audio/podcast_{i:03d}_final"
+        episodes.append(PodcastEpisode(
+            id=f"episode-{i}",
+            title=f"Hakkast 哈客播新聞討論 #{i + 1}",
+            description=chinese[:200],
+            audio_url=f"{stem}.wav",
+            published_at=datetime(2025, 8, 1) + timedelta(days=i),
+            duration=600,
+            topics=["research_deep_learning"],
+            hakka_content=hakka,
+            chinese_content=chinese,
+            renditions=[
+                AudioRendition(format="opus", url=f"{stem}.opus", mimeType="audio/ogg; codecs=opus", bitrateKbps=32, sizeBytes=2_400_000),
+                AudioRendition(format="mp3", url=f"{stem}.mp3", mimeType="audio/mpeg", bitrateKbps=64, sizeBytes=4_800_000),
+            ],
+        ))
+    return Workload(lambda: service._generate_rss_xml(subscription, episodes), {"episodes": EPISODES})
@@ -0,0 +1,91 @@
+"""Per-line text processing: translation fallbacks, romanization, cleaning, splitting, context trimming"""
+from benchmarks import corpus
+from benchmarks.harness import Workload, benchmark
+
+
+def _translation_service():
+    from app.services.translation_service import TranslationService
+    # Only the pure text helpers are exercised; skip __init__ (no HTTP client needed)
+    return TranslationService.__new__(TranslationService)
+
+
+def _tts_service():
+    from app.services.tts_service import TTSService
+    return TTSService.__new__(TTSService)
+
+
+@benchmark("translation.mock_translate_to_hakka")
+def bench_mock_translate():
+    service = _translation_service()
+    texts = corpus.chinese_texts()
+    return Workload(lambda: [service._mock_translate_to_hakka(t) for t in texts], {"lines": len(texts)})
+
+
+@benchmark("translation.generate_romanization")
+def bench_generate_romanization():
+    service = _translation_service()
+    texts = corpus.hakka_texts()
+    return Workload(lambda: [service._generate_romanization(t) for t in texts], {"lines": len(texts)})
+
+
+@benchmark("translation.generate_tone_symbol_romanization")
+def bench_tone_symbol_romanization():
+    service = _translation_service()
+    texts = corpus.hakka_texts()
+    return Workload(lambda: [service._generate_tone_symbol_romanization(t) for t in texts], {"lines": len(texts)})
+
+
+@benchmark("tts.clean_hakka_text")
+def bench_clean_hakka_text():
+    service = _tts_service()
+    texts = corpus.hakka_texts()
+    return Workload(lambda: [service._clean_hakka_text(t) for t in texts], {"lines": len(texts)})
+
+
+@benchmark("tts.clean_romanization")
+def bench_clean_romanization():
+    service = _tts_service()
+    texts = corpus.romanizations()
+    return Workload(lambda: [service._clean_romanization(t) for t in texts], {"lines": len(texts)})
+
+
+@benchmark("podcast.split_long_text")
+def bench_split_long_text():
+    from app.services.podcast_service import PodcastService
+    service = PodcastService.__new__(PodcastService)
+    pairs = [(line["hakka_text"], line["romanization"]) for line in corpus.script_lines() if line["hakka_text"]]
+    return Workload(lambda: [service.split_long_text(h, r) for h, r in pairs], {"lines": len(pairs)})
+
+
+@benchmark("ai.context_window")
+def bench_context_window():
+    from app.services.ai_service import CONTEXT_TURNS, CONTEXT_WINDOW_TOKENS
+    from app.services.context_window import ContextWindow
+    context = corpus.dialogue_context()
+
+    def run():
+        # The dialogue loop appends one line and renders the prompt view once per turn
+        window = ContextWindow(CONTEXT_WINDOW_TOKENS, max_lines=CONTEXT_TURNS)
+        for line in context:
+            window.append(line)
+            window.text(CONTEXT_WINDOW_TOKENS - 200)
+
+    return Workload(run, {"turns": len(context)})
+
+
+@benchmark("glossary.match")
+def bench_glossary_match():
+    from app.services.glossary import AhoCorasick, normalize
+    # A grown glossary of technical terms, matched against script lines sprinkled with English
+    terms = [normalize(f"{word} model {i}") for i, word in enumerate(["transformer", "diffusion", "agent", "token"] * 125)]
+    terms += ["openai", "gpt-4o", "google deepmind", "large language model", "ai"]
+    matcher = AhoCorasick(terms)
+    lines = [f"{text} OpenAI 的 GPT-4o 和 large language model 與 diffusion model 12 AI" for text in corpus.chinese_texts()]
+    return Workload(lambda: [matcher.matches(line.lower()) for line in lines], {"lines": len(lines), "terms": len(terms)})
+
+
+@benchmark("crawl.clean_markdown")
+def bench_clean_markdown():
+    from app.services.crawl4ai_service import clean_markdown
+    article = corpus.MARKDOWN_ARTICLE * 20
+    return Workload(lambda: clean_markdown(article), {"chars": len(article)})
@@ -0,0 +1,64 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = BACKEND_DIR / "json"
+
+
+@lru_cache(maxsize=None)
+def script_lines() -> List[Dict[str, str]]:
+    """Every dialogue line of the sample scripts in backend/json/, in file order"""
+    lines = []
+    for path in sorted(SCRIPTS_DIR.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            script = json.load(f)
+        for item in script.get("content", []):
+            lines.append({
+                "speaker": item.get("speaker", ""),
+                "text": item.get("text", ""),
+                "hakka_text": item.get("hakka_text", ""),
+                "romanization": item.get("romanization", ""),
+            })
+    if not lines:
+        raise FileNotFoundError(f"No sample scripts found in {SCRIPTS_DIR}")
+    return lines
+
+
+def chinese_texts() -> List[str]:
+    return [line["text"] for line in script_lines() if line["text"]]
+
+
+def hakka_texts() -> List[str]:
+    return [line["hakka_text"] for line in script_lines() if line["hakka_text"]]
+
+
+def romanizations() -> List[str]:
+    return [line["romanization"] for line in script_lines() if line["romanization"]]
+
+
+def dialogue_context() -> List[str]:
+    """The script as the "speaker: text" context list the dialogue agents trim"""
+    return [f"{line['speaker']}: {line['text']}" for line in script_lines()]
+
+
+MARKDOWN_ARTICLE = """# 研究人員提出新的半物理機制
+
+![cover](https://example.com/cover.png)
+
+最近有[研究團隊](https://example.com/team)提出「半物理」機制，讓現有的**三維模型**能真正融入物理互動。
+
+## 方法
+
+- 保持動作自然
+- 避免穿透，而且是 *即時*、免訓練的
+- 程式碼：[GitHub](https://github.com/example/repo)
+
+> 這項技術最厲害的地方在於它不需要重新訓練。
+
+| 模型 | 穿透率 |
+| --- | --- |
+| 基準 | 12% |
+| 本研究 | 1% |
+"""
@@ -0,0 +1,145 @@
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# A benchmark factory does its setup and returns the callable to time, plus a
+# description of the work done per call (e.g. {"lines": 35}).
+Factory = Callable[[], "Workload"]
+
+
+class Workload(NamedTuple):
+    run: Callable[[], Any]
+    size: Dict[str, int]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    factory: Factory
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str):
+    """Register a benchmark factory under a dotted name"""
+    def register(factory: Factory) -> Factory:
+        BENCHMARKS.append(Benchmark(name, factory))
+        return factory
+    return register
+
+
+def measure(workload: Workload, min_time: float = 0.2, repeats: int = 5) -> Dict[str, Any]:
+    """Time a workload: calibrate loops to ~min_time per repeat, report per-call stats in microseconds"""
+    run = workload.run
+    run()  # warm caches (regex compilation, lru_cache, page cache)
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - start) / loops)
+
+    median = statistics.median(samples)
+    return {
+        "loops": loops,
+        "repeats": repeats,
+        "min_us": round(min(samples) * 1e6, 3),
+        "median_us": round(median * 1e6, 3),
+        "stdev_us": round(statistics.pstdev(samples) * 1e6, 3),
+        "ops_per_sec": round(1 / median, 2) if median else None,
+        "size": workload.size,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def run_benchmarks(selected: List[Benchmark], min_time: float, repeats: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    for bench in selected:
+        try:
+            workload = bench.factory()
+        except ImportError as e:
+            # Only a missing optional/heavy dependency skips a benchmark; any other error fails the run
+            skipped[bench.name] = f"{type(e).__name__}: {e}"
+            print(f"  SKIP {bench.name}: {e}", file=sys.stderr)
+            continue
+        results[bench.name] = measure(workload, min_time=min_time, repeats=repeats)
+        print(f"  {bench.name:<40} {results[bench.name]['median_us']:>14.1f} us", file=sys.stderr)
+    return {"environment": environment(), "results": results, "skipped": skipped}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Per-benchmark ratio of current to baseline median; regressed when slower by more than tolerance"""
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference:
+            rows.append({"name": name, "status": "new", "median_us": result["median_us"]})
+            continue
+        ratio = result["median_us"] / reference["median_us"] if reference["median_us"] else 1.0
+        if reference.get("size") != result["size"]:
+            status = "input-changed"
+        elif ratio > 1 + tolerance:
+            status = "regressed"
+        elif ratio < 1 - tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({
+            "name": name,
+            "status": status,
+            "median_us": result["median_us"],
+            "baseline_us": reference["median_us"],
+            "ratio": round(ratio, 3),
+        })
+    return rows
+
+
+def load_json(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path: Path, data: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
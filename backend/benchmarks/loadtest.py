@@ -0,0 +1,370 @@
+"""HTTP load test for the FastAPI routes, with the upstream services swapped for stand-ins
+
+    cd backend
+    python -m benchmarks.loadtest                                  # in-process (ASGI), all routes
+    python -m benchmarks.loadtest --transport uvicorn --concurrency 1,8,32,128
+    python -m benchmarks.loadtest -k tts --profile typical --time-scale 0.1 --output load.json
+
+--transport asgi drives app.main:app through httpx.ASGITransport in this event loop;
+--transport uvicorn serves it from a uvicorn server on its own thread and event loop,
+so requests go through real sockets and the load generator does not compete with the app.
+Both run in a fresh temporary working directory (static/audio, podcast library), seeded
+with sample segment files, a final episode WAV and library rows.
+
+The services are constructed by the routes exactly as in production (TTSService and
+AgentService per request, the shared PodcastService); only their HTTP clients and
+LLM models are pointed at the stand-ins from benchmarks.standins, so per-request setup
+costs stay in the numbers. Reported per route and concurrency level: p50/p95/p99/max
+latency, requests per second, errors, and the app event loop's scheduling lag (p99/max),
+which exposes handlers that block the loop. In asgi mode the load generator shares that
+loop, so a route that never yields shows lag close to --duration; use uvicorn for lag.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings  # noqa: E402
+from benchmarks import corpus  # noqa: E402
+from benchmarks.harness import environment, save_json  # noqa: E402
+from benchmarks.standins import HAKKA_SAMPLE_RATE, PROFILES, UpstreamSimulator, _wav_bytes, hakka_api_transport, llm_model  # noqa: E402
+
+SCRIPT_NAME = "loadtest"
+SEGMENT_FILES = 60          # files matched by /api/audio/files/{script}
+EPISODE_SECONDS = 180.0     # size of the statically served episode WAV
+LIBRARY_SIZE = 200          # podcasts in the seeded library
+SLOTS = 32                  # generated segment indexes cycle so static/audio does not grow unbounded
+
+
+class Route(NamedTuple):
+    name: str
+    method: str
+    path: Callable[[int], str]
+    body: Optional[Callable[[int], Dict[str, Any]]] = None
+
+
+def _segment(i: int) -> Dict[str, str]:
+    hakka, romanization = corpus.hakka_texts(), corpus.romanizations()
+    return {"hakka_text": hakka[i % len(hakka)], "romanization": romanization[i % len(romanization)]}
+
+
+ROUTES: List[Route] = [
+    Route("tts.generate", "POST", lambda i: "/api/tts/generate",
+          lambda i: {**_segment(i), "speaker": "hak-xi-TW-vs2-F01", "script_name": f"{SCRIPT_NAME}_gen", "segment_index": i % SLOTS + 1}),
+    Route("tts.batch", "POST", lambda i: "/api/tts/batch",
+          lambda i: {"segments": [_segment(i + j) for j in range(4)], "script_name": f"{SCRIPT_NAME}_batch_{i % SLOTS}"}),
+    Route("podcasts.list", "GET", lambda i: f"/api/podcasts/?limit=20&offset={(i * 20) % LIBRARY_SIZE}"),
+    Route("audio.files", "GET", lambda i: f"/api/audio/files/{SCRIPT_NAME}"),
+    Route("audio.scripts", "GET", lambda i: "/api/audio/scripts"),
+    Route("ai.generate_reply", "POST", lambda i: "/api/ai/generate-reply",
+          lambda i: {"prompt": corpus.chinese_texts()[i % len(corpus.chinese_texts())]}),
+    Route("static.audio", "GET", lambda i: f"/static/audio/{SCRIPT_NAME}_episode.wav"),
+]
+
+
+def seed_workdir(workdir: Path):
+    """Sample segment files and a final episode under static/audio"""
+    audio_dir = workdir / "static" / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    speakers = ["SXF", "SXM"]
+    for i in range(SEGMENT_FILES):
+        path = audio_dir / f"{SCRIPT_NAME}_{speakers[i % 2]}_{i + 1:03d}.wav"
+        path.write_bytes(_wav_bytes(3.0, HAKKA_SAMPLE_RATE))
+    (audio_dir / f"{SCRIPT_NAME}_episode.wav").write_bytes(_wav_bytes(EPISODE_SECONDS, HAKKA_SAMPLE_RATE))
+
+
+async def seed_library(library):
+    from app.models.podcast import Podcast
+
+    texts = corpus.chinese_texts()
+    for i in range(LIBRARY_SIZE):
+        await library.save(Podcast(
+            title=texts[i % len(texts)][:30],
+            chinese_content="\n".join(texts[i % len(texts):i % len(texts) + 20]),
+            hakka_content="\n".join(corpus.hakka_texts()[:20]),
+            topic="technology_news",
+            duration=10,
+            language="hakka",
+            audio_url=f"/static/audio/{SCRIPT_NAME}_episode.wav",
+            audio_duration=int(EPISODE_SECONDS),
+        ))
+
+
+def install(app, sim: UpstreamSimulator) -> contextlib.ExitStack:
+    """Route dependencies build the real services, then point them at the stand-ins"""
+    from pydantic_ai import Agent
+    from app.routers import ai as ai_router, tts as tts_router
+    from app.services.ai_service import AgentService
+    from app.services.tts_service import TTSService
+
+    stack = contextlib.ExitStack()
+    transport = hakka_api_transport(sim)
+    model = llm_model(sim)
+
+    def tts_service() -> TTSService:
+        service = TTSService()
+        service.client = httpx.AsyncClient(transport=transport, timeout=service.client.timeout)
+        return service
+
+    def agent_service() -> AgentService:
+        service = AgentService()
+        for agent in vars(service).values():
+            if isinstance(agent, Agent):
+                agent.model = model
+        return service
+
+    app.dependency_overrides[tts_router.get_tts_service] = tts_service
+    app.dependency_overrides[ai_router.get_agent_service] = agent_service
+    stack.callback(app.dependency_overrides.clear)
+    return stack
+
+
+class LoopLag:
+    """Measures how late the event loop wakes a periodic timer (time spent blocked by handlers)"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: List[float] = []
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0.0))
+
+    def window(self) -> List[float]:
+        """Samples since the previous call"""
+        samples, self.samples = self.samples, []
+        return samples
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _summary_ms(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "p50": round(_percentile(ordered, 0.50) * 1000, 2),
+        "p95": round(_percentile(ordered, 0.95) * 1000, 2),
+        "p99": round(_percentile(ordered, 0.99) * 1000, 2),
+        "max": round((ordered[-1] if ordered else 0.0) * 1000, 2),
+    }
+
+
+async def drive(client: httpx.AsyncClient, route: Route, concurrency: int, duration: float, warmup: int) -> Dict[str, Any]:
+    """Run `concurrency` closed-loop workers against one route for `duration` seconds"""
+    counter = iter(range(10**9))
+    for _ in range(warmup):
+        i = next(counter)
+        await client.request(route.method, route.path(i), json=route.body(i) if route.body else None)
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            start = time.perf_counter()
+            try:
+                response = await client.request(route.method, route.path(i), json=route.body(i) if route.body else None)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "route": route.name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": _summary_ms(latencies),
+    }
+
+
+async def _lag_window(lag: LoopLag, lag_loop: asyncio.AbstractEventLoop) -> List[float]:
+    """Collect lag samples on the loop that owns them (the uvicorn thread's loop, or this one)"""
+    if lag_loop is asyncio.get_running_loop():
+        return lag.window()
+
+    async def drain():
+        return lag.window()
+
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(drain(), lag_loop))
+
+
+async def _sweep(client: httpx.AsyncClient, args, lag: LoopLag, lag_loop: asyncio.AbstractEventLoop, sim: UpstreamSimulator) -> List[Dict[str, Any]]:
+    rows = []
+    for route in [r for r in ROUTES if args.filter in r.name]:
+        for concurrency in args.concurrency:
+            sim.reset()
+            await _lag_window(lag, lag_loop)  # discard samples from the previous level
+            row = await drive(client, route, concurrency, args.duration, args.warmup)
+            row["loop_lag_ms"] = {k: v for k, v in _summary_ms(await _lag_window(lag, lag_loop)).items() if k in ("p99", "max")}
+            row["upstream"] = sim.stats()
+            rows.append(row)
+            _print_row(row)
+    return rows
+
+
+async def run_asgi(app, args, sim: UpstreamSimulator) -> List[Dict[str, Any]]:
+    lag = LoopLag()
+    async with app.router.lifespan_context(app):
+        monitor = asyncio.create_task(lag.run())
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+                return await _sweep(client, args, lag, asyncio.get_running_loop(), sim)
+        finally:
+            monitor.cancel()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_uvicorn(app, args, sim: UpstreamSimulator) -> List[Dict[str, Any]]:
+    import uvicorn
+
+    port = args.port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    lag = LoopLag()
+    ready = threading.Event()
+    state: Dict[str, Any] = {}
+
+    async def serve():
+        state["loop"] = asyncio.get_running_loop()
+        monitor = asyncio.create_task(lag.run())
+        ready.set()
+        try:
+            await server.serve()
+        finally:
+            monitor.cancel()
+
+    thread = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+    thread.start()
+    ready.wait()
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout, limits=limits) as client:
+            return await _sweep(client, args, lag, state["loop"], sim)
+    finally:
+        server.should_exit = True
+        await asyncio.to_thread(thread.join)
+
+
+def _print_row(row: Dict[str, Any]):
+    latency, lag = row["latency_ms"], row["loop_lag_ms"]
+    print(
+        f"{row['route']:<18} c={row['concurrency']:<4} n={row['requests']:<6} err={row['errors']:<4} "
+        f"rps={row['rps']:<8} p50={latency['p50']:.1f} p95={latency['p95']:.1f} p99={latency['p99']:.1f} ms "
+        f"| loop lag p99={lag['p99']:.1f} max={lag['max']:.1f} ms",
+        file=sys.stderr
+    )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    # Imported after chdir: main.py mounts ./static and PodcastService resolves static/audio
+    from app.main import app
+    from app.routers import podcasts as podcasts_router
+
+    await seed_library(podcasts_router.get_podcast_service().library)
+    sim = UpstreamSimulator(PROFILES[args.profile], time_scale=args.time_scale, seed=args.seed)
+    with install(app, sim):
+        if args.transport == "uvicorn":
+            return await run_uvicorn(app, args, sim)
+        return await run_asgi(app, args, sim)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.split("\n")[0])
+    parser.add_argument("-k", "--filter", default="", help="only routes whose name contains this string")
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--port", type=int, default=0, help="uvicorn port (default: a free one)")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4, 16, 64], help="concurrent clients (comma list)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per route and concurrency level")
+    parser.add_argument("--warmup", type=int, default=3, help="requests sent before each measurement")
+    parser.add_argument("--timeout", type=float, default=60.0, help="client timeout in seconds")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="multiply all simulated upstream latencies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--verbose", action="store_true", help="keep the services' own logging")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="hakkast_loadtest_"))
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    settings.JOBS_DIR = str(workdir / "jobs")
+    settings.PODCAST_DB_PATH = str(workdir / "podcasts.db")
+    settings.LLM_CACHE_ENABLED = False  # /api/ai/generate-reply cycles through a few prompts; measure the route, not the cache
+    seed_workdir(workdir)
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.ExitStack() as quiet:
+            if not args.verbose:
+                quiet.enter_context(contextlib.redirect_stdout(devnull))
+            rows = asyncio.run(run(args))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "environment": environment(),
+        "scenario": {
+            "transport": args.transport,
+            "profile": args.profile,
+            "time_scale": args.time_scale,
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "seed": {"segment_files": SEGMENT_FILES, "episode_s": EPISODE_SECONDS, "library_size": LIBRARY_SIZE},
+        },
+        "runs": rows,
+    }
+    if args.output:
+        save_json(args.output, report)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
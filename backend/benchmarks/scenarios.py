@@ -0,0 +1,233 @@
+"""End-to-end generation scenarios against simulated upstreams, with a concurrency sweep
+
+    cd backend
+    python -m benchmarks.scenarios --mode full --profile typical --episodes 8 --concurrency 1,2,4
+    python -m benchmarks.scenarios --mode script --tts-concurrency 1,2,4 --time-scale 0.1
+    python -m benchmarks.scenarios --output scenarios.json
+
+--mode full drives PodcastService.generate_podcast (crawl -> dialogue -> translation ->
+audio); --mode script drives generate_podcast_from_script_file on a sample script
+(audio only). Every run uses a fresh temporary working directory (jobs, library,
+static/audio), so nothing in the repository is touched.
+
+Reported per (episode concurrency, TTS backend concurrency) combination: wall time,
+episodes per hour, mean per-stage time per episode, achieved episode and upstream
+concurrency, upstream calls/errors per episode and peak RSS. --time-scale shrinks all
+simulated latencies (CPU work is not scaled, so compare runs at the same scale).
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import psutil
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings  # noqa: E402
+from app.core.telemetry import STAGE_LATENCY  # noqa: E402
+from benchmarks.corpus import SCRIPTS_DIR  # noqa: E402
+from benchmarks.harness import environment, save_json  # noqa: E402
+from benchmarks.standins import PROFILES, UpstreamSimulator, install  # noqa: E402
+
+
+class PeakRSS:
+    """Samples the process RSS from a background thread (keeps sampling while the loop is busy)"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._process = psutil.Process()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self._process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _stage_delta(before, after) -> Dict[str, Dict[str, float]]:
+    stages = {}
+    for (name,), (total, count) in after.items():
+        prev_total, prev_count = before.get((name,), (0.0, 0))
+        if count > prev_count:
+            stages[name] = {"total_s": total - prev_total, "count": count - prev_count}
+    return stages
+
+
+async def run_scenario(args, concurrency: int, tts_concurrency: int, workdir: Path) -> Dict[str, Any]:
+    from app.models.podcast import PodcastGenerationRequest, Topic
+    from app.services.podcast_service import PodcastService
+
+    settings.HAKKA_TTS_CONCURRENCY = tts_concurrency
+    settings.GEMINI_TTS_CONCURRENCY = tts_concurrency
+    sim = UpstreamSimulator(PROFILES[args.profile], time_scale=args.time_scale, seed=args.seed)
+    service = PodcastService()
+    script_file = Path(args.script) if args.script else max(SCRIPTS_DIR.glob("*.json"), key=lambda p: p.stat().st_size)
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def episode(i: int) -> Dict[str, Any]:
+        async with gate:
+            start = time.perf_counter()
+            try:
+                if args.mode == "full":
+                    request = PodcastGenerationRequest(topic=Topic(args.topic), duration=args.duration, language=args.language)
+                    result = (await service.generate_podcast(request))["audio_result"]
+                else:
+                    # A copy per episode: the script file name becomes the published file name
+                    copy = workdir / "scripts" / f"episode_{concurrency}_{tts_concurrency}_{i:03d}.json"
+                    copy.parent.mkdir(exist_ok=True)
+                    shutil.copyfile(script_file, copy)
+                    result = (await service.generate_podcast_from_script_file(str(copy), args.language))["audio_result"]
+                error = None if result.get("success") else result.get("error")
+            except Exception as e:
+                result, error = {}, f"{type(e).__name__}: {e}"
+            return {
+                "wall_s": time.perf_counter() - start,
+                "success": error is None,
+                "error": error,
+                "failed_segments": result.get("failed_segments", 0),
+                "audio_s": result.get("total_duration") or 0,
+            }
+
+    stages_before = STAGE_LATENCY.series()
+    with install(service, sim), PeakRSS() as rss:
+        start = time.perf_counter()
+        episodes = await asyncio.gather(*(episode(i) for i in range(args.episodes)))
+        wall = time.perf_counter() - start
+    stages = _stage_delta(stages_before, STAGE_LATENCY.series())
+
+    succeeded = [e for e in episodes if e["success"]]
+    upstream = sim.stats()
+    return {
+        "concurrency": concurrency,
+        "tts_concurrency": tts_concurrency,
+        "episodes": args.episodes,
+        "succeeded": len(succeeded),
+        "failed_segments": sum(e["failed_segments"] for e in episodes),
+        "errors": sorted({e["error"] for e in episodes if e["error"]}),
+        "wall_s": round(wall, 3),
+        "episodes_per_hour": round(len(succeeded) / wall * 3600, 2) if wall else None,
+        "episode_wall_s": {
+            "mean": round(sum(e["wall_s"] for e in episodes) / len(episodes), 3),
+            "max": round(max(e["wall_s"] for e in episodes), 3),
+        },
+        "audio_s_per_episode": round(sum(e["audio_s"] for e in succeeded) / len(succeeded), 1) if succeeded else 0,
+        # Rendered length per episode (in order) against the requested duration (full mode)
+        "episode_audio_s": [round(e["audio_s"], 1) for e in episodes],
+        "target_audio_s": args.duration * 60 if args.mode == "full" else None,
+        # Mean number of episodes in flight over the run
+        "achieved_concurrency": round(sum(e["wall_s"] for e in episodes) / wall, 2) if wall else None,
+        "stage_s_per_episode": {name: round(s["total_s"] / args.episodes, 3) for name, s in stages.items()},
+        "upstream_calls_per_episode": {kind: round(s["calls"] / args.episodes, 1) for kind, s in upstream.items()},
+        "upstream": upstream,
+        "peak_rss_mb": round(rss.peak / 2**20, 1),
+    }
+
+
+def _print_row(row: Dict[str, Any]):
+    stages = " ".join(f"{name}={seconds:.1f}s" for name, seconds in row["stage_s_per_episode"].items())
+    peaks = " ".join(f"{kind}={s['peak_in_flight']}" for kind, s in row["upstream"].items())
+    print(
+        f"c={row['concurrency']:<3} tts={row['tts_concurrency']:<3} ok={row['succeeded']}/{row['episodes']} "
+        f"wall={row['wall_s']:.1f}s eph={row['episodes_per_hour']} in-flight={row['achieved_concurrency']} "
+        f"rss={row['peak_rss_mb']}MB | {stages} | peak upstream: {peaks}",
+        file=sys.stderr
+    )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.scenarios", description=__doc__.split("\n")[0])
+    parser.add_argument("--mode", choices=["full", "script"], default="full")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="typical")
+    parser.add_argument("--episodes", type=int, default=4)
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 2, 4], help="episodes generated in parallel (comma list)")
+    parser.add_argument("--tts-concurrency", type=_int_list, default=[settings.HAKKA_TTS_CONCURRENCY], help="per-backend TTS concurrency (comma list)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiply all simulated latencies")
+    parser.add_argument("--dialogue-mode", choices=["turns", "block"], default=settings.DIALOGUE_MODE, help="script generation mode (full mode)")
+    parser.add_argument("--llm-cache", action="store_true", help="answer repeated LLM prompts from the response cache (off: every call hits the stand-in)")
+    parser.add_argument("--language", choices=["hakka", "bilingual"], default="hakka")
+    parser.add_argument("--topic", default="technology_news")
+    parser.add_argument("--duration", type=int, default=3, help="episode length in minutes (full mode)")
+    parser.add_argument("--script", help="script JSON for --mode script (default: largest sample in backend/json)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--verbose", action="store_true", help="keep the pipeline's own output")
+    args = parser.parse_args(argv)
+    if args.script:
+        args.script = str(Path(args.script).resolve())
+
+    workdir = Path(tempfile.mkdtemp(prefix="hakkast_scenarios_"))
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    settings.DIALOGUE_MODE = args.dialogue_mode
+    settings.LLM_CACHE_ENABLED = args.llm_cache
+    settings.LLM_CACHE_PATH = str(workdir / "llm_cache.db")
+    settings.JOBS_DIR = str(workdir / "jobs")
+    settings.PODCAST_DB_PATH = str(workdir / "podcasts.db")
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    rows = []
+    try:
+        for concurrency, tts_concurrency in itertools.product(args.concurrency, args.tts_concurrency):
+            with open(os.devnull, "w") as devnull, contextlib.ExitStack() as quiet:
+                if not args.verbose:
+                    quiet.enter_context(contextlib.redirect_stdout(devnull))
+                row = asyncio.run(run_scenario(args, concurrency, tts_concurrency, workdir))
+            rows.append(row)
+            _print_row(row)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "environment": environment(),
+        "scenario": {
+            "mode": args.mode,
+            "profile": args.profile,
+            "dialogue_mode": args.dialogue_mode,
+            "llm_cache": args.llm_cache,
+            "latencies": {kind: profile._asdict() for kind, profile in PROFILES[args.profile].items()},
+            "time_scale": args.time_scale,
+            "language": args.language,
+            "episodes": args.episodes,
+        },
+        "runs": rows,
+    }
+    if args.output:
+        save_json(args.output, report)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
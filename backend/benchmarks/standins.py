@@ -0,0 +1,269 @@
+"""Local stand-ins for the upstream services, with configurable latency and error distributions
+
+The Hakka MT/TTS HTTP APIs are served by an httpx MockTransport, so the services'
+own request/parsing code runs unchanged; the LLM agents run on a pydantic-ai
+FunctionModel, and crawling and Gemini TTS are replaced at their call sites.
+"""
+import asyncio
+import io
+import json
+import math
+import random
+import re
+import wave
+from contextlib import ExitStack, asynccontextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, NamedTuple
+
+import httpx
+import numpy as np
+
+from benchmarks import corpus
+
+
+class LatencyProfile(NamedTuple):
+    median_ms: float
+    sigma: float = 0.4        # log-normal spread; 0 gives a constant latency
+    error_rate: float = 0.0   # probability that a call fails
+
+
+# Per upstream kind: llm, mt (Hakka translation), tts (Hakka TTS), gemini_tts, crawl
+PROFILES: Dict[str, Dict[str, LatencyProfile]] = {
+    "fast": {
+        "llm": LatencyProfile(400, 0.3),
+        "mt": LatencyProfile(80, 0.3),
+        "tts": LatencyProfile(700, 0.3),
+        "gemini_tts": LatencyProfile(1500, 0.3),
+        "crawl": LatencyProfile(600, 0.3),
+    },
+    "typical": {
+        "llm": LatencyProfile(1500, 0.5, 0.01),
+        "mt": LatencyProfile(250, 0.5, 0.01),
+        "tts": LatencyProfile(2500, 0.5, 0.02),
+        "gemini_tts": LatencyProfile(4000, 0.5, 0.02),
+        "crawl": LatencyProfile(2000, 0.6, 0.02),
+    },
+    "degraded": {
+        "llm": LatencyProfile(4000, 0.8, 0.05),
+        "mt": LatencyProfile(800, 0.8, 0.05),
+        "tts": LatencyProfile(6000, 0.8, 0.08),
+        "gemini_tts": LatencyProfile(9000, 0.8, 0.08),
+        "crawl": LatencyProfile(5000, 0.8, 0.1),
+    },
+}
+
+HAKKA_SAMPLE_RATE = 44100
+GEMINI_SAMPLE_RATE = 24000
+SECONDS_PER_CHAR = 0.25
+
+
+class SimulatedUpstreamError(Exception):
+    pass
+
+
+class UpstreamSimulator:
+    """Draws latencies/errors per upstream kind and tracks calls and in-flight concurrency"""
+
+    def __init__(self, profile: Dict[str, LatencyProfile], time_scale: float = 1.0, seed: int = 0):
+        self.profile = profile
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.peak_in_flight: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def call(self, kind: str):
+        """Simulate one upstream call; raises SimulatedUpstreamError on a drawn failure"""
+        latency = self.profile[kind]
+        seconds = latency.median_ms / 1000 * math.exp(self.rng.gauss(0, latency.sigma)) * self.time_scale
+        failed = self.rng.random() < latency.error_rate
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+        self.in_flight[kind] = self.in_flight.get(kind, 0) + 1
+        self.peak_in_flight[kind] = max(self.peak_in_flight.get(kind, 0), self.in_flight[kind])
+        try:
+            await asyncio.sleep(seconds)
+            if failed:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+                raise SimulatedUpstreamError(f"simulated {kind} failure")
+            yield
+        finally:
+            self.in_flight[kind] -= 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            kind: {
+                "calls": self.calls.get(kind, 0),
+                "errors": self.errors.get(kind, 0),
+                "peak_in_flight": self.peak_in_flight.get(kind, 0),
+            }
+            for kind in sorted(self.calls)
+        }
+
+
+@lru_cache(maxsize=256)
+def _wav_bytes(seconds: float, sample_rate: int, frequency: float = 160.0) -> bytes:
+    """Mono 16-bit tone with a silent lead-in/out, roughly shaped like TTS output
+
+    Cached per duration so the stand-in itself costs (almost) no CPU.
+    """
+    frames = max(int(seconds * sample_rate), 1)
+    edge = min(int(0.1 * sample_rate), frames // 4)
+    samples = (8000 * np.sin(2 * np.pi * frequency * np.arange(frames) / sample_rate)).astype("<i2")
+    samples[:edge] = 0
+    samples[frames - edge:] = 0
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def _speech_seconds(units: int) -> float:
+    # Rounded to 0.1 s so _wav_bytes stays cached
+    return round(min(max(units * SECONDS_PER_CHAR, 0.5), 20.0), 1)
+
+
+_CJK = re.compile(r"[一-鿿\U00020000-\U0002ffff]")
+
+
+def _fake_romanization(text: str) -> str:
+    return " ".join(f"ha{24 if i % 2 else 55}" for i, _ in enumerate(_CJK.findall(text)))
+
+
+def hakka_api_transport(sim: UpstreamSimulator) -> httpx.MockTransport:
+    """Mock transport answering the Hakka AI Hackathon login, MT and TTS endpoints"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        payload = request.read()
+        body = json.loads(payload) if payload else {}
+        kind = "tts" if "/tts/synthesize" in path else "mt"
+        try:
+            if path.endswith("/login"):
+                return httpx.Response(200, json={"token": "simulated"})
+            if path.endswith("/logout"):
+                return httpx.Response(200, json={})
+            if path.endswith("/tts/models"):
+                return httpx.Response(200, json={"data": [{"name": "broncitts", "spk2id": {}}]})
+            async with sim.call(kind):
+                if path.startswith("/MT/translate/"):
+                    text = body.get("input", "")
+                    output = _fake_romanization(text) if "_py" in path else text.replace("我", "𠊎")
+                    return httpx.Response(200, json={"code": "200", "output": output})
+                if path.endswith("/tts/synthesize"):
+                    text = body.get("input", {}).get("text", "")
+                    units = len(text.split()) if body.get("input", {}).get("textType") == "roma" else len(text)
+                    seconds = _speech_seconds(units)
+                    return httpx.Response(200, content=_wav_bytes(seconds, HAKKA_SAMPLE_RATE), headers={"Content-Type": "audio/wav"})
+            return httpx.Response(404, json={"detail": f"Not simulated: {path}"})
+        except SimulatedUpstreamError:
+            return httpx.Response(500, json={"detail": f"simulated {kind} failure"})
+
+    return httpx.MockTransport(handler)
+
+
+def llm_model(sim: UpstreamSimulator):
+    """pydantic-ai FunctionModel answering dialogue prompts (text and structured outputs) with sample script lines"""
+    from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+    from pydantic_ai.models.function import FunctionModel
+
+    lines = corpus.chinese_texts()
+    counter = {"n": 0}
+
+    async def respond(messages, info) -> ModelResponse:
+        async with sim.call("llm"):
+            counter["n"] += 1
+            text = lines[counter["n"] % len(lines)]
+            if info.output_tools:
+                tool = info.output_tools[0]
+                fields = tool.parameters_json_schema.get("properties", {})
+                if "turns" in fields:
+                    # DialogueBlock: a short exchange between two placeholder speakers (the caller normalizes names)
+                    turns = [{"speaker": f"host{j % 2}", "text": lines[(counter["n"] + j) % len(lines)]} for j in range(8)]
+                    return ModelResponse(parts=[ToolCallPart(tool.name, {"turns": turns})])
+                if "translations" in fields:
+                    # EnglishTermBatch: echo each listed term back as its own translation
+                    prompt = str(messages[-1].parts[-1].content) if messages and messages[-1].parts else ""
+                    terms = [line[2:] for line in prompt.splitlines() if line.startswith("- ")]
+                    return ModelResponse(parts=[ToolCallPart(tool.name, {"translations": [{"original": t, "translated": t} for t in terms]})])
+                if "transitions" in fields:
+                    return ModelResponse(parts=[ToolCallPart(tool.name, {"transitions": [text] * 4})])
+                # EnglishTranslationResult: nothing to translate
+                prompt = messages[-1].parts[-1].content if messages and messages[-1].parts else ""
+                return ModelResponse(parts=[ToolCallPart(tool.name, {
+                    "original_texts": [], "translated_texts": [], "processed_content": str(prompt)
+                })])
+            return ModelResponse(parts=[TextPart(text)])
+
+    return FunctionModel(respond)
+
+
+def install(service, sim: UpstreamSimulator) -> ExitStack:
+    """Point a PodcastService (and the services it owns) at the stand-ins; closing the stack restores them"""
+    from pydantic_ai import Agent
+    from app.models.crawler import CrawledContent, ContentType
+    import app.services.podcast_service as podcast_module
+
+    stack = ExitStack()
+    transport = hakka_api_transport(sim)
+    for owner in (service, service.ai_service):
+        for name in ("translation_service", "tts_service"):
+            client = getattr(owner, name).client
+            getattr(owner, name).client = httpx.AsyncClient(transport=transport, timeout=client.timeout)
+
+    model = llm_model(sim)
+    for agent in vars(service.ai_service.agent_service).values():
+        if isinstance(agent, Agent):
+            # Agents built without API keys have no model, which override() alone does not allow
+            stack.callback(setattr, agent, "model", agent.model)
+            agent.model = model
+            stack.enter_context(agent.override(model=model))
+
+    tts_service = service.tts_service
+
+    async def gemini_tts(text: str, output_path: str, voice: str = "gemini_zephyr") -> str:
+        async with sim.call("gemini_tts"):
+            seconds = _speech_seconds(len(text))
+            with open(output_path, "wb") as f:
+                f.write(_wav_bytes(seconds, GEMINI_SAMPLE_RATE, frequency=220.0))
+        return output_path
+
+    tts_service.generate_gemini_tts = gemini_tts
+
+    texts = corpus.chinese_texts()
+
+    async def crawl_news(topic, max_articles: int = 3):
+        articles = []
+        for i in range(max_articles):
+            content = "".join(texts[(i * 5 + j) % len(texts)] for j in range(5))
+            try:
+                async with sim.call("crawl"):
+                    pass
+            except SimulatedUpstreamError:
+                continue  # the real crawler skips articles it fails to fetch
+            articles.append(CrawledContent(
+                id=f"simulated-{i}",
+                title=texts[i % len(texts)][:30],
+                content=content,
+                summary=content[:120],
+                url=f"https://example.com/article/{i}",
+                source="simulated",
+                crawled_at=datetime.now(),
+                content_type=ContentType.NEWS,
+                topic=topic.value,
+                keywords=[],
+            ))
+        return articles
+
+    original_crawl = podcast_module.crawl_news
+    podcast_module.crawl_news = crawl_news
+    stack.callback(setattr, podcast_module, "crawl_news", original_crawl)
+    return stack
@@ -0,0 +1,168 @@
+"""Import-time profile and cold-start budget for app.main
+
+    cd backend
+    python -m benchmarks.startup                          # profile, check budgets, exit 1 on failure
+    python -m benchmarks.startup --runs 5 --output startup.json
+    python -m benchmarks.startup --top 40                 # longer per-package breakdown
+
+Each measurement runs in a fresh interpreter with a temporary working directory (main.py
+mounts ./static), so nothing is cached in-process:
+
+- import: `python -X importtime -c "import app.main"`; reports the cumulative import time
+  of app.main and the slowest top-level packages by self time.
+- startup: `uvicorn app.main:app` until GET /health answers (spawn to first 200).
+
+Fails when the median of either exceeds its budget, or when a module in LAZY_MODULES
+(crawler/browser stack, LLM and Gemini SDKs, HTML parsing) is imported eagerly, which is
+what keeps /health and the library routes from paying for the generation pipeline.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.harness import environment, save_json  # noqa: E402
+
+# Loaded on first use by the services that need them; never at app import
+LAZY_MODULES = ("crawl4ai", "playwright", "pydantic_ai", "openai", "google.genai", "bs4", "cn2an")
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) rows of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def profile_import(workdir: Path) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=workdir, env=_env(), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import app.main failed:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    total_us = next(cumulative for name, _, cumulative in rows if name == "app.main")
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    modules = {name for name, _, _ in rows}
+    eager = sorted(
+        lazy for lazy in LAZY_MODULES
+        if any(name == lazy or name.startswith(lazy + ".") for name in modules)
+    )
+    return {
+        "import_ms": total_us / 1000,
+        "modules": len(modules),
+        "packages_ms": {name: us / 1000 for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])},
+        "eager_lazy_modules": eager,
+    }
+
+
+def measure_startup(workdir: Path, timeout: float) -> float:
+    """Seconds from spawning uvicorn to the first 200 from /health"""
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with {proc.returncode}:\n{proc.stderr.read()[-2000:]}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.02)
+        raise RuntimeError(f"/health did not answer within {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per measurement (median is checked)")
+    parser.add_argument("--import-budget-ms", type=float, default=2500, help="max median import time of app.main")
+    parser.add_argument("--startup-budget-s", type=float, default=5.0, help="max median spawn-to-/health time")
+    parser.add_argument("--skip-startup", action="store_true", help="only profile the import")
+    parser.add_argument("--top", type=int, default=15, help="packages listed in the breakdown")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory(prefix="hakkast-startup-") as tmp:
+        workdir = Path(tmp)
+        (workdir / "static").mkdir()
+
+        profiles = [profile_import(workdir) for _ in range(args.runs)]
+        import_ms = statistics.median(p["import_ms"] for p in profiles)
+        profile = min(profiles, key=lambda p: abs(p["import_ms"] - import_ms))
+        print(f"import app.main: median {import_ms:.0f} ms over {args.runs} runs ({profile['modules']} modules), budget {args.import_budget_ms:.0f} ms")
+        for name, ms in list(profile["packages_ms"].items())[:args.top]:
+            print(f"  {ms:8.1f} ms  {name}")
+        if import_ms > args.import_budget_ms:
+            failures.append(f"import time {import_ms:.0f} ms > {args.import_budget_ms:.0f} ms")
+        if profile["eager_lazy_modules"]:
+            failures.append(f"imported at startup, should be lazy: {', '.join(profile['eager_lazy_modules'])}")
+
+        startup_s: Optional[float] = None
+        if not args.skip_startup:
+            samples = [measure_startup(workdir, timeout=max(30.0, args.startup_budget_s * 4)) for _ in range(args.runs)]
+            startup_s = statistics.median(samples)
+            print(f"uvicorn spawn -> /health: median {startup_s:.2f} s ({', '.join(f'{s:.2f}' for s in samples)}), budget {args.startup_budget_s:.1f} s")
+            if startup_s > args.startup_budget_s:
+                failures.append(f"startup {startup_s:.2f} s > {args.startup_budget_s:.1f} s")
+
+    if args.output:
+        save_json(args.output, {
+            "environment": environment(),
+            "import": {**profile, "median_ms": import_ms, "runs_ms": [p["import_ms"] for p in profiles], "budget_ms": args.import_budget_ms},
+            "startup": {"median_s": startup_s, "budget_s": args.startup_budget_s} if startup_s is not None else None,
+            "failures": failures,
+        })
+    for failure in failures:
+        print(f"FAIL  {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
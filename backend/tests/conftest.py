@@ -0,0 +1,109 @@
+import wave
+import zlib
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.models.podcast import HostConfig, PodcastScript, PodcastScriptContent
+from app.services import podcast_service as podcast_service_module
+from app.services.speech_rate import SpeechRateModel
+from app.services.voice_backends import SynthesisRequest, VoiceBackend, VoiceBackendRegistry
+
+SAMPLE_RATE = 44100
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-TTS: not caught by the backend or the pipeline"""
+
+
+def write_tone(path: Path, frequency: float, seconds: float = 0.25, sample_rate: int = SAMPLE_RATE):
+    """Mono 16-bit tone padded with silence, like a TTS segment"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = (0.4 * np.sin(2 * np.pi * frequency * t) * 32767).astype("<i2")
+    silence = np.zeros(int(0.05 * sample_rate), dtype="<i2")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+        out.writeframes(np.concatenate([silence, tone, silence]).tobytes())
+
+
+class FakeVoiceBackend(VoiceBackend):
+    """Handles every voice; the tone depends on the text, so edited lines sound different"""
+
+    name = "fake_tts"
+    native_sample_rate = SAMPLE_RATE
+
+    def __init__(self, crash_after: int = None):
+        super().__init__(max_concurrency=1)
+        self.crash_after = crash_after
+        self.synthesized: List[int] = []
+
+    def handles(self, voice: str) -> bool:
+        return True
+
+    async def synthesize(self, request: SynthesisRequest) -> Path:
+        if self.crash_after is not None and len(self.synthesized) >= self.crash_after:
+            raise Crash(f"killed before segment {request.index}")
+        write_tone(request.output_path, 200 + zlib.crc32(request.text.encode("utf-8")) % 600)
+        self.synthesized.append(request.index)
+        return request.output_path
+
+
+def fake_registry(crash_after: int = None) -> VoiceBackendRegistry:
+    registry = VoiceBackendRegistry()
+    registry.register(FakeVoiceBackend(crash_after=crash_after))
+    return registry
+
+
+HOSTS = [
+    HostConfig(name="佳昀", gender="female", dialect="sihxian", personality="理性"),
+    HostConfig(name="敏權", gender="male", dialect="sihxian", personality="幽默"),
+]
+
+
+def make_script(lines: int = 6) -> PodcastScript:
+    return PodcastScript(
+        title="測試節目",
+        hosts=HOSTS,
+        content=[
+            PodcastScriptContent(
+                speaker=HOSTS[i % 2].name,
+                text=f"第 {i} 句",
+                hakka_text=f"第 {i} 句",
+                romanization=f"ti{i} ki",
+            )
+            for i in range(lines)
+        ],
+    )
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in a scratch directory with every on-disk store pointed inside it"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "JOBS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(settings, "PODCAST_DB_PATH", str(tmp_path / "data" / "podcasts.db"))
+    monkeypatch.setattr(settings, "SPEECH_RATE_DB_PATH", str(tmp_path / "data" / "speech_rates.db"))
+    monkeypatch.setattr(settings, "LLM_CACHE_PATH", str(tmp_path / "data" / "llm_cache.db"))
+    monkeypatch.setattr(settings, "GLOSSARY_DB_PATH", str(tmp_path / "data" / "glossary.db"))
+    monkeypatch.setattr(settings, "RENDITION_FORMATS", "")
+    monkeypatch.setattr(podcast_service_module, "speech_rates", SpeechRateModel())
+    return tmp_path
+
+
+@pytest.fixture
+def service(workdir):
+    """PodcastService whose TTS is the in-process fake backend"""
+    service = podcast_service_module.PodcastService()
+    service.voice_registry = fake_registry()
+    return service
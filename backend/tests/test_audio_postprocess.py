@@ -0,0 +1,77 @@
+import wave
+
+import numpy as np
+
+from app.services.audio_postprocess import PostProcessOptions, db_to_amplitude, ms_to_frames, postprocess_concat
+from app.services.wav_concat import WavFormat
+
+RATE = 44100
+MONO_44K = WavFormat(channels=1, sample_width=2, sample_rate=RATE)
+OPTIONS = PostProcessOptions(crossfade_ms=10, turn_pause_ms=400, same_speaker_pause_ms=200)
+
+
+def write_segment(path, amplitude, tone_s=0.3, lead_s=0.2, trail_s=0.3):
+    t = np.arange(int(tone_s * RATE)) / RATE
+    tone = amplitude * np.sin(2 * np.pi * 440 * t)
+    samples = np.concatenate([np.zeros(int(lead_s * RATE)), tone, np.zeros(int(trail_s * RATE))])
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(RATE)
+        out.writeframes((samples * 32767).astype("<i2").tobytes())
+    return path
+
+
+def read_samples(path):
+    with wave.open(str(path), "rb") as f:
+        return np.frombuffer(f.readframes(f.getnframes()), dtype="<i2").astype(np.float64) / 32768
+
+
+def rms_dbfs(x):
+    return 20 * np.log10(np.sqrt(np.mean(np.square(x))))
+
+
+def test_segments_are_trimmed_levelled_and_spaced(tmp_path):
+    paths = [
+        write_segment(tmp_path / "a.wav", 0.05),
+        write_segment(tmp_path / "b.wav", 0.5),
+        write_segment(tmp_path / "c.wav", 0.2),
+    ]
+    out = tmp_path / "out.wav"
+
+    result = postprocess_concat(paths, out, MONO_44K, speakers=["A", "B", "B"], options=OPTIONS)
+
+    padding = ms_to_frames(OPTIONS.edge_padding_ms, RATE)
+    # Silence is trimmed down to the edge padding around the tone
+    assert all(abs(frames - (int(0.3 * RATE) + 2 * padding)) <= 10 for frames in result.segment_frames)
+    # Turn pause between speakers, the shorter pause within a speaker's turn
+    gaps = [result.segment_offsets[i + 1] - result.segment_offsets[i] - result.segment_frames[i] for i in range(2)]
+    assert gaps == [ms_to_frames(400, RATE), ms_to_frames(200, RATE)]
+
+    samples = read_samples(out)
+    assert len(samples) == result.total_frames
+    for offset, frames in zip(result.segment_offsets, result.segment_frames):
+        # Levelled over the kept span, edge padding included
+        level = rms_dbfs(samples[offset:offset + frames])
+        assert abs(level - OPTIONS.target_rms_dbfs) < 0.5
+    assert np.abs(samples).max() <= db_to_amplitude(OPTIONS.peak_ceiling_dbfs) + 1e-4
+
+
+def test_zero_pause_crossfades_neighbours(tmp_path):
+    paths = [write_segment(tmp_path / f"{i}.wav", 0.3) for i in range(2)]
+    options = OPTIONS._replace(same_speaker_pause_ms=0)
+
+    result = postprocess_concat(paths, tmp_path / "out.wav", MONO_44K, speakers=["A", "A"], options=options)
+
+    overlap = result.segment_offsets[0] + result.segment_frames[0] - result.segment_offsets[1]
+    assert overlap == ms_to_frames(options.crossfade_ms, RATE)
+    assert result.total_frames == sum(result.segment_frames) - overlap
+
+
+def test_silent_segment_is_dropped(tmp_path):
+    paths = [write_segment(tmp_path / "a.wav", 0.3), write_segment(tmp_path / "quiet.wav", 0.0), write_segment(tmp_path / "b.wav", 0.3)]
+
+    result = postprocess_concat(paths, tmp_path / "out.wav", MONO_44K, speakers=["A", "B", "A"], options=OPTIONS)
+
+    assert result.segment_frames[1] == 0
+    assert result.segment_frames[0] > 0 and result.segment_frames[2] > 0
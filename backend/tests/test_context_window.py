@@ -0,0 +1,53 @@
+import pytest
+
+from app.services import context_window as context_window_module
+from app.services.context_window import ContextWindow, estimate_tokens
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Deterministic counts whether or not a tiktoken BPE file is available
+    monkeypatch.setattr(context_window_module, "count_tokens", estimate_tokens)
+
+
+def test_estimate_counts_cjk_per_character():
+    assert estimate_tokens("客家話") == 3
+    assert estimate_tokens("hello world!") == 3
+    assert estimate_tokens("今天聊 AI") == 3 + 1
+
+
+def test_append_evicts_oldest_past_token_budget():
+    window = ContextWindow(max_tokens=6)
+    window.extend(["一二", "三四", "五六"])
+    assert window.tokens == 6 and len(window) == 3
+
+    window.append("七八九")
+    assert window.view() == ["五六", "七八九"]
+    assert window.tokens == 5
+
+
+def test_append_evicts_past_line_limit():
+    window = ContextWindow(max_tokens=100, max_lines=2)
+    window.extend(["甲", "乙", "丙"])
+
+    assert window.view() == ["乙", "丙"]
+    assert window.tokens == 2
+
+
+def test_oversized_line_empties_the_window():
+    window = ContextWindow(max_tokens=3)
+    window.extend(["甲", "乙丙丁戊"])
+
+    assert window.view() == []
+    assert window.tokens == 0
+
+
+def test_view_takes_newest_lines_within_budget():
+    window = ContextWindow(max_tokens=100)
+    window.extend(["一二三", "四五", "六", "七八"])
+
+    assert window.view(budget=3) == ["六", "七八"]
+    assert window.view(budget=4) == ["六", "七八"]
+    assert window.view(budget=5) == ["四五", "六", "七八"]
+    assert window.view(budget=1) == []
+    assert window.text(budget=100) == "一二三\n四五\n六\n七八"
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from app.services.glossary import AhoCorasick, Glossary, _is_word_char
+
+
+def brute_force(patterns, text):
+    """Reference: leftmost-longest, non-overlapping whole-word matches"""
+    selected = []
+    position = 0
+    for start in range(len(text)):
+        if start < position:
+            continue
+        for end in sorted((start + len(p) for p in patterns if text.startswith(p, start)), reverse=True):
+            left_ok = start == 0 or not (_is_word_char(text[start]) and _is_word_char(text[start - 1]))
+            right_ok = end == len(text) or not (_is_word_char(text[end - 1]) and _is_word_char(text[end]))
+            if left_ok and right_ok:
+                selected.append((start, end))
+                position = end
+                break
+    return selected
+
+
+def test_leftmost_longest_whole_words():
+    matcher = AhoCorasick(["ai", "ai agent", "agent", "gpu"])
+    text = "ai agent 與 gpu，不是 paid agents"
+
+    assert [text[s:e] for s, e in matcher.matches(text)] == ["ai agent", "gpu"]
+
+
+def test_fail_links_find_suffix_patterns():
+    matcher = AhoCorasick(["he", "she", "hers", "his"])
+
+    assert matcher.matches("she") == [(0, 3)]
+    assert matcher.matches("ushers") == []  # inside a word
+    assert matcher.matches("u hers") == [(2, 6)]
+    # CJK is not a word character, so terms match right next to it
+    assert matcher.matches("他說his好") == [(2, 5)]
+
+
+def test_matches_agree_with_brute_force():
+    rng = random.Random(7)
+    alphabet = "ab 客"
+    for _ in range(300):
+        patterns = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))}
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert AhoCorasick(patterns).matches(text) == brute_force(patterns, text), (patterns, text)
+
+
+@pytest.mark.anyio
+async def test_replace_is_case_insensitive_and_persisted(tmp_path):
+    db_path = str(tmp_path / "glossary.db")
+    glossary = Glossary(db_path)
+    await glossary.learn({"Machine Learning": "機器學習", "GPU": "圖形處理器"})
+
+    assert await glossary.replace(["machine learning 需要 gpu", "GPUs 很貴"]) == ["機器學習 需要 圖形處理器", "GPUs 很貴"]
+    assert await Glossary(db_path).lookup(["gpu", "TPU"]) == {"gpu": "圖形處理器"}
+
+
+@pytest.mark.anyio
+async def test_manual_entries_win_over_llm(tmp_path):
+    glossary = Glossary(str(tmp_path / "glossary.db"))
+    await glossary.set("LLM", "大型語言模型")
+    await glossary.learn({"llm": "語言模型", "RAG": "檢索增強生成"})
+
+    assert await glossary.replace(["LLM 和 RAG"]) == ["大型語言模型 和 檢索增強生成"]
+    entries, total = await glossary.list(source="manual")
+    assert total == 1 and entries[0].translation == "大型語言模型"
+
+    assert await glossary.delete("llm")
+    assert await glossary.replace(["LLM"]) == ["LLM"]
@@ -0,0 +1,94 @@
+import pytest
+
+from app.services.job_store import JobStore, segment_fingerprint
+
+from tests.conftest import HOSTS, Crash, fake_registry, make_script, write_tone
+
+
+def test_save_json_is_atomic_and_round_trips(tmp_path):
+    job = JobStore(str(tmp_path)).create("job1")
+    job.save_json("state.json", {"stage": "tts", "text": "客家話"})
+    job.save_json("state.json", {"stage": "merge", "text": "客家話"})
+
+    assert job.load_json("state.json") == {"stage": "merge", "text": "客家話"}
+    assert [p.name for p in job.job_dir.iterdir() if p.suffix == ".tmp"] == []
+
+
+def test_create_rejects_path_like_job_ids(tmp_path):
+    store = JobStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.create("../escape")
+    assert store.get("../escape") is None
+
+
+def test_fingerprint_is_stable_and_covers_every_field():
+    base = dict(speaker="佳昀", voice="gemini_zephyr", language="bilingual", text="你好", hakka_text="你好", romanization="ngi2 ho2")
+    assert segment_fingerprint(**base) == segment_fingerprint(**dict(reversed(list(base.items()))))
+    for field in base:
+        assert segment_fingerprint(**{**base, field: base[field] + "x"}) != segment_fingerprint(**base)
+
+
+def test_done_segment_needs_matching_fingerprint_and_audio(tmp_path):
+    job = JobStore(str(tmp_path)).create("job1")
+    path = job.segments_dir / "podcast_SXF_000_fixed.wav"
+    write_tone(path, 440)
+    job.mark_segment(0, "done", "abc", path, speaker="佳昀")
+    job.mark_segment(1, "failed", "def", speaker="敏權")
+
+    assert job.get_done_segment(0, "abc") == path
+    assert job.get_done_segment(0, "changed") is None
+    assert job.get_done_segment(1, "def") is None
+
+    path.unlink()
+    assert job.get_done_segment(0, "abc") is None
+
+
+def test_segment_files_in_script_order(tmp_path):
+    job = JobStore(str(tmp_path)).create("job1")
+    for index in (10, 2, 1):
+        path = job.segments_dir / f"podcast_x_SXM_{index:03d}_line_fixed.wav"
+        write_tone(path, 300)
+        job.mark_segment(index, "done", str(index), path, speaker="敏權")
+
+    files = job.segment_files()
+    assert [f["index"] for f in files] == [1, 2, 10]
+    assert {f["code"] for f in files} == {"SXM"}
+
+
+@pytest.mark.anyio
+async def test_crash_mid_tts_resumes_from_checkpointed_segments(service):
+    script = make_script(6)
+    job = service.job_store.create("crashy")
+    service.voice_registry = fake_registry(crash_after=3)
+
+    with pytest.raises(Crash):
+        await service.generate_podcast_audio_with_voices(script, "crashy", hosts=HOSTS, job=job)
+
+    # Segments are checkpointed as each finishes, not after the whole batch
+    done = {f["index"] for f in job.segment_files()}
+    assert done == {0, 1, 2}
+
+    service.voice_registry = fake_registry()
+    result = await service.generate_podcast_audio_with_voices(script, "crashy", hosts=HOSTS, job=job)
+
+    assert result["success"], result
+    assert result["reused_segments"] == 3
+    assert result["rendered_segments"] == [3, 4, 5]
+    assert service.voice_registry._backends[0].synthesized == [3, 4, 5]
+    assert [f["index"] for f in job.segment_files()] == list(range(6))
+
+
+@pytest.mark.anyio
+async def test_rerun_only_renders_changed_lines(service):
+    script = make_script(4)
+    job = service.job_store.create("edits")
+    first = await service.generate_podcast_audio_with_voices(script, "edits", hosts=HOSTS, job=job)
+    assert first["success"], first
+    assert first["rendered_segments"] == [0, 1, 2, 3]
+
+    script.content[2].text = "改過的句子"
+    second = await service.generate_podcast_audio_with_voices(script, "edits", hosts=HOSTS, job=job)
+
+    assert second["success"], second
+    assert second["reused_segments"] == 3
+    assert second["rendered_segments"] == [2]
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services import llm_cache as llm_cache_module
+from app.services.llm_cache import MISS, LLMResponseCache
+
+
+class Outline(BaseModel):
+    title: str
+    points: List[str]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(llm_cache_module, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_key_covers_model_prompts_and_schema():
+    base = LLMResponseCache.key("gemini-2.5-flash", ["你是主持人 "], "寫大綱", Outline)
+
+    assert base == LLMResponseCache.key("gemini-2.5-flash", ["你是主持人"], "寫大綱", Outline)
+    assert base != LLMResponseCache.key("gpt-4o", ["你是主持人"], "寫大綱", Outline)
+    assert base != LLMResponseCache.key("gemini-2.5-flash", ["你是來賓"], "寫大綱", Outline)
+    assert base != LLMResponseCache.key("gemini-2.5-flash", ["你是主持人"], "寫摘要", Outline)
+    assert base != LLMResponseCache.key("gemini-2.5-flash", ["你是主持人"], "寫大綱", str)
+
+
+@pytest.mark.anyio
+async def test_round_trip_including_falsy_outputs(tmp_path, clock):
+    cache = LLMResponseCache(str(tmp_path / "cache.db"))
+    outline = Outline(title="客家美食", points=["粄條", "擂茶"])
+    await cache.put("k1", "m", outline, Outline)
+    await cache.put("k2", "m", "", str)
+
+    assert await cache.get("k1", Outline) == outline
+    assert await cache.get("k2", str) == ""
+    assert await cache.get("missing", str) is MISS
+    # A schema change under the same key reads as a miss
+    assert await cache.get("k1", int) is MISS
+
+
+@pytest.mark.anyio
+async def test_entries_expire_after_ttl(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_TTL_HOURS", 1)
+    cache = LLMResponseCache(str(tmp_path / "cache.db"))
+    await cache.put("old", "m", "舊", str)
+
+    clock.value += 3599
+    assert await cache.get("old", str) == "舊"
+    clock.value += 2
+    assert await cache.get("old", str) is MISS
+
+    # Expired rows are purged on the next write
+    await cache.put("new", "m", "新", str)
+    assert (await cache.stats())["entries"] == 1
+
+
+@pytest.mark.anyio
+async def test_least_recently_used_entries_are_evicted(tmp_path, clock, monkeypatch):
+    # Room for three 100-byte outputs
+    monkeypatch.setattr(settings, "LLM_CACHE_MAX_MB", 300 / 2**20)
+    cache = LLMResponseCache(str(tmp_path / "cache.db"))
+    value = "x" * 98  # 100 bytes as JSON
+    for key in ("a", "b", "c"):
+        clock.value += 1
+        await cache.put(key, "m", value, str)
+
+    clock.value += 1
+    assert await cache.get("a", str) == value  # "b" is now the least recently used
+    clock.value += 1
+    await cache.put("d", "m", value, str)
+
+    assert await cache.get("b", str) is MISS
+    assert [await cache.get(key, str) == value for key in ("a", "c", "d")] == [True, True, True]
+    assert await cache.stats() == {"entries": 3, "size_bytes": 300}
@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.model_router import MIN_SAMPLES, ModelRouter
+
+CANDIDATES = [("primary", "m-primary"), ("fallback", "m-fallback"), ("spare", "m-spare")]
+
+
+class FakeAgent:
+    """agent.run(prompt, model=...) with a per-model delay or error"""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.calls = []
+
+    async def run(self, prompt, model=None):
+        self.calls.append(model)
+        await asyncio.sleep(self.delays.get(model, 0))
+        if model in self.failing:
+            raise RuntimeError(f"{model} is down")
+        return SimpleNamespace(output=f"{model}: {prompt}")
+
+
+def sample(router, name, latency, count=MIN_SAMPLES):
+    for _ in range(count):
+        router.stats(name).record_success(latency)
+
+
+def names(ranked):
+    return [name for name, _ in ranked]
+
+
+def test_unsampled_fallbacks_stay_behind_sampled_primary():
+    router = ModelRouter()
+    sample(router, "primary", 3.0)
+
+    assert names(router.rank(CANDIDATES)) == ["primary", "fallback", "spare"]
+
+
+def test_faster_sampled_model_wins():
+    router = ModelRouter()
+    sample(router, "primary", 3.0)
+    sample(router, "spare", 0.5)
+
+    assert names(router.rank(CANDIDATES)) == ["spare", "primary", "fallback"]
+
+
+def test_errors_penalize_expected_latency():
+    router = ModelRouter()
+    sample(router, "primary", 1.0)
+    sample(router, "fallback", 1.5)
+    for _ in range(MIN_SAMPLES):
+        router.stats("primary").outcomes.append(False)
+
+    assert names(router.rank(CANDIDATES))[0] == "fallback"
+
+
+def test_cooling_down_model_ranks_last(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ERROR_COOLDOWN_S", 60)
+    router = ModelRouter()
+    sample(router, "primary", 0.1)
+    router.stats("primary").record_error()
+
+    assert names(router.rank(CANDIDATES)) == ["fallback", "spare", "primary"]
+
+
+@pytest.mark.anyio
+async def test_fails_over_to_next_model(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGING", False)
+    router = ModelRouter()
+    agent = FakeAgent(failing={"m-primary"})
+
+    assert await router.run(agent, "hi", CANDIDATES, "test") == "m-fallback: hi"
+    assert agent.calls == ["m-primary", "m-fallback"]
+    assert router.stats("primary").consecutive_errors == 1
+
+
+@pytest.mark.anyio
+async def test_raises_last_error_when_every_model_fails(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGING", False)
+    router = ModelRouter()
+    agent = FakeAgent(failing={"m-primary", "m-fallback", "m-spare"})
+
+    with pytest.raises(RuntimeError):
+        await router.run(agent, "hi", CANDIDATES, "test")
+    assert sorted(agent.calls) == ["m-fallback", "m-primary", "m-spare"]
+
+
+@pytest.mark.anyio
+async def test_slow_primary_is_hedged_on_runner_up(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGING", True)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_S", 0.01)
+    router = ModelRouter()
+    sample(router, "primary", 0.01)
+    agent = FakeAgent(delays={"m-primary": 1.0})
+
+    assert await router.run(agent, "hi", CANDIDATES, "test") == "m-fallback: hi"
+    assert router.stats("primary").hedges == 1
+    # The cancelled primary is neither a latency sample nor an error
+    assert len(router.stats("primary").latencies) == MIN_SAMPLES
+    assert router.stats("primary").consecutive_errors == 0
@@ -0,0 +1,80 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.podcast import AudioRendition, Podcast
+from app.services.podcast_library import PodcastLibrary
+
+START = datetime(2026, 1, 1, 8, 0)
+
+
+def make_podcast(i: int, topic: str = "科技", language: str = "hakka") -> Podcast:
+    return Podcast(
+        id=f"p{i:02d}",
+        title=f"第 {i} 集",
+        chinese_content="中文" * 1000,
+        hakka_content="客語" * 1000,
+        romanization="hak8 ngi1",
+        topic=topic,
+        duration=10,
+        language=language,
+        created_at=START + timedelta(minutes=i),
+    )
+
+
+@pytest.mark.anyio
+async def test_list_pages_newest_first_with_filters(tmp_path):
+    library = PodcastLibrary(str(tmp_path / "podcasts.db"))
+    for i in range(7):
+        await library.save(make_podcast(i, topic="科技" if i % 2 else "文化", language="bilingual" if i < 3 else "hakka"))
+
+    first, total = await library.list(limit=3)
+    second, _ = await library.list(limit=3, offset=3)
+    assert total == 7
+    assert [row["id"] for row in first + second] == ["p06", "p05", "p04", "p03", "p02", "p01"]
+    # Listing rows carry metadata only, never the transcript
+    assert "chinese_content" not in first[0] and "hakka_content" not in first[0]
+
+    rows, total = await library.list(topic="科技", language="hakka")
+    assert total == 2
+    assert [row["id"] for row in rows] == ["p05", "p03"]
+
+
+@pytest.mark.anyio
+async def test_get_round_trips_transcript_and_renditions(tmp_path):
+    library = PodcastLibrary(str(tmp_path / "podcasts.db"))
+    podcast = make_podcast(1)
+    podcast.renditions = [AudioRendition(format="mp3", url="/static/audio/p01.mp3", mimeType="audio/mpeg", bitrateKbps=64, sizeBytes=100)]
+    await library.save(podcast)
+
+    loaded = await library.get("p01")
+
+    assert loaded.hakka_content == podcast.hakka_content
+    assert [host.name for host in loaded.hosts] == [host.name for host in podcast.hosts]
+    assert loaded.renditions == podcast.renditions
+    assert await library.delete("p01")
+    assert await library.get("p01") is None
+    assert await library.list() == ([], 0)
+
+
+@pytest.mark.anyio
+async def test_init_migrates_a_database_without_renditions(tmp_path):
+    db_path = tmp_path / "podcasts.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            CREATE TABLE podcasts (
+                id TEXT PRIMARY KEY, title TEXT NOT NULL, topic TEXT NOT NULL, language TEXT NOT NULL,
+                duration INTEGER NOT NULL, hosts TEXT NOT NULL, interests TEXT, created_at TEXT NOT NULL,
+                audio_url TEXT, audio_duration INTEGER
+            );
+            INSERT INTO podcasts VALUES ('old', '舊節目', '文化', 'hakka', 5, '[]', NULL, '2025-01-01T00:00:00', NULL, NULL);
+        """)
+
+    library = PodcastLibrary(str(db_path))
+    rows, total = await library.list()
+
+    assert total == 1
+    assert rows[0]["id"] == "old" and rows[0]["renditions"] == []
+    await library.save(make_podcast(1))
+    assert (await library.list())[1] == 2
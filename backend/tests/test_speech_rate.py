@@ -0,0 +1,83 @@
+import pytest
+
+from app.core.config import settings
+from app.services.speech_rate import SpeechRateModel, spoken_units
+
+VOICES = {"佳昀": ("hak-xi-TW-vs2-F01", "sihxian"), "敏權": ("hak-xi-TW-vs2-M01", "sihxian")}
+
+
+def timing(*segments):
+    return {
+        "segments": [
+            {"index": i, "speaker": speaker, "text": text, "duration": duration}
+            for i, (speaker, text, duration) in enumerate(segments)
+        ]
+    }
+
+
+@pytest.fixture
+def priors(monkeypatch):
+    monkeypatch.setattr(settings, "SPEECH_RATE_PRIOR_CPM", 240)
+    monkeypatch.setattr(settings, "SPEECH_RATE_PRIOR_UNITS", 100)
+    monkeypatch.setattr(settings, "SPEECH_RATE_WINDOW_UNITS", 10_000)
+    monkeypatch.setattr(settings, "AUDIO_POSTPROCESS", True)
+    monkeypatch.setattr(settings, "AUDIO_TURN_PAUSE_MS", 400)
+
+
+def test_spoken_units_counts_syllables_and_words():
+    assert spoken_units("今晡日來聊 AI 同 GPT4") == 6 + 2
+    assert spoken_units("，。！") == 0
+
+
+@pytest.mark.anyio
+async def test_observed_rate_is_shrunk_toward_the_prior(tmp_path, priors):
+    model = SpeechRateModel(str(tmp_path / "rates.db"))
+    await model.init()
+    assert model.seconds_per_unit("hak-xi-TW-vs2-F01", "sihxian") == 0.25
+
+    # 100 units in 50 s: 0.5 s/unit observed, half-way to the 0.25 s/unit prior
+    assert await model.observe(timing(("佳昀", "客" * 100, 50.0)), VOICES) == 1
+    assert model.seconds_per_unit("hak-xi-TW-vs2-F01", "sihxian") == pytest.approx(0.375)
+    # Other dialects of the voice, then all voices, fall back to what is known
+    assert model.seconds_per_unit("hak-xi-TW-vs2-F01", "hailu") == pytest.approx(0.375)
+    assert model.seconds_per_unit("gemini_puck", "") == pytest.approx(0.375)
+
+    reloaded = SpeechRateModel(str(tmp_path / "rates.db"))
+    await reloaded.init()
+    assert reloaded.seconds_per_unit("hak-xi-TW-vs2-F01", "sihxian") == pytest.approx(0.375)
+
+
+@pytest.mark.anyio
+async def test_observe_only_uses_requested_segments_of_known_hosts(tmp_path, priors):
+    model = SpeechRateModel(str(tmp_path / "rates.db"))
+    index = timing(("佳昀", "客" * 10, 3.0), ("敏權", "家" * 10, 4.0), ("來賓", "話" * 10, 5.0), ("佳昀", "", 1.0))
+
+    assert await model.observe(index, VOICES, indexes=[1, 2, 3]) == 1
+    assert [row["voice"] for row in model.snapshot()] == ["hak-xi-TW-vs2-M01"]
+
+
+@pytest.mark.anyio
+async def test_window_keeps_recent_audio_dominant(tmp_path, priors, monkeypatch):
+    monkeypatch.setattr(settings, "SPEECH_RATE_WINDOW_UNITS", 100)
+    model = SpeechRateModel(str(tmp_path / "rates.db"))
+    await model.observe(timing(("佳昀", "客" * 100, 100.0)), VOICES)
+    await model.observe(timing(("佳昀", "客" * 100, 20.0)), VOICES)
+
+    (row,) = model.snapshot()
+    assert row["units"] == 100
+    # Old and new audio each keep half the window: (100 + 20) / 2 s over 100 units
+    assert model._stats[("hak-xi-TW-vs2-F01", "sihxian")].seconds == pytest.approx(60.0)
+
+
+@pytest.mark.anyio
+async def test_budget_prices_lines_with_each_hosts_rate(tmp_path, priors):
+    model = SpeechRateModel(str(tmp_path / "rates.db"))
+    await model.observe(timing(("佳昀", "客" * 100, 50.0)), VOICES)
+
+    budget = await model.budget(60, VOICES.keys(), VOICES)
+
+    assert budget.line_seconds("佳昀: 客家話") == pytest.approx(3 * 0.375 + 0.4)
+    assert budget.line_seconds("敏權: 客家話") == pytest.approx(3 * 0.375 + 0.4)  # falls back to 佳昀's voice
+    assert budget.line_seconds("旁白: 客家話") == 0.0
+    budget.add("佳昀: " + "客" * 100)
+    assert budget.remaining == pytest.approx(60 - 37.9)
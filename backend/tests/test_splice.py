@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+
+from tests.conftest import HOSTS, make_script
+
+
+def published(result) -> bytes:
+    return Path(result["final_audio_file"]).read_bytes()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("postprocess", [False, True])
+async def test_splice_matches_full_merge(service, monkeypatch, postprocess):
+    monkeypatch.setattr(settings, "AUDIO_POSTPROCESS", postprocess)
+    script = make_script(6)
+    job = service.job_store.create("splice")
+    first = await service.generate_podcast_audio_with_voices(script, "splice", hosts=HOSTS, job=job)
+    assert first["success"], first
+    before = published(first)
+
+    script.content[3].text = "改過的第三句，比較長一點"
+    spliced = await service.generate_podcast_audio_with_voices(script, "splice", hosts=HOSTS, job=job, splice=True)
+    assert spliced["success"], spliced
+    assert spliced["spliced"] is True
+    assert spliced["rendered_segments"] == [3]
+    spliced_audio = published(spliced)
+    spliced_timing = job.load_json(job.TIMING)
+    assert spliced_audio != before
+
+    merged = await service.generate_podcast_audio_with_voices(script, "splice", hosts=HOSTS, job=job)
+    assert merged["success"], merged
+    assert merged["spliced"] is False
+    assert merged["rendered_segments"] == []
+
+    # Exact because the test tones level to the target without hitting the gain caps, so
+    # the full merge's episode-level gain is 1; capped takes make a splice approximate
+    assert spliced_audio == published(merged)
+    assert spliced_timing["segments"] == job.load_json(job.TIMING)["segments"]
+    assert spliced["total_duration"] == merged["total_duration"]
+
+
+@pytest.mark.anyio
+async def test_splice_falls_back_to_full_merge_when_postprocessing_changes(service, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIO_POSTPROCESS", False)
+    script = make_script(4)
+    job = service.job_store.create("mode")
+    assert (await service.generate_podcast_audio_with_voices(script, "mode", hosts=HOSTS, job=job))["success"]
+
+    monkeypatch.setattr(settings, "AUDIO_POSTPROCESS", True)
+    script.content[1].text = "新的句子"
+    result = await service.generate_podcast_audio_with_voices(script, "mode", hosts=HOSTS, job=job, splice=True)
+
+    assert result["success"], result
+    assert result["spliced"] is False
+    assert job.load_json(job.TIMING)["postprocessed"] is True
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from app.models.podcast import PodcastScriptContent
+from app.services.timing_index import build_timing_index, load_timing_index, render_timing, timing_filename
+from app.services.wav_concat import ConcatResult, WavFormat
+
+FORMAT = WavFormat(channels=1, sample_width=2, sample_rate=1000)
+
+
+def make_index(offsets=(0, 1500, 3400), frames=(1200, 2000, 61_000)):
+    lines = [
+        PodcastScriptContent(speaker="佳昀", text="大家好", hakka_text="大家好", romanization="tai3 ka1 ho2"),
+        PodcastScriptContent(speaker="敏權", text="今天聊 AI", hakka_text="今晡日聊 AI", romanization=""),
+        PodcastScriptContent(speaker="佳昀", text="再見", hakka_text=None, romanization=None),
+    ]
+    result = ConcatResult(FORMAT, offsets[-1] + frames[-1], list(frames), list(offsets))
+    return build_timing_index("ep", result, list(zip((0, 2, 5), lines)))
+
+
+def test_index_is_frame_exact():
+    index = make_index()
+
+    assert [s["index"] for s in index["segments"]] == [0, 2, 5]
+    assert [s["gap_frames"] for s in index["segments"]] == [0, 300, -100]
+    assert index["segments"][1]["byte_offset"] == 44 + 1500 * 2
+    assert index["segments"][1]["byte_length"] == 2000 * 2
+    assert index["duration"] == 64.4
+
+
+def test_webvtt_cues():
+    content, media_type = render_timing(make_index(), "vtt")
+
+    assert media_type.startswith("text/vtt")
+    assert content.splitlines()[:6] == [
+        "WEBVTT",
+        "",
+        "1",
+        "00:00:00.000 --> 00:00:01.200",
+        "<v 佳昀>大家好",
+        "",
+    ]
+    # Missing Hakka text falls back to the Chinese line; minutes roll over past 60 seconds
+    assert "6\n00:00:03.400 --> 00:01:04.400\n<v 佳昀>再見" in content
+
+
+def test_srt_cues_are_numbered_in_playback_order():
+    content, _ = render_timing(make_index(), "srt", field="romanization")
+
+    blocks = content.strip().split("\n\n")
+    assert [block.splitlines()[0] for block in blocks] == ["1", "2", "3"]
+    assert blocks[0].splitlines()[1:] == ["00:00:00,000 --> 00:00:01,200", "佳昀: tai3 ka1 ho2"]
+    assert blocks[1].splitlines()[2] == "敏權: 今天聊 AI"
+
+
+def test_empty_segments_are_skipped():
+    index = make_index(frames=(1200, 0, 500))
+
+    assert "大家好" in render_timing(index, "srt")[0]
+    assert "今晡日" not in render_timing(index, "srt")[0]
+
+
+def test_unknown_format_or_field_is_rejected():
+    with pytest.raises(ValueError):
+        render_timing(make_index(), "txt")
+    with pytest.raises(ValueError):
+        render_timing(make_index(), "vtt", field="speaker")
+
+
+def test_load_rejects_path_like_names(tmp_path):
+    (tmp_path / timing_filename("ep")).write_text(json.dumps(make_index()), encoding="utf-8")
+
+    assert load_timing_index(tmp_path, "ep")["script_name"] == "ep"
+    assert load_timing_index(tmp_path, "../ep") is None
+    assert load_timing_index(tmp_path, "missing") is None
@@ -0,0 +1,79 @@
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+from app.services.tts_service import TTSService
+from app.services.wav_concat import WavFormat, WavFormatError, concat_wav_files, read_wav_info
+
+from tests.conftest import write_tone
+
+MONO_44K = WavFormat(channels=1, sample_width=2, sample_rate=44100)
+
+
+def frames_of(path):
+    with wave.open(str(path), "rb") as f:
+        return f.getnframes(), f.readframes(f.getnframes())
+
+
+def test_concat_writes_valid_header_and_offsets(tmp_path):
+    paths = []
+    for i, seconds in enumerate((0.1, 0.2, 0.05)):
+        paths.append(tmp_path / f"seg{i}.wav")
+        write_tone(paths[-1], 300 + 100 * i, seconds=seconds)
+
+    result = concat_wav_files(paths, tmp_path / "out.wav")
+
+    counts = [frames_of(p)[0] for p in paths]
+    assert result.format == MONO_44K
+    assert result.segment_frames == counts
+    assert result.segment_offsets == [0, counts[0], counts[0] + counts[1]]
+    total, data = frames_of(tmp_path / "out.wav")
+    assert total == result.total_frames == sum(counts)
+    assert data == b"".join(frames_of(p)[1] for p in paths)
+
+
+def test_read_wav_info_skips_extra_chunks_and_streamed_sizes(tmp_path):
+    pcm = b"\x01\x00\x02\x00" * 10
+    fmt = struct.pack("<HHIIHH", 1, 1, 22050, 44100, 2, 16)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", 16) + fmt
+    body += b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+    # Streaming writers leave the data size at 0xFFFFFFFF
+    body += b"data" + struct.pack("<I", 0xFFFFFFFF) + pcm
+    path = tmp_path / "streamed.wav"
+    path.write_bytes(b"RIFF" + struct.pack("<I", 0) + body)
+
+    info = read_wav_info(path)
+
+    assert info.format == WavFormat(1, 2, 22050)
+    assert info.data_size == len(pcm)
+    assert path.read_bytes()[info.data_offset:] == pcm
+
+
+def test_concat_rejects_mismatched_formats(tmp_path):
+    write_tone(tmp_path / "a.wav", 300)
+    write_tone(tmp_path / "b.wav", 300, sample_rate=24000)
+
+    with pytest.raises(WavFormatError):
+        concat_wav_files([tmp_path / "a.wav", tmp_path / "b.wav"], tmp_path / "out.wav")
+
+
+@pytest.mark.anyio
+async def test_merge_converts_truncated_segments_instead_of_aborting(tmp_path, monkeypatch):
+    write_tone(tmp_path / "a.wav", 300)
+    # Header cut off inside the fmt chunk: struct.error rather than WavFormatError
+    (tmp_path / "b.wav").write_bytes((tmp_path / "a.wav").read_bytes()[:24])
+    converted = []
+
+    async def fake_convert(path, output_path, params):
+        converted.append(path)
+        write_tone(Path(output_path), 500, sample_rate=params.sample_rate)
+
+    tts = TTSService()
+    monkeypatch.setattr(tts, "_convert_wav", fake_convert)
+
+    assert await tts._merge_audio_files([str(tmp_path / "a.wav"), str(tmp_path / "b.wav")], str(tmp_path / "out.wav"))
+    assert converted == [str(tmp_path / "b.wav")]
+    assert frames_of(tmp_path / "out.wav")[0] == 2 * frames_of(tmp_path / "a.wav")[0]
+    assert not list(tmp_path.glob("*_conformed_*"))
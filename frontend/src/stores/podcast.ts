@@ -1,9 +1,10 @@
 import { defineStore } from 'pinia'
 import { ref } from 'vue'
-import type { Podcast, PodcastGenerationRequest } from '../types/podcast'
+import type { Podcast, PodcastSummary, PodcastListResponse, PodcastListQuery, PodcastGenerationRequest } from '../types/podcast'
 
 export const usePodcastStore = defineStore('podcast', () => {
-  const podcasts = ref<Podcast[]>([])
+  const podcasts = ref<PodcastSummary[]>([])
+  const total = ref(0)
   const isLoading = ref(false)
   const error = ref<string | null>(null)
 
@@ -24,8 +25,9 @@ export const usePodcastStore = defineStore('podcast', () => {
         throw new Error(`HTTP error! status: ${response.status}`)
       }
       
-      const podcast = await response.json()
-      podcasts.value.unshift(podcast)
+      const podcast: Podcast = await response.json()
+      podcasts.value.unshift({ ...podcast, hosts: podcast.hosts ?? [] })
+      total.value += 1
       return podcast
     } catch (err) {
       error.value = err instanceof Error ? err.message : 'Failed to generate podcast'
@@ -35,18 +37,28 @@ export const usePodcastStore = defineStore('podcast', () => {
     }
   }
 
-  const fetchPodcasts = async () => {
+  const fetchPodcasts = async (query: PodcastListQuery = {}) => {
     isLoading.value = true
     error.value = null
     
     try {
-      const response = await fetch('/api/podcasts')
+      const params = new URLSearchParams()
+      Object.entries(query).forEach(([key, value]) => {
+        if (value !== undefined && value !== null) {
+          params.append(key, String(value))
+        }
+      })
+      const qs = params.toString()
+      const response = await fetch(qs ? `/api/podcasts?${qs}` : '/api/podcasts')
       
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`)
       }
       
-      podcasts.value = await response.json()
+      // 列表只回傳摘要，完整逐字稿請用 getPodcast(id)
+      const data: PodcastListResponse = await response.json()
+      podcasts.value = data.items
+      total.value = data.total
     } catch (err) {
       error.value = err instanceof Error ? err.message : 'Failed to fetch podcasts'
       throw err
@@ -81,6 +93,7 @@ export const usePodcastStore = defineStore('podcast', () => {
       }
       
       podcasts.value = podcasts.value.filter(p => p.id !== id)
+      total.value = Math.max(0, total.value - 1)
     } catch (err) {
       error.value = err instanceof Error ? err.message : 'Failed to delete podcast'
       throw err
@@ -89,6 +102,7 @@ export const usePodcastStore = defineStore('podcast', () => {
 
   return {
     podcasts,
+    total,
     isLoading,
     error,
     generatePodcast,
@@ -1,3 +1,19 @@
+export interface AudioRendition {
+  format: 'opus' | 'aac' | 'mp3' | 'wav'
+  url: string
+  mimeType: string
+  bitrateKbps?: number
+  sizeBytes: number
+}
+
+export interface HostConfig {
+  name: string
+  gender: 'male' | 'female'
+  dialect?: 'sihxian' | 'hailu' | null
+  personality?: string | null
+  voice?: string | null
+}
+
 export interface Podcast {
   id: string
   title: string
@@ -8,10 +24,40 @@ export interface Podcast {
   tone: 'casual' | 'educational' | 'storytelling' | 'interview'
   duration: number
   language: 'hakka' | 'bilingual'
+  hosts?: HostConfig[]
   interests?: string
   createdAt: string
   audioUrl?: string
   audioDuration?: number
+  renditions?: AudioRendition[]
+}
+
+export interface PodcastSummary {
+  id: string
+  title: string
+  topic: string
+  duration: number
+  language: 'hakka' | 'bilingual'
+  hosts: HostConfig[]
+  interests?: string
+  createdAt: string
+  audioUrl?: string
+  audioDuration?: number
+  renditions?: AudioRendition[]
+}
+
+export interface PodcastListResponse {
+  items: PodcastSummary[]
+  total: number
+  limit: number
+  offset: number
+}
+
+export interface PodcastListQuery {
+  limit?: number
+  offset?: number
+  topic?: string
+  language?: 'hakka' | 'bilingual'
 }
 
 export interface PodcastGenerationRequest {